@@ -1,16 +1,17 @@
 from django.contrib import admin
-from .models import Room, Team, Member, Booking
+from apps.core.admin import StatusMixinAdmin
+from .models import Room, Team, Member, Booking, BookingArchive, RecurringSeries, RoomUtilization, SlotInventory, SlotUtilization
 
 # Register your models here.
 @admin.register(Room)
-class RoomAdmin(admin.ModelAdmin):
+class RoomAdmin(StatusMixinAdmin):
     list_display = ("name", "room_type", "capacity", "is_active")
     list_filter = ("room_type", "is_active")
     search_fields = ("name",)
 
 
 @admin.register(Team)
-class TeamAdmin(admin.ModelAdmin):
+class TeamAdmin(StatusMixinAdmin):
     list_display = ("name", "created_by", "created", "is_active")
     list_filter = ("created", "is_active")
     search_fields = ("name",)
@@ -18,7 +19,7 @@ class TeamAdmin(admin.ModelAdmin):
 
 
 @admin.register(Member)
-class MemberAdmin(admin.ModelAdmin):
+class MemberAdmin(StatusMixinAdmin):
     list_display = ("name", "email", "team", "gender", "age", "created_by", "is_active")
     list_filter = ("gender", "team", "is_active")
     search_fields = ("name", "email")
@@ -29,8 +30,44 @@ class MemberAdmin(admin.ModelAdmin):
 
 
 @admin.register(Booking)
-class BookingAdmin(admin.ModelAdmin):
-    list_display = ("room", "user", "team", "date", "slot", "is_active")
-    list_filter = ("date", "room", "team", "is_active")
+class BookingAdmin(StatusMixinAdmin):
+    list_display = ("room", "user", "team", "date", "slot", "is_active", "is_deleted")
+    list_filter = ("date", "room", "team", "is_active", "is_deleted")
+    search_fields = ("room__name", "user__username", "team__name")
+    raw_id_fields = ("room", "user", "team", "series")
+
+
+@admin.register(RecurringSeries)
+class RecurringSeriesAdmin(StatusMixinAdmin):
+    list_display = ("room", "user", "team", "frequency", "interval", "slot", "start_date", "end_date", "count", "is_active")
+    list_filter = ("frequency", "is_active")
+    search_fields = ("room__name", "user__username", "team__name")
+    raw_id_fields = ("room", "user", "team")
+
+
+@admin.register(BookingArchive)
+class BookingArchiveAdmin(StatusMixinAdmin):
+    list_display = ("room", "user", "team", "date", "slot", "is_active", "archived_at")
+    list_filter = ("date", "is_active")
     search_fields = ("room__name", "user__username", "team__name")
     raw_id_fields = ("room", "user", "team")
+
+
+@admin.register(SlotInventory)
+class SlotInventoryAdmin(admin.ModelAdmin):
+    list_display = ("room", "date", "slot", "remaining")
+    list_filter = ("date", "room")
+    raw_id_fields = ("room",)
+
+
+@admin.register(RoomUtilization)
+class RoomUtilizationAdmin(admin.ModelAdmin):
+    list_display = ("room", "date", "bookings")
+    list_filter = ("date", "room")
+    raw_id_fields = ("room",)
+
+
+@admin.register(SlotUtilization)
+class SlotUtilizationAdmin(admin.ModelAdmin):
+    list_display = ("room_type", "date", "slot", "bookings")
+    list_filter = ("date", "room_type")
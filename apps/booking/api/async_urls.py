@@ -0,0 +1,11 @@
+# django imports
+from django.urls import path
+
+# local imports
+from apps.booking.api.async_views import availability_stream, booking_list, room_availability
+
+urlpatterns = [
+    path('', booking_list, name='async-booking-list'),
+    path('rooms/available/', room_availability, name='async-room-available'),
+    path('rooms/available/stream/', availability_stream, name='async-room-available-stream'),
+]
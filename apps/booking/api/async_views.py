@@ -0,0 +1,124 @@
+# third party imports
+from rest_framework.exceptions import AuthenticationFailed, NotFound
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+# django imports
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+# std imports
+import json
+from datetime import datetime
+from functools import wraps
+
+# local imports
+from apps.booking.availability import available_rooms, parse_availability_query
+from apps.booking.cache import availability_cache
+from apps.booking.events import get_broker
+from apps.booking.api.pagination import BookingPagination
+from apps.booking.api.serializers import BookingSerializer, RoomSerializer
+from apps.booking.api.views import user_bookings
+from apps.users.authentication import aauthenticate
+
+MAX_STREAM_DATES = 31
+# Milliseconds an EventSource waits before reconnecting.
+STREAM_RETRY = 3000
+
+
+def jwt_required(view):
+    """Authenticates async views with the same JWT and error bodies as the DRF API."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            user = await aauthenticate(request)
+        except (AuthenticationFailed, InvalidToken, TokenError):
+            return JsonResponse({'error': 'Invalid or expired token.'}, status=401)
+        if user is None:
+            return JsonResponse({'error': 'Authentication credentials were not provided.'}, status=401)
+        request.user = user
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+@require_GET
+@jwt_required
+async def room_availability(request):
+    """Async ``RoomAvailabilityView``, sharing its cache and response."""
+    try:
+        key = parse_availability_query(request.GET)
+    except ValueError as error:
+        return JsonResponse({'detail': str(error)}, status=400)
+
+    available = availability_cache.get(key)
+    if available is None:
+        rooms = [room async for room in available_rooms(*key)]
+        available = RoomSerializer(rooms, many=True).data
+        availability_cache.set(key, available)
+    return JsonResponse(available, safe=False)
+
+
+@require_GET
+@jwt_required
+async def booking_list(request):
+    """Async ``BookingViewSet.list``, with the same keyset pagination."""
+    paginator = BookingPagination()
+    try:
+        queryset = paginator.get_page_queryset(user_bookings(request.user), request)
+    except NotFound as error:
+        return JsonResponse({'detail': str(error.detail)}, status=404)
+    page = paginator.set_page([booking async for booking in queryset])
+    return JsonResponse(paginator.get_paginated_data(BookingSerializer(page, many=True).data))
+
+
+def server_sent_event(event, data, event_id=None):
+    lines = [f'id: {event_id}'] if event_id is not None else []
+    lines += [f'event: {event}', f'data: {json.dumps(data, separators=(",", ":"))}']
+    return '\n'.join(lines) + '\n\n'
+
+
+@require_GET
+@jwt_required
+async def availability_stream(request):
+    """
+    Server-Sent Events feed of availability changes, one ``availability``
+    event with the remaining bookings of a (room, date, slot) each time a
+    booking there is made, moved or cancelled. ``?date=`` (repeatable or
+    comma separated) limits it to those days. Reconnecting clients send the
+    last id they saw in ``Last-Event-ID`` and receive what they missed, or
+    a ``reset`` event when that is no longer known and they must reload.
+    """
+    try:
+        dates = {
+            datetime.strptime(value, '%Y-%m-%d').date()
+            for param in request.GET.getlist('date') for value in param.split(',') if value
+        }
+    except ValueError:
+        return JsonResponse({'detail': 'Invalid date format.'}, status=400)
+    if len(dates) > MAX_STREAM_DATES:
+        return JsonResponse({'detail': f'At most {MAX_STREAM_DATES} dates can be followed.'}, status=400)
+    # Ids the broker did not issue, e.g. from another worker, are answered with a reset.
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id') or None
+
+    async def stream():
+        # Subscribed once streaming starts, so a response never sent holds no subscription.
+        subscription, missed = get_broker().subscribe(dates or None, last_event_id)
+        try:
+            yield f'retry: {STREAM_RETRY}\n\n'
+            if missed is None:
+                yield server_sent_event('reset', {})
+            for event in missed or ():
+                yield server_sent_event('availability', event.data, event.id)
+            while not subscription.overflowed:
+                event = await subscription.get(timeout=settings.AVAILABILITY_STREAM_HEARTBEAT)
+                # A comment line keeps proxies from closing an idle stream.
+                yield server_sent_event('availability', event.data, event.id) if event else ': keep-alive\n\n'
+            # Too far behind to catch up event by event.
+            yield server_sent_event('reset', {})
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,8 @@
+# local imports
+from apps.core.pagination import KeysetPagination
+
+
+class BookingPagination(KeysetPagination):
+    ordering = ('date', 'slot', 'id')
+    # Bookings without a date or slot are listed last.
+    nullable = ('date', 'slot')
@@ -2,7 +2,7 @@
 from rest_framework import serializers
 
 # local imports
-from apps.booking.models import Booking, Room, Team, Member
+from apps.booking.models import Booking, RecurringSeries, Room, Team, Member, BOOKING_SLOTS
 from apps.users.models import User
 
 
@@ -28,7 +28,8 @@ class TeamSerializer(serializers.ModelSerializer):
     members = MemberSerializer(many=True, read_only=True)
     class Meta:
         model = Team
-        fields = ['uuid', 'name', 'description', 'members']
+        fields = ['uuid', 'name', 'description', 'member_count', 'adult_count', 'members']
+        read_only_fields = ['member_count', 'adult_count']
 
 
 class BookingSerializer(serializers.ModelSerializer):
@@ -46,4 +47,33 @@ class BookingSerializer(serializers.ModelSerializer):
             'team', 'team_id', 'user_id', 'member_ids',
             'date', 'slot',
         ]
-        read_only_fields = ['id', 'uuid', 'room', 'team', 'status']
\ No newline at end of file
+        read_only_fields = ['id', 'uuid', 'room', 'team', 'status']
+
+class RecurringSeriesSerializer(serializers.ModelSerializer):
+    room = RoomSerializer(read_only=True)
+    room_id = serializers.SlugRelatedField(
+        source='room', queryset=Room.objects.all(), slug_field='uuid', write_only=True
+    )
+    team = serializers.SlugRelatedField(slug_field='uuid', read_only=True)
+    team_id = serializers.SlugRelatedField(
+        source='team', queryset=Team.objects.all(), slug_field='uuid', write_only=True, required=False, allow_null=True
+    )
+
+    class Meta:
+        model = RecurringSeries
+        fields = [
+            'uuid', 'room', 'room_id', 'team', 'team_id',
+            'frequency', 'interval', 'slot', 'start_date', 'end_date', 'count',
+        ]
+        read_only_fields = ['uuid']
+
+    def validate(self, attrs):
+        if (attrs.get('end_date') is None) == (attrs.get('count') is None):
+            raise serializers.ValidationError('Give either an end date or a number of occurrences.')
+        if attrs.get('end_date') and attrs['end_date'] < attrs['start_date']:
+            raise serializers.ValidationError({'end_date': 'End date is before the start date.'})
+        if attrs.get('count') == 0 or attrs.get('interval') == 0:
+            raise serializers.ValidationError('Occurrences and interval must be positive.')
+        if attrs['slot'] not in BOOKING_SLOTS:
+            raise serializers.ValidationError({'slot': 'Invalid slot.'})
+        return attrs
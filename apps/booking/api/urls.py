@@ -5,14 +5,19 @@ from rest_framework.routers import DefaultRouter
 from django.urls import path
 
 # local imports
-from apps.booking.api.views import BookingViewSet, RoomAvailabilityView, TeamViewSet, MemberViewSet
+from apps.booking.api.views import BookingViewSet, RoomAvailabilityView, RoomAvailabilityMatrixView, AvailabilityCacheStatsView, BookingExportView, UtilizationView, TeamViewSet, MemberViewSet, RecurringSeriesViewSet
 
 router = DefaultRouter()
 router.register('', BookingViewSet, basename='booking')
 router.register('teams', TeamViewSet, basename='team')
 router.register('members', MemberViewSet, basename='member')
+router.register('series', RecurringSeriesViewSet, basename='booking-series')
 
 urlpatterns = [
+    path('export/', BookingExportView.as_view(), name='booking-export'),
+    path('analytics/utilization/', UtilizationView.as_view(), name='booking-utilization'),
     path('rooms/available/', RoomAvailabilityView.as_view(), name='room-available'),
+    path('rooms/available/cache/', AvailabilityCacheStatsView.as_view(), name='room-available-cache'),
+    path('rooms/availability/', RoomAvailabilityMatrixView.as_view(), name='room-availability-matrix'),
 ]
 urlpatterns += router.urls 
\ No newline at end of file
@@ -2,31 +2,107 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
 # django imports
-from django.db import transaction
-from django.db.models import Q, Count
+from django.core.handlers.asgi import ASGIRequest
+from django.core.exceptions import ValidationError
+from django.db import transaction, IntegrityError
+from django.db.models import Q, Count, Prefetch
+from django.http import StreamingHttpResponse
 
 # std imports
-from datetime import datetime, time
+from collections import Counter
+from datetime import datetime
 
 # local imports
-from apps.booking.models import Booking, Room, Team, Member
+from apps.booking.models import Booking, BookingArchive, RecurringSeries, Room, Team, Member, BOOKING_SLOTS
+from apps.booking.availability import available_rooms, availability_matrix, parse_availability_query, MAX_MATRIX_DAYS
+from apps.booking.cache import availability_cache
+from apps.booking.events import publish_availability
+from apps.booking.export import EXPORT_FORMATS, aexport_lines, export_lines, export_rows, parse_export_query
+from apps.booking.bulk import BulkBookingPlan, MAX_BULK_BOOKINGS
+from apps.booking.inventory import book, book_any, release, reserve, reserve_many
+from apps.booking.recurring import book_series, cancel_series
+from apps.booking.roster import MAX_ROSTER_MEMBERS, RosterImport
+from apps.booking.signals import invalidate_availability
+from apps.booking.utilization import parse_utilization_query, record_bookings, utilization_report
+from apps.booking.versions import ROOMS, TEAMS, conditional_response, date_key, user_key
 from apps.users.models import User
-from apps.booking.api.serializers import BookingSerializer, RoomSerializer, TeamSerializer, MemberSerializer
+from apps.users.provisioning import file_format, read_rows
+from apps.booking.api.serializers import (
+    BookingSerializer, RecurringSeriesSerializer, RoomSerializer, TeamSerializer, MemberSerializer
+)
+from apps.booking.api.pagination import BookingPagination
+
+def members_prefetch(lookup='members'):
+    """Prefetches team members with only the columns ``MemberSerializer`` renders."""
+    return Prefetch(
+        lookup,
+        queryset=Member.objects.all().only('id', 'team_id', 'uuid', 'name', 'age', 'gender', 'email'),
+    )
+
+
+def user_bookings(user, model=Booking):
+    """
+    Bookings listed by ``BookingViewSet.list``, ready for ``BookingSerializer``.
+    Pass ``model=BookingArchive`` for the archived ones.
+    """
+    return (
+        model.objects.select_related('room', 'team')
+        .prefetch_related(members_prefetch('team__members'))
+        .filter(user=user)
+    )
 
-BOOKING_SLOTS = [time(h, 0) for h in range(9, 18)]
 
 class TeamViewSet(viewsets.ModelViewSet):
-    queryset = Team.objects.all()
+    queryset = Team.objects.all().prefetch_related(members_prefetch())
     serializer_class = TeamSerializer
     permission_classes = [IsAuthenticated]
 
+    def list(self, request, *args, **kwargs):
+        return conditional_response(request, [TEAMS], lambda: super(TeamViewSet, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return conditional_response(
+            request, [TEAMS], lambda: super(TeamViewSet, self).retrieve(request, *args, **kwargs)
+        )
+
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
+    @action(detail=True, methods=['post'], url_path='roster')
+    def roster(self, request, pk=None):
+        """
+        Adds members from a CSV/JSONL ``file`` upload (``name,email,age,gender``)
+        or a JSON list, validated together and inserted in one transaction.
+        """
+        # Without the members prefetch of ``queryset``: the roster may be large.
+        team = get_object_or_404(Team.objects.all(), pk=pk)
+        upload = request.FILES.get('file')
+        if upload is not None:
+            try:
+                rows = read_rows(upload, request.data.get('format') or file_format(upload.name))
+            except (UnicodeDecodeError, ValueError) as error:
+                return Response({'detail': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            rows = request.data if isinstance(request.data, list) else request.data.get('members')
+            if not isinstance(rows, list):
+                return Response({'detail': 'Upload a file or send a list of members.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not rows or len(rows) > MAX_ROSTER_MEMBERS:
+            return Response(
+                {'detail': f'Send between 1 and {MAX_ROSTER_MEMBERS} members.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        roster = RosterImport(team, rows, created_by=request.user).run()
+        return Response(
+            {**roster.report(), 'results': roster.results},
+            status=status.HTTP_201_CREATED if roster.created else status.HTTP_400_BAD_REQUEST,
+        )
+
 
 class MemberViewSet(viewsets.ModelViewSet):
     queryset = Member.objects.all()
@@ -45,15 +121,29 @@ class MemberViewSet(viewsets.ModelViewSet):
 
 
 class BookingViewSet(viewsets.ViewSet):
-    """Handles booking, cancel, and list."""
+    """Handles booking, cancel, edit and list."""
     permission_classes = [IsAuthenticated]
     lookup_field = 'uuid'
+    # Registered at the router root: keep detail routes from shadowing teams/, members/ and series/.
+    lookup_value_regex = '[0-9a-fA-F-]{32,36}'
     
     
     def list(self, request):
-        bookings = Booking.objects.select_related('room', 'team', 'user').filter(user=request.user)
-        serializer = BookingSerializer(bookings, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # Rooms and teams are embedded in the bookings.
+        return conditional_response(
+            request, [user_key(request.user.pk), ROOMS, TEAMS], lambda: self.list_bookings(request)
+        )
+
+    def list_bookings(self, request):
+        paginator = BookingPagination()
+        if request.query_params.get('include_history') in ('1', 'true', 'True'):
+            page = paginator.paginate_querysets(
+                [user_bookings(request.user), user_bookings(request.user, BookingArchive)], request
+            )
+        else:
+            page = paginator.paginate_queryset(user_bookings(request.user), request, view=self)
+        serializer = BookingSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     @transaction.atomic
     def create(self, request):
@@ -61,6 +151,7 @@ class BookingViewSet(viewsets.ViewSet):
         slot = data.get('slot')
         date_str = data.get('date')
         room_id = data.get('room_id')
+        room_type = data.get('room_type')
         team_id = data.get('team_id')
         
         # Validate slot
@@ -77,26 +168,43 @@ class BookingViewSet(viewsets.ViewSet):
         except Exception:
             return Response({'detail': 'Invalid date format.'}, status=status.HTTP_400_BAD_REQUEST)
        
-        # Validate room
-        try:
-            room = Room.objects.get(uuid=room_id)
-        except Room.DoesNotExist:
-            return Response({'detail': 'Room not found.'}, status=status.HTTP_404_NOT_FOUND)
-        
+        # Validate room, or the room type to allocate a room from
+        room = None
+        min_capacity = None
+        if room_id:
+            try:
+                room = Room.objects.get(uuid=room_id)
+            except Room.DoesNotExist:
+                return Response({'detail': 'Room not found.'}, status=status.HTTP_404_NOT_FOUND)
+            room_type = room.room_type
+        elif room_type:
+            if room_type not in dict(Room.ROOM_TYPES):
+                return Response({'detail': 'Invalid room type.'}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                min_capacity = int(data.get('min_capacity') or 0)
+            except (TypeError, ValueError):
+                return Response({'detail': 'Invalid minimum capacity.'}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            return Response({'detail': 'Room or room type required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        def reserve_and_book(**fields):
+            if room is not None:
+                return book(room, booking_date, slot_time, **fields)
+            return book_any(room_type, booking_date, slot_time, min_capacity=min_capacity, **fields)
+
         # Booking logic by room type
-        if room.room_type == Room.PRIVATE:
-            # Only one user per slot
-            if Booking.objects.filter(room=room, date=booking_date, slot=slot_time).exists():
-                return Response({'detail': 'No available room for the selected slot and type.'}, status=status.HTTP_400_BAD_REQUEST)
-            
+        if room_type == Room.PRIVATE:
             # Prevent user double-booking
             if Booking.objects.filter(date=booking_date, slot=slot_time, user=request.user).exists():
                 return Response({'detail': 'User already has a booking for this slot.'}, status=400)
-           
-            booking = Booking.objects.create(room=room, date=booking_date, slot=slot_time, user=request.user)
-            return Response({'booking_id': str(booking.uuid)}, status=status.HTTP_201_CREATED)
+
+            # Only one user per slot
+            booking = reserve_and_book(user=request.user)
+            if booking is None:
+                return Response({'detail': 'No available room for the selected slot and type.'}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({'booking_id': str(booking.uuid), 'room_id': str(booking.room.uuid)}, status=status.HTTP_201_CREATED)
        
-        elif room.room_type == Room.CONFERENCE:
+        elif room_type == Room.CONFERENCE:
             # Team booking, team size >= 3 (excluding children for seat, but included in headcount)
             if not team_id:
                 return Response({'detail': 'Team required for conference room.'}, status=status.HTTP_400_BAD_REQUEST)
@@ -106,71 +214,256 @@ class BookingViewSet(viewsets.ViewSet):
             except Team.DoesNotExist:
                 return Response({'detail': 'Team not found.'}, status=status.HTTP_404_NOT_FOUND)
             
-            members = Member.objects.filter(team=team)
-            if members.count() < 3:
+            if team.member_count < 3:
                 return Response({'detail': 'Conference room requires at least 3 team members.'}, status=status.HTTP_400_BAD_REQUEST)
             
             # Prevent double-booking for team
-            if Booking.objects.filter(room=room, date=booking_date, slot=slot_time).exists():
-                return Response({'detail': 'No available room for the selected slot and type.'}, status=status.HTTP_400_BAD_REQUEST)
             if Booking.objects.filter(date=booking_date, slot=slot_time, team=team).exists():
                 return Response({'detail': 'Team already has a booking for this slot.'}, status=status.HTTP_400_BAD_REQUEST)
            
-            booking = Booking.objects.create(room=room, team=team, date=booking_date, slot=slot_time, user=request.user)
-            return Response({'booking_id': str(booking.uuid)}, status=status.HTTP_201_CREATED)
-       
-        elif room.room_type == Room.SHARED:
-            # Shared desk: up to 4 users per slot
-            # Find or create a booking for this slot/room with < 4 users
-            existing_bookings = Booking.objects.filter(room=room, date=booking_date, slot=slot_time)
-            if existing_bookings.count() >= room.capacity:
+            booking = reserve_and_book(team=team, user=request.user)
+            if booking is None:
                 return Response({'detail': 'No available room for the selected slot and type.'}, status=status.HTTP_400_BAD_REQUEST)
-            
+            return Response({'booking_id': str(booking.uuid), 'room_id': str(booking.room.uuid)}, status=status.HTTP_201_CREATED)
+       
+        elif room_type == Room.SHARED:
             # Prevent user double-booking
             if Booking.objects.filter(date=booking_date, slot=slot_time, user=request.user).exists():
                 return Response({'detail': 'User already has a booking for this slot.'}, status=status.HTTP_400_BAD_REQUEST)
-            
-            booking = Booking.objects.create(room=room, date=booking_date, slot=slot_time, user=request.user)
-            return Response({'booking_id': str(booking.uuid)}, status=status.HTTP_201_CREATED)
+
+            # Shared desk: up to `capacity` users per slot, taken from the slot inventory
+            booking = reserve_and_book(user=request.user)
+            if booking is None:
+                return Response({'detail': 'No available room for the selected slot and type.'}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({'booking_id': str(booking.uuid), 'room_id': str(booking.room.uuid)}, status=status.HTTP_201_CREATED)
         else:
             return Response({'detail': 'Invalid room type.'}, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """Validates a list of bookings together and inserts the accepted ones in one transaction."""
+        items = request.data.get('bookings') if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response({'detail': 'A non-empty list of bookings is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > MAX_BULK_BOOKINGS:
+            return Response(
+                {'detail': f'At most {MAX_BULK_BOOKINGS} bookings can be requested at once.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            with transaction.atomic():
+                plan = BulkBookingPlan(request.user, items).build()
+                seats = Counter((booking.room_id, booking.date, booking.slot) for booking in plan.bookings)
+                if not reserve_many(seats):
+                    raise IntegrityError('Slot inventory exhausted.')
+                Booking.objects.bulk_create(plan.bookings)
+                record_bookings(seats, rooms={booking.room for booking in plan.bookings})
+                publish_availability(seats)
+                invalidate_availability(((booking.date, booking.slot) for booking in plan.bookings), [request.user.pk])
+        except IntegrityError:
+            return Response(
+                {'detail': 'Some slots were booked concurrently, please retry.'},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        results = sorted(plan.results, key=lambda result: result['index'])
+        response_status = status.HTTP_201_CREATED if plan.bookings else status.HTTP_400_BAD_REQUEST
+        return Response({'results': results}, status=response_status)
+
     @action(detail=True, methods=['post'], url_path='cancel')
     def cancel(self, request, uuid=None):
         try:
             booking = Booking.objects.get(uuid=uuid)
         except Booking.DoesNotExist:
             return Response({'detail': 'Booking not found.'}, status=404)
-        booking.delete()
+        # Soft delete: the row is kept for history and the slot's seat is released by the signal.
+        booking.remove()
         return Response({'detail': 'Booking cancelled.'}, status=200)
 
+    @transaction.atomic
+    def partial_update(self, request, uuid=None):
+        """Moves one of the user's bookings, e.g. a single occurrence of a series, to another room/date/slot."""
+        try:
+            booking = (
+                Booking.objects.select_for_update(of=('self',)).select_related('room', 'team')
+                .get(uuid=uuid, user=request.user)
+            )
+        except (Booking.DoesNotExist, ValidationError):
+            return Response({'detail': 'Booking not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        item = {
+            'room_id': request.data.get('room_id') or (str(booking.room.uuid) if booking.room else ''),
+            'team_id': request.data.get('team_id') or (str(booking.team.uuid) if booking.team else ''),
+            'date': request.data.get('date') or str(booking.date),
+            'slot': request.data.get('slot') or (booking.slot.isoformat() if booking.slot else ''),
+        }
+        plan = BulkBookingPlan(request.user, [item], exclude=booking.pk).build()
+        if not plan.bookings:
+            return Response({'detail': plan.results[0]['detail']}, status=status.HTTP_400_BAD_REQUEST)
+
+        moved = plan.bookings[0]
+        moves_seat = (moved.room_id, moved.date, moved.slot) != (booking.room_id, booking.date, booking.slot)
+        if moves_seat:
+            if not reserve(moved.room, moved.date, moved.slot):
+                return Response(
+                    {'detail': 'No available room for the selected slot and type.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if booking.room_id and booking.date and booking.slot:
+                release(booking.room_id, booking.date, booking.slot)
+            # Both seats moved with conditional deltas: an absolute recount could overwrite a concurrent booking's.
+            booking._slot_reserved = True
+        if moves_seat or moved.team_id != booking.team_id:
+            # Only conference bookings keep their team, which holds the slot for it.
+            booking.room, booking.date, booking.slot, booking.team = moved.room, moved.date, moved.slot, moved.team
+            booking.save()
+        return Response(BookingSerializer(booking).data)
+
+
+class RecurringSeriesViewSet(viewsets.GenericViewSet):
+    """Creates, lists, shows and cancels the user's recurring booking series."""
+    serializer_class = RecurringSeriesSerializer
+    permission_classes = [IsAuthenticated]
+    lookup_field = 'uuid'
+
+    def get_queryset(self):
+        return RecurringSeries.objects.filter(user=self.request.user).select_related('room', 'team')
+
+    def list(self, request):
+        page = self.paginate_queryset(self.get_queryset())
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    def create(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        series = RecurringSeries(user=request.user, **serializer.validated_data)
+        try:
+            plan = book_series(series)
+        except ValueError as error:
+            return Response({'detail': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError:
+            return Response(
+                {'detail': 'Some slots were booked concurrently, please retry.'},
+                status=status.HTTP_409_CONFLICT
+            )
+        if not plan.bookings:
+            return Response({'results': plan.results}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'series_id': str(series.uuid), 'results': plan.results}, status=status.HTTP_201_CREATED)
+
+    def retrieve(self, request, uuid=None):
+        series = self.get_object()
+        occurrences = series.bookings.order_by('date', 'slot').values_list('uuid', 'date', 'slot', 'room__uuid')
+        return Response({
+            **self.get_serializer(series).data,
+            'occurrences': [
+                {'booking_id': str(booking_id), 'date': booking_date, 'slot': slot_time, 'room_id': str(room_id)}
+                for booking_id, booking_date, slot_time, room_id in occurrences
+            ],
+        })
+
+    @action(detail=True, methods=['post'], url_path='cancel')
+    def cancel(self, request, uuid=None):
+        cancelled = cancel_series(self.get_object())
+        return Response({'detail': 'Series cancelled.', 'cancelled': cancelled})
+
 class RoomAvailabilityView(APIView):
     permission_classes = [IsAuthenticated]
     def get(self, request):
-        date_str = request.query_params.get('date')
-        slot = request.query_params.get('slot')
-       
         try:
-            booking_date = datetime.strptime(date_str, '%Y-%m-%d').date() if date_str else None
-        except Exception:
-            return Response({'detail': 'Invalid date format.'}, status=status.HTTP_400_BAD_REQUEST)
-        
+            key = parse_availability_query(request.query_params)
+        except ValueError as error:
+            return Response({'detail': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        # Without a date and slot every room is listed, whatever its bookings.
+        keys = [ROOMS, date_key(key[0])] if key[0] and key[1] else [ROOMS]
+        return conditional_response(request, keys, lambda: self.available(key))
+
+    def available(self, key):
+        available = availability_cache.get(key)
+        if available is None:
+            rooms = available_rooms(*key)
+            available = RoomSerializer(rooms, many=True).data
+            availability_cache.set(key, available)
+        return Response(available)
+
+
+class AvailabilityCacheStatsView(APIView):
+    """Hit/miss counters of this worker's availability cache."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(availability_cache.stats())
+
+
+class BookingExportView(APIView):
+    """
+    Streams every booking matching the filters as CSV or NDJSON (``?output=``),
+    archived ones included, without building the list in memory.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        output = request.query_params.get('output', 'csv')
+        if output not in EXPORT_FORMATS:
+            return Response({'detail': 'Invalid output, use csv or ndjson.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            filters = parse_export_query(request.query_params)
+        except ValueError as error:
+            return Response({'detail': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Under ASGI a sync iterator would be read into memory before the first byte is sent.
+        stream = aexport_lines if isinstance(request._request, ASGIRequest) else export_lines
+        response = StreamingHttpResponse(
+            stream(output, export_rows(**filters)), content_type=EXPORT_FORMATS[output]
+        )
+        response['Content-Disposition'] = f'attachment; filename="bookings.{output}"'
+        return response
+
+
+class UtilizationView(APIView):
+    """
+    Bookings, capacity and utilization for a date range grouped by room,
+    room type, date and/or slot (``?group_by=``), answered from the daily
+    rollups without reading bookings.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            start, end, group_by, room_type = parse_utilization_query(request.query_params)
+        except ValueError as error:
+            return Response({'detail': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'start': start,
+            'end': end,
+            'group_by': group_by,
+            'results': utilization_report(start, end, group_by, room_type),
+        })
+
+
+class RoomAvailabilityMatrixView(APIView):
+    """Room x date x slot availability for a date range in one response."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        start_str = request.query_params.get('start')
+        end_str = request.query_params.get('end') or start_str
+        room_type = request.query_params.get('room_type')
+
         try:
-            slot_time = datetime.strptime(slot, '%H:%M:%S').time() if slot else None
+            start_date = datetime.strptime(start_str, '%Y-%m-%d').date()
+            end_date = datetime.strptime(end_str, '%Y-%m-%d').date()
         except Exception:
-            return Response({'detail': 'Invalid slot format.'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        rooms = Room.objects.all()
-        available = []
-        for room in rooms:
-            if booking_date and slot_time:
-                count = Booking.objects.filter(room=room, date=booking_date, slot=slot_time).count()
-                if room.room_type == Room.SHARED:
-                    if count < room.capacity:
-                        available.append(RoomSerializer(room).data)
-                else:
-                    if count == 0:
-                        available.append(RoomSerializer(room).data)
-            else:
-                available.append(RoomSerializer(room).data)
-        return Response(available) 
\ No newline at end of file
+            return Response({'detail': 'Invalid date format.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if end_date < start_date:
+            return Response({'detail': 'End date must not be before start date.'}, status=status.HTTP_400_BAD_REQUEST)
+        if (end_date - start_date).days >= MAX_MATRIX_DAYS:
+            return Response(
+                {'detail': f'Date range cannot exceed {MAX_MATRIX_DAYS} days.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if room_type and room_type not in dict(Room.ROOM_TYPES):
+            return Response({'detail': 'Invalid room type.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(availability_matrix(start_date, end_date, room_type))
@@ -0,0 +1,63 @@
+# django imports
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+# std imports
+from datetime import timedelta
+
+# local imports
+from apps.booking.models import Booking, BookingArchive, SlotInventory
+from apps.booking.versions import bump_dates
+
+# Columns copied as-is from Booking; the archive only adds ``archived_at``.
+ARCHIVE_FIELDS = [field.attname for field in BookingArchive._meta.concrete_fields if field.name != 'archived_at']
+
+
+def delete_rows(queryset):
+    """
+    Deletes the rows of ``queryset`` with one ``DELETE ... WHERE pk IN
+    (SELECT ...)``, without loading them and without the ``pre_delete`` and
+    ``post_delete`` signals: callers handle those side effects themselves.
+    Returns the number of rows deleted.
+    """
+    meta = queryset.model._meta
+    connection = connections[queryset.db]
+    quote = connection.ops.quote_name
+    select, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote(meta.db_table)} WHERE {quote(meta.pk.column)} IN ({select})', params
+        )
+        return cursor.rowcount
+
+
+def archive_cutoff():
+    """Bookings dated before this day belong in the archive."""
+    return timezone.localdate() - timedelta(days=settings.BOOKING_ARCHIVE_AFTER_DAYS)
+
+
+def archive_bookings(before, batch_size=1000):
+    """
+    Moves bookings dated before ``before`` (cancelled ones included) to
+    ``BookingArchive`` in batches of ``batch_size``, one transaction per
+    batch, and drops the slot inventory of those days. Returns the number
+    of bookings moved. Safe to re-run after an interruption.
+    """
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Booking._base_manager.filter(date__lt=before).order_by('id').values(*ARCHIVE_FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+            BookingArchive._base_manager.bulk_create(
+                [BookingArchive(**row) for row in rows], ignore_conflicts=True
+            )
+            # Without the per-row post_delete signal: past slots have no seat to give back.
+            delete_rows(Booking._base_manager.filter(pk__in=[row['id'] for row in rows]))
+            bump_dates({row['date'] for row in rows}, {row['user_id'] for row in rows})
+        moved += len(rows)
+    SlotInventory.objects.filter(date__lt=before).delete()
+    return moved
@@ -0,0 +1,129 @@
+# std imports
+from datetime import datetime, timedelta
+
+# django imports
+from django.db.models import Case, Count, F, IntegerField, Q, Value, When
+
+# local imports
+from apps.booking.models import Booking, Room, BOOKING_SLOTS
+
+MAX_MATRIX_DAYS = 31
+
+
+def seats_expression():
+    """
+    Number of bookings a room accepts per slot: shared desks take one booking
+    per seat, private and conference rooms are booked as a whole.
+    """
+    return Case(
+        When(room_type=Room.SHARED, then='capacity'),
+        default=Value(1),
+        output_field=IntegerField(),
+    )
+
+
+def parse_availability_query(params):
+    """
+    Reads the optional ``date``, ``slot`` and ``room_type`` filters of the
+    availability endpoints, raising ``ValueError`` with the client-facing
+    message when one is malformed.
+    """
+    date_str = params.get('date')
+    slot = params.get('slot')
+    room_type = params.get('room_type') or None
+
+    try:
+        booking_date = datetime.strptime(date_str, '%Y-%m-%d').date() if date_str else None
+    except ValueError:
+        raise ValueError('Invalid date format.')
+    try:
+        slot_time = datetime.strptime(slot, '%H:%M:%S').time() if slot else None
+    except ValueError:
+        raise ValueError('Invalid slot format.')
+    if room_type and room_type not in dict(Room.ROOM_TYPES):
+        raise ValueError('Invalid room type.')
+    return booking_date, slot_time, room_type
+
+
+def available_rooms(booking_date=None, slot_time=None, room_type=None):
+    """
+    Returns the rooms that still accept a booking for ``booking_date`` and
+    ``slot_time``, computed with a single grouped query over all rooms.
+
+    When either the date or the slot is missing every room is returned.
+    """
+    rooms = Room.objects.all()
+    if room_type:
+        rooms = rooms.filter(room_type=room_type)
+    if not (booking_date and slot_time):
+        return rooms.order_by('id')
+
+    booked = Count(
+        'room_bookings',
+        filter=Q(
+            room_bookings__date=booking_date,
+            room_bookings__slot=slot_time,
+            room_bookings__is_active=True,
+            room_bookings__is_deleted=False,
+        ),
+    )
+    return (
+        rooms.annotate(booked=booked, seats=seats_expression())
+        .filter(booked__lt=F('seats'))
+        .order_by('id')
+    )
+
+
+def availability_matrix(start_date, end_date, room_type=None):
+    """
+    Builds the room x date x slot availability grid for an inclusive date
+    range using two queries: one for the rooms and one for the booking
+    counts grouped by (room, date, slot).
+
+    Each room gets, per date, the remaining bookings for every entry of
+    ``BOOKING_SLOTS`` and a bitmask whose bit ``i`` is set when
+    ``BOOKING_SLOTS[i]`` can still be booked.
+    """
+    dates = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+    slot_index = {slot: i for i, slot in enumerate(BOOKING_SLOTS)}
+    date_index = {day: i for i, day in enumerate(dates)}
+
+    rooms = Room.objects.all()
+    if room_type:
+        rooms = rooms.filter(room_type=room_type)
+    counts = (
+        Booking.objects.filter(date__gte=start_date, date__lte=end_date, room__in=rooms.values('id'))
+        .values_list('room_id', 'date', 'slot')
+        .annotate(booked=Count('id'))
+        .order_by()
+    )
+    rooms = list(rooms.annotate(seats=seats_expression()).order_by('id'))
+
+    remaining = {
+        room.id: [[room.seats] * len(BOOKING_SLOTS) for _ in dates]
+        for room in rooms
+    }
+    for room_id, day, slot, booked in counts:
+        if room_id not in remaining or slot not in slot_index:
+            continue
+        row = remaining[room_id][date_index[day]]
+        row[slot_index[slot]] = max(row[slot_index[slot]] - booked, 0)
+
+    return {
+        'dates': [day.isoformat() for day in dates],
+        'slots': [slot.isoformat() for slot in BOOKING_SLOTS],
+        'rooms': [
+            {
+                'uuid': str(room.uuid),
+                'name': room.name,
+                'room_type': room.room_type,
+                'capacity': room.capacity,
+                'remaining': remaining[room.id],
+                'available': [
+                    sum(1 << i for i, left in enumerate(day) if left > 0)
+                    for day in remaining[room.id]
+                ],
+            }
+            for room in rooms
+        ],
+    }
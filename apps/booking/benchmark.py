@@ -0,0 +1,388 @@
+# third party imports
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# django imports
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# std imports
+import json
+import math
+import random
+import re
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+# local imports
+from apps.booking.archive import archive_bookings, delete_rows
+from apps.booking.cache import availability_cache
+from apps.booking.dataset import BENCH_PASSWORD, BENCH_ROOM_PREFIX, DatasetGenerator
+from apps.booking.models import Booking, BookingArchive, Room, BOOKING_SLOTS
+from apps.users.models import User
+
+LOGIN_URL = '/api/v1/users/auth/login/'
+AVAILABILITY_URL = '/api/v1/bookings/rooms/available/'
+BOOKINGS_URL = '/api/v1/bookings/'
+CANCEL_URL = '/api/v1/bookings/{uuid}/cancel/'
+ASYNC_AVAILABILITY_URL = '/api/v1/async/bookings/rooms/available/'
+ASYNC_BOOKINGS_URL = '/api/v1/async/bookings/'
+
+SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(values)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def seed_dataset(users, rooms):
+    """
+    Makes sure ``users`` benchmark accounts and ``rooms`` rooms exist and
+    returns the usernames. Rooms are split between private rooms and shared
+    desks, the two types a single user can book.
+    """
+    generator = DatasetGenerator(users=users, rooms=rooms, room_mix=((Room.SHARED, 1), (Room.PRIVATE, 1)))
+    generator.create_users()
+    generator.create_rooms()
+    return generator.usernames
+
+
+class HttpClient:
+    """Minimal JSON client for one benchmark user, built on urllib."""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.token = None
+        self.last_queries = None
+
+    def request(self, method, path, data=None):
+        """
+        Returns ``(status, payload, elapsed)``. The SQL query count reported by
+        the server in its ``Server-Timing`` header is kept in ``last_queries``.
+        """
+        body = json.dumps(data).encode() if data is not None else None
+        request = urllib.request.Request(self.base_url + path, data=body, method=method)
+        request.add_header('Content-Type', 'application/json')
+        if self.token:
+            request.add_header('Authorization', f'Bearer {self.token}')
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                status, payload, headers = response.status, response.read(), response.headers
+        except urllib.error.HTTPError as error:
+            status, payload, headers = error.code, error.read(), error.headers
+        elapsed = time.perf_counter() - started
+        match = SERVER_TIMING_QUERIES.search(headers.get('Server-Timing') or '')
+        self.last_queries = int(match.group(1)) if match else None
+        try:
+            payload = json.loads(payload) if payload else None
+        except ValueError:
+            pass
+        return status, payload, elapsed
+
+
+class BenchmarkRun:
+    """
+    Drives login, availability, create, list and cancel against a running
+    server with ``clients`` concurrent users, each doing ``iterations``
+    rounds, and collects the latency of every request per endpoint.
+    """
+    endpoints = ('login', 'availability', 'create', 'list', 'cancel')
+
+    def __init__(self, base_url, usernames, clients, iterations, days=14, seed=0):
+        self.base_url = base_url
+        self.usernames = usernames
+        self.clients = clients
+        self.iterations = iterations
+        self.days = days
+        self.seed = seed
+        self.samples = defaultdict(list)
+        self.queries = defaultdict(list)
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, status, elapsed, queries=None, expected=(200, 201)):
+        with self._lock:
+            self.samples[endpoint].append(elapsed)
+            if queries is not None:
+                self.queries[endpoint].append(queries)
+            if status not in expected:
+                self.errors[endpoint] += 1
+
+    def random_request(self, rng):
+        booking_date = timezone.localdate() + timedelta(days=rng.randrange(self.days))
+        return str(booking_date), rng.choice(BOOKING_SLOTS).isoformat()
+
+    def client_loop(self, index):
+        rng = random.Random(self.seed * 100003 + index)
+        client = HttpClient(self.base_url)
+        username = self.usernames[index % len(self.usernames)]
+
+        status, payload, elapsed = client.request('POST', LOGIN_URL, {'username': username, 'password': BENCH_PASSWORD})
+        self.record('login', status, elapsed, client.last_queries)
+        if status != 200:
+            return
+        client.token = payload['access']
+
+        for _ in range(self.iterations):
+            booking_date, slot = self.random_request(rng)
+            status, _, elapsed = client.request('GET', f'{AVAILABILITY_URL}?date={booking_date}&slot={slot}')
+            self.record('availability', status, elapsed, client.last_queries)
+
+            room_type = rng.choice([Room.PRIVATE, Room.SHARED])
+            status, payload, elapsed = client.request(
+                'POST', BOOKINGS_URL, {'room_type': room_type, 'date': booking_date, 'slot': slot}
+            )
+            # Full slots and double bookings are legitimate answers under load.
+            self.record('create', status, elapsed, client.last_queries, expected=(201, 400))
+
+            status, _, elapsed = client.request('GET', BOOKINGS_URL)
+            self.record('list', status, elapsed, client.last_queries)
+
+            if isinstance(payload, dict) and payload.get('booking_id'):
+                status, _, elapsed = client.request('POST', CANCEL_URL.format(uuid=payload['booking_id']))
+                self.record('cancel', status, elapsed, client.last_queries)
+
+    def run(self):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.clients) as pool:
+            list(pool.map(self.client_loop, range(self.clients)))
+        wall_time = time.perf_counter() - started
+
+        endpoints = {}
+        for endpoint in self.endpoints:
+            samples = sorted(self.samples[endpoint])
+            queries = self.queries[endpoint]
+            endpoints[endpoint] = {
+                'queries': round(sum(queries) / len(queries), 2) if queries else None,
+                'count': len(samples),
+                'errors': self.errors[endpoint],
+                'rps': round(len(samples) / wall_time, 2) if wall_time else None,
+                'mean_ms': round(sum(samples) / len(samples) * 1000, 2) if samples else None,
+                **{
+                    f'p{pct}_ms': round(percentile(samples, pct) * 1000, 2) if samples else None
+                    for pct in (50, 95, 99)
+                },
+            }
+        total = sum(len(samples) for samples in self.samples.values())
+        return {
+            'wall_time_s': round(wall_time, 3),
+            'requests': total,
+            'rps': round(total / wall_time, 2) if wall_time else None,
+            'endpoints': endpoints,
+        }
+
+
+class ReadPathRun:
+    """
+    Fires ``requests`` GETs of the availability and booking-list read paths
+    at a server with ``concurrency`` requests in flight, to compare the sync
+    views under WSGI with their async counterparts under ASGI.
+    """
+    paths = {
+        'sync': {'availability': AVAILABILITY_URL, 'list': BOOKINGS_URL},
+        'async': {'availability': ASYNC_AVAILABILITY_URL, 'list': ASYNC_BOOKINGS_URL},
+    }
+
+    def __init__(self, base_url, token, mode, concurrency, requests, days=14, seed=0):
+        self.base_url = base_url
+        self.token = token
+        self.mode = mode
+        self.concurrency = concurrency
+        self.requests = requests
+        self.days = days
+        self.seed = seed
+
+    def fetch(self, args):
+        endpoint, path = args
+        client = HttpClient(self.base_url)
+        client.token = self.token
+        status, _, elapsed = client.request('GET', path)
+        return endpoint, status, elapsed
+
+    def run(self):
+        rng = random.Random(self.seed)
+        paths = self.paths[self.mode]
+        jobs = []
+        for _ in range(self.requests):
+            booking_date = timezone.localdate() + timedelta(days=rng.randrange(self.days))
+            slot = rng.choice(BOOKING_SLOTS).isoformat()
+            jobs.append(('availability', f"{paths['availability']}?date={booking_date}&slot={slot}"))
+            jobs.append(('list', paths['list']))
+
+        samples, errors = defaultdict(list), defaultdict(int)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for endpoint, status, elapsed in pool.map(self.fetch, jobs):
+                samples[endpoint].append(elapsed)
+                if status != 200:
+                    errors[endpoint] += 1
+        wall_time = time.perf_counter() - started
+
+        endpoints = {}
+        for endpoint, values in samples.items():
+            values.sort()
+            endpoints[endpoint] = {
+                'count': len(values),
+                'errors': errors[endpoint],
+                **{f'p{pct}_ms': round(percentile(values, pct) * 1000, 2) for pct in (50, 95, 99)},
+            }
+        return {
+            'mode': self.mode,
+            'wall_time_s': round(wall_time, 3),
+            'requests': len(jobs),
+            'rps': round(len(jobs) / wall_time, 2) if wall_time else None,
+            'endpoints': endpoints,
+        }
+
+
+def login(base_url, username):
+    """Access token of a benchmark user, or ``None`` when the server refuses."""
+    client = HttpClient(base_url)
+    status, payload, _ = client.request('POST', LOGIN_URL, {'username': username, 'password': BENCH_PASSWORD})
+    return payload['access'] if status == 200 else None
+
+
+class HistoryBenchmark:
+    """
+    Measures in-process availability latency while the booking history of
+    the benchmark users grows through ``history_sizes``, once with history
+    left in ``Booking`` and once with it moved to ``BookingArchive``.
+
+    History is dated more than ``HISTORY_OFFSET_DAYS`` ago and the archived
+    run archives everything before that, real bookings included, so run it
+    against a scratch database.
+    """
+    HISTORY_OFFSET_DAYS = 365
+    HISTORY_SPAN_DAYS = 730
+
+    def __init__(self, history_sizes, requests=200, users=50, rooms=100, recent=2000, days=14, seed=0):
+        self.history_sizes = sorted(history_sizes)
+        self.requests = requests
+        self.users = users
+        self.rooms = rooms
+        self.recent = recent
+        self.days = days
+        self.seed = seed
+
+    def bookings(self, count, first_day, span, rng):
+        return [
+            Booking(
+                room_id=rng.choice(self.room_ids),
+                user_id=rng.choice(self.user_ids),
+                date=first_day + timedelta(days=rng.randrange(span)),
+                slot=rng.choice(BOOKING_SLOTS),
+            )
+            for _ in range(count)
+        ]
+
+    def add_history(self, count, rng):
+        newest = timezone.localdate() - timedelta(days=self.HISTORY_OFFSET_DAYS + 1)
+        first_day = newest - timedelta(days=self.HISTORY_SPAN_DAYS - 1)
+        # Random picks may repeat a (room, date, slot, user); those rows are skipped.
+        Booking.objects.bulk_create(
+            self.bookings(count, first_day, self.HISTORY_SPAN_DAYS, rng), ignore_conflicts=True, batch_size=1000
+        )
+
+    def clear_history(self):
+        cutoff = timezone.localdate() - timedelta(days=self.HISTORY_OFFSET_DAYS)
+        for model in (Booking, BookingArchive):
+            delete_rows(model._base_manager.filter(user__in=self.user_ids, date__lt=cutoff))
+
+    def measure(self, client, rng):
+        samples = []
+        for _ in range(self.requests):
+            booking_date = timezone.localdate() + timedelta(days=rng.randrange(self.days))
+            path = f'{AVAILABILITY_URL}?date={booking_date}&slot={rng.choice(BOOKING_SLOTS).isoformat()}'
+            # Measure the database path, not the availability cache.
+            availability_cache.clear()
+            started = time.perf_counter()
+            response = client.get(path)
+            samples.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise RuntimeError(f'Availability request failed with {response.status_code}')
+        samples.sort()
+        return {
+            'mean_ms': round(sum(samples) / len(samples) * 1000, 3),
+            **{f'p{pct}_ms': round(percentile(samples, pct) * 1000, 3) for pct in (50, 95)},
+        }
+
+    def run(self):
+        rng = random.Random(self.seed)
+        usernames = seed_dataset(self.users, self.rooms)
+        users = User.objects.filter(username__in=usernames)
+        self.user_ids = list(users.values_list('id', flat=True))
+        self.room_ids = list(Room.objects.filter(name__startswith=BENCH_ROOM_PREFIX).values_list('id', flat=True))
+        Booking.objects.bulk_create(
+            self.bookings(self.recent, timezone.localdate(), self.days, rng), ignore_conflicts=True, batch_size=1000
+        )
+
+        client = Client(
+            HTTP_HOST='localhost', HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(users[0]).access_token}'
+        )
+        results = {}
+        cutoff = timezone.localdate() - timedelta(days=self.HISTORY_OFFSET_DAYS)
+        for mode in ('live', 'archived'):
+            self.clear_history()
+            results[mode] = []
+            total = 0
+            for size in self.history_sizes:
+                self.add_history(size - total, rng)
+                total = size
+                if mode == 'archived':
+                    archive_bookings(cutoff)
+                results[mode].append({
+                    'history': size,
+                    'booking_rows': Booking._base_manager.count(),
+                    **self.measure(client, rng),
+                })
+        self.clear_history()
+        return results
+
+
+def count_queries(username):
+    """
+    SQL queries per request of each endpoint, measured in-process with the
+    test client, for servers that do not send a ``Server-Timing`` header.
+    """
+    client = Client(HTTP_HOST='localhost')
+    booking_date, slot = str(timezone.localdate() + timedelta(days=1)), BOOKING_SLOTS[0].isoformat()
+    queries = {}
+
+    def measure(endpoint, method, path, data=None, **headers):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(client, method)(path, data=data, content_type='application/json', **headers)
+        queries[endpoint] = len(context.captured_queries)
+        return response
+
+    response = measure('login', 'post', LOGIN_URL, {'username': username, 'password': BENCH_PASSWORD})
+    if response.status_code != 200:
+        return queries
+    auth = {'HTTP_AUTHORIZATION': f"Bearer {response.json()['access']}"}
+    measure('availability', 'get', f'{AVAILABILITY_URL}?date={booking_date}&slot={slot}', **auth)
+    response = measure(
+        'create', 'post', BOOKINGS_URL, {'room_type': Room.SHARED, 'date': booking_date, 'slot': slot}, **auth
+    )
+    measure('list', 'get', BOOKINGS_URL, **auth)
+    if response.status_code == 201:
+        measure('cancel', 'post', CANCEL_URL.format(uuid=response.json()['booking_id']), **auth)
+    return queries
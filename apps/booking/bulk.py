@@ -0,0 +1,161 @@
+# django imports
+from django.db.models import Count
+
+# std imports
+import uuid
+from collections import Counter
+from datetime import datetime
+
+# local imports
+from apps.booking.models import Booking, Room, Team, BOOKING_SLOTS
+
+MAX_BULK_BOOKINGS = 100
+
+
+class BulkBookingPlan:
+    """
+    Validates a batch of booking requests for ``user`` against the same
+    private/conference/shared rules as ``BookingViewSet.create``.
+
+    All lookups are set-based: rooms, teams (which carry their member counts),
+    existing room occupancy and existing user/team bookings are each loaded
+    with one query for the whole batch. Items are then checked in order,
+    so a batch cannot conflict with itself either.
+
+    ``exclude`` ignores one existing booking, the one being moved, and
+    ``fields`` are set on every new booking.
+    """
+
+    def __init__(self, user, items, exclude=None, **fields):
+        self.user = user
+        self.items = items
+        self.exclude = exclude
+        self.fields = fields
+        self.results = []
+        self.bookings = []
+
+    def reject(self, index, detail):
+        self.results.append({'index': index, 'status': 'rejected', 'detail': detail})
+
+    def parse(self):
+        parsed = []
+        for index, item in enumerate(self.items):
+            if not isinstance(item, dict):
+                parsed.append((index, None, 'Invalid booking request.'))
+                continue
+            try:
+                slot_time = datetime.strptime(item.get('slot'), '%H:%M:%S').time()
+            except Exception:
+                parsed.append((index, None, 'Invalid slot format.'))
+                continue
+            if slot_time not in BOOKING_SLOTS:
+                parsed.append((index, None, 'Invalid slot.'))
+                continue
+            try:
+                booking_date = datetime.strptime(item.get('date'), '%Y-%m-%d').date()
+            except Exception:
+                parsed.append((index, None, 'Invalid date format.'))
+                continue
+            request = {
+                'date': booking_date,
+                'slot': slot_time,
+                'room_id': str(item.get('room_id') or ''),
+                'team_id': str(item.get('team_id') or ''),
+            }
+            parsed.append((index, request, None))
+        return parsed
+
+    def build(self):
+        parsed = self.parse()
+        requests = [request for _, request, _ in parsed if request]
+        dates = {request['date'] for request in requests}
+        slots = {request['slot'] for request in requests}
+
+        rooms = {
+            str(room.uuid): room
+            for room in Room.objects.filter(uuid__in=self.valid_uuids(r['room_id'] for r in requests))
+        }
+        teams = {
+            str(team.uuid): team
+            for team in Team.objects.filter(uuid__in=self.valid_uuids(r['team_id'] for r in requests if r['team_id']))
+        }
+
+        occupancy = Counter()
+        user_slots = set()
+        team_slots = set()
+        existing = Booking.objects.exclude(pk=self.exclude) if self.exclude else Booking.objects.all()
+        if requests:
+            occupancy.update({
+                (room_id, day, slot): booked
+                for room_id, day, slot, booked in existing.filter(
+                    room__in=[room.id for room in rooms.values()], date__in=dates, slot__in=slots
+                ).values_list('room_id', 'date', 'slot').annotate(booked=Count('id')).order_by()
+            })
+            user_slots.update(
+                existing.filter(user=self.user, date__in=dates, slot__in=slots).values_list('date', 'slot')
+            )
+            if teams:
+                team_slots.update(
+                    existing.filter(
+                        team__in=[team.id for team in teams.values()], date__in=dates, slot__in=slots
+                    ).values_list('team_id', 'date', 'slot')
+                )
+
+        for index, request, error in parsed:
+            if error:
+                self.reject(index, error)
+                continue
+            booking_date, slot_time = request['date'], request['slot']
+            room = rooms.get(request['room_id'])
+            if room is None:
+                self.reject(index, 'Room not found.')
+                continue
+            room_key = (room.id, booking_date, slot_time)
+            team = None
+
+            if room.room_type in (Room.PRIVATE, Room.SHARED):
+                seats = room.capacity if room.room_type == Room.SHARED else 1
+                if occupancy[room_key] >= seats:
+                    self.reject(index, 'No available room for the selected slot and type.')
+                    continue
+                if (booking_date, slot_time) in user_slots:
+                    self.reject(index, 'User already has a booking for this slot.')
+                    continue
+            elif room.room_type == Room.CONFERENCE:
+                if not request['team_id']:
+                    self.reject(index, 'Team required for conference room.')
+                    continue
+                team = teams.get(request['team_id'])
+                if team is None:
+                    self.reject(index, 'Team not found.')
+                    continue
+                if team.member_count < 3:
+                    self.reject(index, 'Conference room requires at least 3 team members.')
+                    continue
+                if occupancy[room_key]:
+                    self.reject(index, 'No available room for the selected slot and type.')
+                    continue
+                if (team.id, booking_date, slot_time) in team_slots:
+                    self.reject(index, 'Team already has a booking for this slot.')
+                    continue
+                team_slots.add((team.id, booking_date, slot_time))
+            else:
+                self.reject(index, 'Invalid room type.')
+                continue
+
+            occupancy[room_key] += 1
+            user_slots.add((booking_date, slot_time))
+            booking = Booking(room=room, team=team, user=self.user, date=booking_date, slot=slot_time, **self.fields)
+            self.bookings.append(booking)
+            self.results.append({'index': index, 'status': 'accepted', 'booking_id': str(booking.uuid)})
+        return self
+
+    @staticmethod
+    def valid_uuids(values):
+        uuids = set()
+        for value in values:
+            try:
+                uuids.add(str(uuid.UUID(value)))
+            except ValueError:
+                continue
+        return uuids
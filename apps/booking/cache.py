@@ -0,0 +1,78 @@
+# std imports
+import threading
+import time
+from collections import OrderedDict
+
+# django imports
+from django.conf import settings
+
+
+class AvailabilityCache:
+    """
+    Per-process LRU cache of serialized room availability keyed by
+    ``(date, slot, room_type)``.
+
+    Entries are dropped as soon as a booking for their date/slot changes (see
+    ``apps.booking.signals``). The TTL only bounds how stale another worker's
+    entry can get, since invalidation does not cross process boundaries.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, booking_date, slot_time):
+        """Drops every entry, whatever its room type, for ``booking_date``/``slot_time``."""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == booking_date and key[1] == slot_time]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+availability_cache = AvailabilityCache(
+    max_entries=getattr(settings, 'AVAILABILITY_CACHE_MAX_ENTRIES', 1024),
+    ttl=getattr(settings, 'AVAILABILITY_CACHE_TTL', 60),
+)
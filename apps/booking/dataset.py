@@ -0,0 +1,340 @@
+# django imports
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+# std imports
+import csv
+import io
+import itertools
+import random
+import time
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+# local imports
+from apps.booking.archive import delete_rows
+from apps.booking.cache import availability_cache
+from apps.booking.headcount import recount_teams
+from apps.booking.inventory import room_seats
+from apps.booking.models import (
+    Booking, BookingArchive, Member, Room, SlotInventory, Team, BOOKING_SLOTS, CHILD_MAX_AGE,
+)
+from apps.booking.utilization import rebuild_utilization
+from apps.booking.versions import ROOMS, TEAMS, bump, bump_dates
+from apps.users.models import User
+
+BENCH_PASSWORD = 'bench-password'
+BENCH_USER_PREFIX = 'bench-user-'
+BENCH_ROOM_PREFIX = 'Bench '
+BENCH_TEAM_PREFIX = 'Bench Team '
+
+ROOM_MIX = ((Room.PRIVATE, 0.5), (Room.SHARED, 0.35), (Room.CONFERENCE, 0.15))
+ROOM_CAPACITIES = {Room.PRIVATE: 1, Room.SHARED: 4, Room.CONFERENCE: 10}
+# Relative demand per weekday (Monday first) and per slot of BOOKING_SLOTS.
+WEEKDAY_WEIGHTS = (1.0, 1.0, 1.0, 0.9, 0.6, 0.1, 0.05)
+SLOT_WEIGHTS = (0.6, 1.0, 1.0, 0.6, 0.4, 0.9, 0.9, 0.7, 0.3)
+# Share of the seats (and users) a single slot may fill.
+MAX_SLOT_FILL = 0.8
+BOOKING_COLUMNS = (
+    'created', 'modified', 'is_active', 'is_deleted', 'uuid', 'room_id', 'user_id', 'team_id', 'date', 'slot',
+)
+
+
+def zipf_weights(size, skew, rng):
+    """Weights ``1 / rank ** skew`` with the ranks shuffled over ``size`` items."""
+    ranks = list(range(1, size + 1))
+    rng.shuffle(ranks)
+    return [1 / rank ** skew for rank in ranks]
+
+
+def draw_distinct(rng, cum_weights, k):
+    """
+    ``k`` distinct indexes picked by weight; a pick already taken moves on
+    to the next free index. Needs ``k <= len(cum_weights)``.
+    """
+    size, taken, picks = len(cum_weights), set(), []
+    for index in rng.choices(range(size), cum_weights=cum_weights, k=k):
+        while index in taken:
+            index = (index + 1) % size
+        taken.add(index)
+        picks.append(index)
+    return picks
+
+
+class DatasetGenerator:
+    """
+    Builds a synthetic dataset of ``users`` accounts, ``teams`` teams with
+    their members, ``rooms`` rooms and exactly ``bookings`` bookings spread
+    over ``days`` days from ``start``. The same arguments always produce the
+    same rows, ids aside.
+
+    Demand is skewed the way real offices are: a few users and rooms take
+    most of the bookings, weekdays and late mornings are busy and weekends
+    nearly empty. Every booking passes the API rules: no user or team is
+    booked twice in a slot, rooms stay within their seats and conference
+    rooms go to teams of three or more.
+
+    Accounts, teams and rooms are named with the ``Bench`` prefixes and
+    reused when they exist. Bookings the generated rooms already hold in
+    the date range are replaced, one day per transaction, with COPY on
+    PostgreSQL and ``bulk_create`` elsewhere; the slot inventory,
+    utilization rollups and team headcounts are rebuilt afterwards.
+    """
+
+    def __init__(
+        self, users=1000, teams=100, rooms=100, bookings=100000, start=None, days=30, skew=1.0, seed=0,
+        room_mix=ROOM_MIX, batch_size=5000, use_copy=True,
+    ):
+        self.users = users
+        self.teams = teams
+        self.rooms = rooms
+        self.bookings = bookings
+        self.start = start or timezone.localdate()
+        self.days = days
+        self.skew = skew
+        self.seed = seed
+        self.room_mix = room_mix
+        self.batch_size = batch_size
+        self.use_copy = use_copy and connection.vendor == 'postgresql'
+
+    def random(self, stage):
+        # One generator per stage, so changing one count leaves the other stages' rows alone.
+        return random.Random(f'{self.seed}:{stage}')
+
+    @property
+    def usernames(self):
+        return [f'{BENCH_USER_PREFIX}{i}' for i in range(self.users)]
+
+    def create_users(self):
+        """Creates the missing accounts, all with ``BENCH_PASSWORD``, and returns their ids in order."""
+        password = make_password(BENCH_PASSWORD)
+        User.objects.bulk_create(
+            (User(username=username, password=password) for username in self.usernames),
+            ignore_conflicts=True,
+            batch_size=self.batch_size,
+        )
+        ids = dict(User._base_manager.filter(username__startswith=BENCH_USER_PREFIX).values_list('username', 'id'))
+        return [ids[username] for username in self.usernames]
+
+    def room_types(self):
+        """Room type of each room, interleaved so every prefix of the rooms follows ``room_mix``."""
+        total, counts = sum(weight for _, weight in self.room_mix), Counter()
+        for index in range(self.rooms):
+            room_type = max(self.room_mix, key=lambda item: item[1] / total * (index + 1) - counts[item[0]])[0]
+            counts[room_type] += 1
+            yield room_type
+
+    def create_rooms(self):
+        """Creates the missing rooms and returns the active ones, in order."""
+        labels = {room_type: label.split()[0] for room_type, label in Room.ROOM_TYPES}
+        rooms = [
+            Room(
+                name=f'{BENCH_ROOM_PREFIX}{labels[room_type]} {i}', room_type=room_type,
+                capacity=ROOM_CAPACITIES[room_type],
+            )
+            for i, room_type in enumerate(self.room_types())
+        ]
+        Room.objects.bulk_create(rooms, ignore_conflicts=True, batch_size=self.batch_size)
+        existing = Room.objects.filter(name__startswith=BENCH_ROOM_PREFIX).in_bulk(field_name='name')
+        return [existing[room.name] for room in rooms if room.name in existing]
+
+    def create_teams(self, user_ids):
+        """
+        Creates the missing teams, owned by the first users, with three or
+        more members each, about one in ten a child. Returns the team ids.
+        """
+        rng = self.random('teams')
+        names = [f'{BENCH_TEAM_PREFIX}{i}' for i in range(self.teams)]
+        existing = dict(Team._base_manager.filter(name__startswith=BENCH_TEAM_PREFIX).values_list('name', 'id'))
+        Team.objects.bulk_create(
+            [
+                Team(name=name, created_by_id=user_ids[i % len(user_ids)])
+                for i, name in enumerate(names) if name not in existing
+            ],
+            batch_size=self.batch_size,
+        )
+        existing = dict(Team._base_manager.filter(name__startswith=BENCH_TEAM_PREFIX).values_list('name', 'id'))
+        team_ids = [existing[name] for name in names]
+
+        genders = [gender for gender, _ in Member.GENDER_CHOICES]
+        members = (
+            Member(
+                name=f'Member {j}',
+                email=f'member{j}@team{i}.example.com',
+                age=rng.randint(4, CHILD_MAX_AGE - 1) if rng.random() < 0.1 else rng.randint(18, 65),
+                gender=rng.choice(genders),
+                team_id=team_id,
+            )
+            for i, team_id in enumerate(team_ids)
+            for j in range(min(3 + int(rng.expovariate(0.25)), 30))
+        )
+        while batch := list(itertools.islice(members, self.batch_size)):
+            Member.objects.bulk_create(batch, ignore_conflicts=True)
+        return team_ids
+
+    def slot_quotas(self):
+        """Bookings of each (date, slot), summing to exactly ``bookings``."""
+        rng = self.random('quotas')
+        cells, weights = [], []
+        for offset in range(self.days):
+            booking_date = self.start + timedelta(days=offset)
+            day_weight = WEEKDAY_WEIGHTS[booking_date.weekday()] * rng.uniform(0.8, 1.2)
+            for slot_time, slot_weight in zip(BOOKING_SLOTS, SLOT_WEIGHTS):
+                cells.append((booking_date, slot_time))
+                weights.append(day_weight * slot_weight)
+        total = sum(weights)
+        exact = [self.bookings * weight / total for weight in weights]
+        counts = [int(value) for value in exact]
+        # Hand the rounding remainder to the largest fractions.
+        for index in sorted(range(len(cells)), key=lambda i: counts[i] - exact[i])[:self.bookings - sum(counts)]:
+            counts[index] += 1
+        return list(zip(cells, counts))
+
+    def check_capacity(self, seats, conference_rooms, teams):
+        if conference_rooms > teams:
+            raise ValueError(f'{conference_rooms} conference rooms need at least as many teams.')
+        limit = int(MAX_SLOT_FILL * min(seats, self.users))
+        busiest = max(count for _, count in self.slot_quotas())
+        if busiest > limit:
+            raise ValueError(
+                f'The busiest slot needs {busiest} bookings but at most {limit} fit: '
+                'add rooms, users or days, or lower the bookings.'
+            )
+
+    def validate(self):
+        """Rejects arguments the dataset cannot be built from, before anything is written."""
+        if min(self.users, self.rooms, self.days, self.batch_size) < 1 or self.teams < 0 or self.bookings < 0:
+            raise ValueError('Users, rooms, days and batch size must be positive; teams and bookings not negative.')
+        types = Counter(self.room_types())
+        seats = sum(ROOM_CAPACITIES[room_type] if room_type == Room.SHARED else 1 for room_type in types.elements())
+        self.check_capacity(seats, types[Room.CONFERENCE], self.teams)
+
+    def slot_bookings(self, rng, booking_date, slot_time, count, seats, users, teams):
+        """Rows of ``count`` bookings of one (date, slot), as ``BOOKING_COLUMNS`` minus the timestamps and flags."""
+        rooms = [seats['rooms'][index] for index in draw_distinct(rng, seats['weights'], count)]
+        conference = [room for room in rooms if room.room_type == Room.CONFERENCE]
+        team_ids = iter([teams['ids'][index] for index in draw_distinct(rng, teams['weights'], len(conference))])
+        return [
+            (
+                uuid.UUID(int=rng.getrandbits(128), version=4),
+                room.id,
+                users['ids'][user_index],
+                next(team_ids) if room.room_type == Room.CONFERENCE else None,
+                booking_date,
+                slot_time,
+            )
+            for room, user_index in zip(rooms, draw_distinct(rng, users['weights'], count))
+        ]
+
+    def copy_bookings(self, rows):
+        """Loads ``rows`` with one COPY ... FROM STDIN (psycopg 3 or psycopg2)."""
+        now = timezone.now()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        # Unquoted empty fields are NULL in CSV COPY.
+        writer.writerows((now, now, 'true', 'false', *row) for row in rows)
+        buffer.seek(0)
+        quote = connection.ops.quote_name
+        sql = (
+            f'COPY {quote(Booking._meta.db_table)} ({", ".join(quote(column) for column in BOOKING_COLUMNS)}) '
+            'FROM STDIN WITH (FORMAT csv)'
+        )
+        with connection.cursor() as cursor:
+            raw = cursor.cursor
+            if hasattr(raw, 'copy_expert'):
+                raw.copy_expert(sql, buffer)
+            else:
+                with raw.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+    def insert_bookings(self, rows):
+        if self.use_copy:
+            return self.copy_bookings(rows)
+        Booking.objects.bulk_create(
+            [
+                Booking(
+                    uuid=booking_uuid, room_id=room_id, user_id=user_id, team_id=team_id, date=booking_date,
+                    slot=slot_time,
+                )
+                for booking_uuid, room_id, user_id, team_id, booking_date, slot_time in rows
+            ],
+            batch_size=self.batch_size,
+        )
+
+    def create_bookings(self, rooms, user_ids, team_ids):
+        """
+        Replaces the bookings the ``Bench`` rooms hold in the range, one day
+        per transaction, and writes the inventory of the upcoming slots.
+        Returns the dates of the range.
+        """
+        rng = self.random('bookings')
+        seats_by_room = {room.id: room_seats(room) for room in rooms}
+        self.check_capacity(
+            sum(seats_by_room.values()), sum(room.room_type == Room.CONFERENCE for room in rooms), len(team_ids)
+        )
+        # Every seat of a shared desk gets the popularity of its room.
+        popularity = dict(zip(seats_by_room, zipf_weights(len(rooms), self.skew, rng)))
+        seats = {'rooms': [room for room in rooms for _ in range(seats_by_room[room.id])]}
+        # Neighbouring seats, users and teams have unrelated popularity, so taken picks move on to a random one.
+        rng.shuffle(seats['rooms'])
+        seats['weights'] = list(itertools.accumulate(popularity[room.id] for room in seats['rooms']))
+        users = {'ids': user_ids, 'weights': list(itertools.accumulate(zipf_weights(len(user_ids), self.skew, rng)))}
+        teams = {'ids': team_ids, 'weights': list(itertools.accumulate(zipf_weights(len(team_ids), self.skew, rng)))}
+
+        end = self.start + timedelta(days=self.days - 1)
+        today = timezone.localdate()
+        bench_rooms = Room._base_manager.filter(name__startswith=BENCH_ROOM_PREFIX)
+        for model in (Booking, BookingArchive):
+            delete_rows(model._base_manager.filter(room__in=bench_rooms, date__range=(self.start, end)))
+        delete_rows(SlotInventory.objects.filter(room__in=bench_rooms, date__range=(max(self.start, today), end)))
+
+        dates = []
+        for booking_date, quotas in itertools.groupby(self.slot_quotas(), key=lambda item: item[0][0]):
+            dates.append(booking_date)
+            rows = []
+            for (_, slot_time), count in quotas:
+                rows += self.slot_bookings(rng, booking_date, slot_time, count, seats, users, teams)
+            booked = Counter((room_id, slot_time) for _, room_id, _, _, _, slot_time in rows)
+            with transaction.atomic():
+                for start in range(0, len(rows), self.batch_size):
+                    self.insert_bookings(rows[start:start + self.batch_size])
+                if booking_date >= today:
+                    SlotInventory.objects.bulk_create(
+                        [
+                            SlotInventory(
+                                room_id=room_id, date=booking_date, slot=slot_time,
+                                remaining=seats_by_room[room_id] - total,
+                            )
+                            for (room_id, slot_time), total in booked.items()
+                        ],
+                        batch_size=self.batch_size,
+                    )
+        return dates
+
+    def run(self):
+        """Builds the dataset and returns what was generated, with the time it took."""
+        self.validate()
+        started = time.perf_counter()
+        user_ids = self.create_users()
+        team_ids = self.create_teams(user_ids)
+        rooms = self.create_rooms()
+        dates = self.create_bookings(rooms, user_ids, team_ids)
+
+        rebuild_utilization(dates[0], dates[-1], batch_size=self.batch_size)
+        recount_teams()
+        bump([ROOMS, TEAMS])
+        bump_dates(dates, user_ids)
+        availability_cache.clear()
+        return {
+            'users': len(user_ids),
+            'teams': len(team_ids),
+            'members': Member.objects.filter(team__name__startswith=BENCH_TEAM_PREFIX).count(),
+            'rooms': len(rooms),
+            'bookings': self.bookings,
+            'start': self.start.isoformat(),
+            'days': self.days,
+            'copy': self.use_copy,
+            'seconds': round(time.perf_counter() - started, 3),
+        }
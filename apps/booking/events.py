@@ -0,0 +1,198 @@
+# django imports
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+# std imports
+import asyncio
+import secrets
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import date
+
+# local imports
+from apps.booking.inventory import _remaining_from_bookings
+from apps.booking.models import Room, SlotInventory
+
+
+@dataclass(frozen=True)
+class AvailabilityEvent:
+    token: str
+    number: int
+    date: date
+    data: dict
+
+    @property
+    def id(self):
+        # Scoped to the broker that published it: numbers restart with every process.
+        return f'{self.token}-{self.number}'
+
+
+class Subscription:
+    """
+    Events of a ``LocalBroker`` for one client, optionally limited to
+    ``dates``, delivered to the event loop that subscribed. A client that
+    falls ``max_pending`` events behind is marked ``overflowed`` and has to
+    resynchronise instead of slowing publishers down.
+    """
+
+    def __init__(self, broker, dates=None, max_pending=1000):
+        self.broker = broker
+        self.dates = dates
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_pending)
+        self.overflowed = False
+
+    def wants(self, event):
+        return not self.dates or event.date in self.dates
+
+    def deliver(self, event):
+        # Runs on the subscriber's event loop, whichever thread published.
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def push(self, event):
+        if self.wants(event):
+            self.loop.call_soon_threadsafe(self.deliver, event)
+
+    async def get(self, timeout=None):
+        """The next event, or ``None`` after ``timeout`` seconds without one."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """
+    In-process pub/sub of availability events. Event ids are
+    ``<token>-<number>``: a token drawn when the broker starts and a number
+    increasing by one per event. The last ``backlog`` events are kept, so a
+    client that reconnects with the id it last saw gets what it missed; an
+    id from another worker or an earlier run of this one gets a reset.
+
+    Only writes made by this process are seen. Deployments running several
+    workers point ``AVAILABILITY_BROKER`` at a broker class with the same
+    ``publish``/``subscribe``/``has_subscribers``/``skip`` methods backed by
+    a shared service.
+    """
+
+    def __init__(self, backlog=1000):
+        self.backlog = deque(maxlen=backlog)
+        self.token = secrets.token_hex(8)
+        self.last_id = 0
+        self.subscriptions = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event_date, data):
+        with self._lock:
+            self.last_id += 1
+            event = AvailabilityEvent(self.token, self.last_id, event_date, data)
+            self.backlog.append(event)
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            subscription.push(event)
+        return event
+
+    def subscribe(self, dates=None, last_event_id=None):
+        """
+        Registers a subscription and returns it with the backlog events it
+        missed since ``last_event_id``, or with ``None`` instead of a list
+        when those are no longer (or were never) held here, the id included
+        another broker's token, and the client must reload the current
+        availability.
+        """
+        subscription = Subscription(self, dates)
+        token, _, number = (last_event_id or '').rpartition('-')
+        with self._lock:
+            self.subscriptions.add(subscription)
+            if last_event_id is None:
+                return subscription, []
+            if token != self.token or not number.isdigit():
+                return subscription, None
+            number = int(number)
+            oldest = self.backlog[0].number if self.backlog else self.last_id + 1
+            if number > self.last_id or number < oldest - 1:
+                return subscription, None
+            return subscription, [
+                event for event in self.backlog if event.number > number and subscription.wants(event)
+            ]
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self.subscriptions.discard(subscription)
+
+    def has_subscribers(self):
+        """Whether publishing reaches anyone; writers skip building events otherwise."""
+        return bool(self.subscriptions)
+
+    def skip(self):
+        """
+        Records a change that was not published: clients resuming from an
+        earlier id get a reset instead of a replay with a gap.
+        """
+        with self._lock:
+            self.last_id += 1
+            self.backlog.clear()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """The broker of this process, an instance of ``settings.AVAILABILITY_BROKER``."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.AVAILABILITY_BROKER)(backlog=settings.AVAILABILITY_EVENT_BACKLOG)
+    return _broker
+
+
+def publish_availability(keys):
+    """
+    Publishes the remaining bookings of every ``(room_id, date, slot)`` in
+    ``keys`` once the surrounding transaction commits, so subscribers never
+    see a change that was rolled back. Without subscribers the change is
+    only recorded by ``skip``, with no query.
+    """
+    keys = {key for key in keys if all(key)}
+    if not keys:
+        return
+
+    def publish():
+        broker = get_broker()
+        if not broker.has_subscribers():
+            broker.skip()
+            return
+        rows = {
+            (room_id, booking_date, slot_time): remaining
+            for room_id, booking_date, slot_time, remaining in SlotInventory.objects.filter(
+                room_id__in={key[0] for key in keys},
+                date__in={key[1] for key in keys},
+                slot__in={key[2] for key in keys},
+            ).values_list('room_id', 'date', 'slot', 'remaining')
+        }
+        missing = [key for key in keys if key not in rows]
+        if missing:
+            # Slots never reserved through the inventory, counted from their bookings.
+            for row in _remaining_from_bookings(missing):
+                rows[(row.room_id, row.date, row.slot)] = row.remaining
+        rooms = dict(Room._base_manager.filter(id__in={key[0] for key in keys}).values_list('id', 'uuid'))
+        for room_id, booking_date, slot_time in sorted(keys, key=lambda key: (key[1], key[2], key[0])):
+            if (room_id, booking_date, slot_time) in rows and room_id in rooms:
+                broker.publish(booking_date, {
+                    'room_id': str(rooms[room_id]),
+                    'date': booking_date.isoformat(),
+                    'slot': slot_time.isoformat(),
+                    'remaining': rows[(room_id, booking_date, slot_time)],
+                })
+
+    transaction.on_commit(publish)
@@ -0,0 +1,135 @@
+# third party imports
+from asgiref.sync import sync_to_async
+
+# django imports
+from django.core.serializers.json import DjangoJSONEncoder
+
+# std imports
+import csv
+import itertools
+import uuid
+from datetime import datetime
+
+# local imports
+from apps.booking.models import Booking, BookingArchive, Room
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+# Output column -> lookup read with ``values_list``.
+EXPORT_COLUMNS = {
+    'booking_id': 'uuid',
+    'date': 'date',
+    'slot': 'slot',
+    'room_id': 'room__uuid',
+    'room_name': 'room__name',
+    'room_type': 'room__room_type',
+    'team_id': 'team__uuid',
+    'team_name': 'team__name',
+    'username': 'user__username',
+    'series_id': 'series__uuid',
+    'created': 'created',
+}
+EXPORT_CHUNK_SIZE = 2000
+
+
+def parse_export_query(params):
+    """
+    Reads the optional ``start``/``end`` dates (inclusive), ``room_type`` and
+    ``team_id`` filters, raising ``ValueError`` with the client-facing message.
+    """
+    filters = {}
+    for param in ('start', 'end'):
+        if params.get(param):
+            try:
+                filters[param] = datetime.strptime(params[param], '%Y-%m-%d').date()
+            except ValueError:
+                raise ValueError('Invalid date format.')
+    if filters.get('start') and filters.get('end') and filters['end'] < filters['start']:
+        raise ValueError('End date is before the start date.')
+    room_type = params.get('room_type')
+    if room_type:
+        if room_type not in dict(Room.ROOM_TYPES):
+            raise ValueError('Invalid room type.')
+        filters['room_type'] = room_type
+    team_id = params.get('team_id')
+    if team_id:
+        try:
+            filters['team_id'] = uuid.UUID(team_id)
+        except ValueError:
+            raise ValueError('Invalid team id.')
+    return filters
+
+
+def export_rows(start=None, end=None, room_type=None, team_id=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields one tuple per booking, archived ones first, in ``EXPORT_COLUMNS``
+    order. Rows are read with ``iterator(chunk_size)``, a server-side cursor
+    on PostgreSQL, so only one chunk is held in memory at a time.
+    """
+    for model in (BookingArchive, Booking):
+        bookings = model.objects.exclude(date=None).exclude(slot=None)
+        if start:
+            bookings = bookings.filter(date__gte=start)
+        if end:
+            bookings = bookings.filter(date__lte=end)
+        if room_type:
+            bookings = bookings.filter(room__room_type=room_type)
+        if team_id:
+            bookings = bookings.filter(team__uuid=team_id)
+        yield from (
+            bookings.order_by('date', 'slot', 'id')
+            .values_list(*EXPORT_COLUMNS.values())
+            .iterator(chunk_size=chunk_size)
+        )
+
+
+class Echo:
+    """File-like object whose ``write`` hands the line back to ``csv.writer``."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(EXPORT_COLUMNS, row))) + '\n'
+
+
+def export_lines(output, rows, batch=500):
+    """
+    Lines of ``rows`` rendered as ``output`` (csv or ndjson), joined ``batch``
+    at a time to keep the number of writes down.
+    """
+    lines = csv_lines(rows) if output == 'csv' else ndjson_lines(rows)
+    while True:
+        chunk = ''.join(itertools.islice(lines, batch))
+        if not chunk:
+            return
+        yield chunk
+
+
+async def aexport_lines(output, rows, batch=500):
+    """
+    ``export_lines`` for ASGI servers, which would otherwise read a sync
+    iterator to the end before sending anything. Each chunk is rendered in
+    the thread-sensitive sync thread, so the cursor stays on one database
+    connection, and sent before the next one is read.
+    """
+    lines = export_lines(output, rows, batch)
+    read = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await read(lines, None)) is not None:
+            yield chunk
+    finally:
+        # Closes the cursor when the client goes away mid-export.
+        await sync_to_async(lines.close, thread_sensitive=True)()
@@ -0,0 +1,60 @@
+# django imports
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+# std imports
+from collections import Counter
+
+# local imports
+from apps.booking.models import Member, Team, CHILD_MAX_AGE
+from apps.booking.versions import TEAMS, bump
+
+ADULT_MEMBERS = Q(age__isnull=True) | Q(age__gte=CHILD_MAX_AGE)
+
+
+def is_counted(member):
+    return bool(member.team_id) and member.is_active and not member.is_deleted
+
+
+def adjust_headcount(members=None, adults=None):
+    """
+    Adds ``members[team_id]`` and ``adults[team_id]`` to the team counters
+    with one conditional UPDATE per team, in the caller's transaction.
+    Counters stop at zero; drifted ones are fixed by ``recount_teams``.
+    """
+    members, adults = Counter(members or {}), Counter(adults or {})
+    for team_id in set(members) | set(adults):
+        if members[team_id] or adults[team_id]:
+            Team._base_manager.filter(pk=team_id).update(
+                member_count=Greatest(F('member_count') + members[team_id], Value(0)),
+                adult_count=Greatest(F('adult_count') + adults[team_id], Value(0)),
+            )
+
+
+def counted_members(condition=Q()):
+    """Subquery counting the live members of the outer team matching ``condition``."""
+    members = (
+        Member._base_manager.filter(condition, team=OuterRef('pk'), is_active=True, is_deleted=False)
+        .order_by().values('team').annotate(total=Count('id')).values('total')
+    )
+    return Coalesce(Subquery(members, output_field=IntegerField()), Value(0))
+
+
+def recount_teams(dry_run=False):
+    """
+    Recomputes the counters of every team whose stored counts differ from
+    its members, with one query to find them and one UPDATE, and bumps the
+    teams version so cached team listings are refetched. Returns the ids of
+    the teams that had drifted.
+    """
+    drifted = list(
+        Team._base_manager.annotate(live_members=counted_members(), live_adults=counted_members(ADULT_MEMBERS))
+        .exclude(member_count=F('live_members'), adult_count=F('live_adults'))
+        .values_list('id', flat=True)
+    )
+    if drifted and not dry_run:
+        Team._base_manager.filter(id__in=drifted).update(
+            member_count=counted_members(), adult_count=counted_members(ADULT_MEMBERS)
+        )
+        bump([TEAMS])
+    return drifted
@@ -0,0 +1,192 @@
+# django imports
+from django.db import connection
+from django.db.models import Case, Count, F, Q, Value, When
+
+# std imports
+from functools import reduce
+from operator import or_
+
+# local imports
+from apps.booking.models import Booking, Room, SlotInventory
+
+
+def room_seats(room):
+    """Bookings a room accepts per slot, see ``availability.seats_expression``."""
+    return room.capacity if room.room_type == Room.SHARED else 1
+
+
+def _decrement(room_id, booking_date, slot_time, count):
+    return SlotInventory.objects.filter(
+        room_id=room_id, date=booking_date, slot=slot_time, remaining__gte=count
+    ).update(remaining=F('remaining') - count)
+
+
+def _remaining_from_bookings(keys, exclude=None):
+    """Rows for ``keys`` (room_id, date, slot) computed from the bookings they hold, but ``exclude``."""
+    rooms = Room._base_manager.in_bulk({room_id for room_id, _, _ in keys})
+    bookings = Booking.objects.exclude(pk=exclude) if exclude else Booking.objects.all()
+    booked = dict(
+        ((room_id, day, slot), total)
+        for room_id, day, slot, total in bookings.filter(
+            room__in=list(rooms), date__in={key[1] for key in keys}, slot__in={key[2] for key in keys}
+        ).values_list('room_id', 'date', 'slot').annotate(total=Count('id')).order_by()
+    )
+    return [
+        SlotInventory(
+            room_id=room_id,
+            date=booking_date,
+            slot=slot_time,
+            remaining=max(room_seats(rooms[room_id]) - booked.get((room_id, booking_date, slot_time), 0), 0),
+        )
+        for room_id, booking_date, slot_time in keys
+        if room_id in rooms
+    ]
+
+
+def ensure_inventory(keys, exclude=None):
+    """
+    Creates the missing inventory rows for ``keys`` (room_id, date, slot);
+    existing rows are left untouched.
+    """
+    keys = list(dict.fromkeys(keys))
+    if keys:
+        SlotInventory.objects.bulk_create(_remaining_from_bookings(keys, exclude=exclude), ignore_conflicts=True)
+
+
+def sync_inventory(keys, batch_size=1000):
+    """Recomputes the rows for ``keys`` (room_id, date, slot) from the bookings they hold."""
+    keys = list(dict.fromkeys(keys))
+    for start in range(0, len(keys), batch_size):
+        SlotInventory.objects.bulk_create(
+            _remaining_from_bookings(keys[start:start + batch_size]),
+            update_conflicts=True,
+            unique_fields=['room', 'date', 'slot'],
+            update_fields=['remaining'],
+        )
+
+
+def _reserve(room_id, booking_date, slot_time, count=1, exclude=None):
+    if _decrement(room_id, booking_date, slot_time, count):
+        return True
+    if SlotInventory.objects.filter(room_id=room_id, date=booking_date, slot=slot_time).exists():
+        return False
+    ensure_inventory([(room_id, booking_date, slot_time)], exclude=exclude)
+    return bool(_decrement(room_id, booking_date, slot_time, count))
+
+
+def reserve(room, booking_date, slot_time, count=1):
+    """
+    Atomically takes ``count`` bookings from the slot and returns whether it
+    succeeded. When the row already exists this is one conditional UPDATE;
+    the first booking of a slot creates the row before retrying.
+    """
+    return _reserve(room.id, booking_date, slot_time, count)
+
+
+def reserve_saved(booking):
+    """
+    Takes the seat of ``booking``, saved without ``reserve`` (admin and ORM
+    writes, restored bookings), as ``reserve`` does: a missing row is created
+    from the slot's other bookings. Returns ``False`` when the slot was
+    already full; the row then stays at zero.
+    """
+    return _reserve(booking.room_id, booking.date, booking.slot, exclude=booking.pk)
+
+
+def reserve_many(counts):
+    """
+    Takes ``counts[(room_id, date, slot)]`` bookings from each slot with one
+    conditional UPDATE. Returns ``False`` when any slot is short, in which
+    case the caller must roll back the transaction.
+    """
+    keys = list(counts)
+    if not keys:
+        return True
+    key_filters = {
+        key: Q(room_id=key[0], date=key[1], slot=key[2])
+        for key in keys
+    }
+    existing = set(
+        SlotInventory.objects.filter(reduce(or_, key_filters.values())).values_list('room_id', 'date', 'slot')
+    )
+    ensure_inventory(key for key in keys if key not in existing)
+    updated = SlotInventory.objects.filter(
+        reduce(or_, (key_filters[key] & Q(remaining__gte=counts[key]) for key in keys))
+    ).update(
+        remaining=F('remaining') - Case(
+            *(When(key_filters[key], then=Value(counts[key])) for key in keys),
+            default=Value(0),
+        )
+    )
+    return updated == len(keys)
+
+
+def release(room_id, booking_date, slot_time, count=1):
+    """Gives ``count`` bookings back to the slot."""
+    SlotInventory.objects.filter(
+        room_id=room_id, date=booking_date, slot=slot_time
+    ).update(remaining=F('remaining') + count)
+
+
+def release_many(counts):
+    """Gives ``counts[(room_id, date, slot)]`` bookings back to each slot with one UPDATE."""
+    keys = list(counts)
+    if not keys:
+        return
+    key_filters = {key: Q(room_id=key[0], date=key[1], slot=key[2]) for key in keys}
+    SlotInventory.objects.filter(reduce(or_, key_filters.values())).update(
+        remaining=F('remaining') + Case(
+            *(When(key_filters[key], then=Value(counts[key])) for key in keys),
+            default=Value(0),
+        )
+    )
+
+
+def book(room, booking_date, slot_time, **fields):
+    """
+    Reserves the slot and saves the booking, or returns ``None`` when the
+    room has no seat left. Must run inside the caller's transaction so a
+    failed insert gives the seat back.
+    """
+    if not reserve(room, booking_date, slot_time):
+        return None
+    booking = Booking(room=room, date=booking_date, slot=slot_time, **fields)
+    booking._slot_reserved = True
+    booking.save()
+    return booking
+
+
+def book_any(room_type, booking_date, slot_time, min_capacity=None, **fields):
+    """
+    Picks a room of ``room_type`` with a free seat for the slot, reserves it
+    and saves the booking; returns ``None`` when every such room is full.
+
+    The room is chosen in the database from the inventory rows (indexed on
+    date/slot) rather than by looping over rooms. Rows locked by concurrent
+    allocations are skipped instead of waited on where the backend allows.
+    """
+    rooms = Room.objects.filter(room_type=room_type)
+    if min_capacity:
+        rooms = rooms.filter(capacity__gte=min_capacity)
+
+    missing = rooms.exclude(
+        id__in=SlotInventory.objects.filter(date=booking_date, slot=slot_time).values('room_id')
+    ).values_list('id', flat=True)
+    ensure_inventory((room_id, booking_date, slot_time) for room_id in missing)
+
+    candidates = SlotInventory.objects.filter(
+        date=booking_date, slot=slot_time, remaining__gt=0, room__in=rooms.values('id')
+    ).select_related('room').order_by('room_id')
+    if connection.features.has_select_for_update_skip_locked:
+        candidates = candidates.select_for_update(skip_locked=True, of=('self',))
+
+    for _ in range(3):
+        inventory = candidates.first()
+        if inventory is None:
+            return None
+        if SlotInventory.objects.filter(pk=inventory.pk, remaining__gt=0).update(remaining=F('remaining') - 1):
+            booking = Booking(room=inventory.room, date=booking_date, slot=slot_time, **fields)
+            booking._slot_reserved = True
+            booking.save()
+            return booking
+    return None
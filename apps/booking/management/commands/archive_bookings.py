@@ -0,0 +1,42 @@
+# django imports
+from django.core.management.base import BaseCommand, CommandError
+
+# std imports
+import time
+from datetime import datetime
+
+# local imports
+from apps.booking.archive import archive_bookings, archive_cutoff
+from apps.booking.models import Booking
+
+class Command(BaseCommand):
+    help = 'Move past bookings to the booking archive in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--before', help='Archive bookings dated before this day (YYYY-MM-DD), defaults to BOOKING_ARCHIVE_AFTER_DAYS ago'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help='Only count the bookings to move')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        try:
+            before = (
+                datetime.strptime(options['before'], '%Y-%m-%d').date()
+                if options['before'] else archive_cutoff()
+            )
+        except ValueError:
+            raise CommandError('Invalid --before date, use YYYY-MM-DD.')
+
+        if options['dry_run']:
+            count = Booking._base_manager.filter(date__lt=before).count()
+            self.stdout.write(f'{count} bookings dated before {before} would be archived.')
+            return
+
+        started = time.perf_counter()
+        moved = archive_bookings(before, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {moved} bookings dated before {before} in {time.perf_counter() - started:.2f}s.'
+        ))
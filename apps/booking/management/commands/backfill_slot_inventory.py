@@ -0,0 +1,45 @@
+# django imports
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+# std imports
+from datetime import datetime
+
+# local imports
+from apps.booking.inventory import sync_inventory
+from apps.booking.models import Booking, SlotInventory
+
+class Command(BaseCommand):
+    help = 'Rebuild the slot inventory from existing bookings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='First booking date to rebuild (YYYY-MM-DD), defaults to today')
+        parser.add_argument('--all', action='store_true', help='Rebuild every date, including the past')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        bookings = Booking.objects.exclude(room=None).exclude(date=None).exclude(slot=None)
+        inventory = SlotInventory.objects.all()
+        if not options['all']:
+            try:
+                since = (
+                    datetime.strptime(options['since'], '%Y-%m-%d').date()
+                    if options['since'] else timezone.localdate()
+                )
+            except ValueError:
+                raise CommandError('Invalid --since date, expected YYYY-MM-DD.')
+            bookings = bookings.filter(date__gte=since)
+            inventory = inventory.filter(date__gte=since)
+
+        # Existing rows are included so slots whose bookings are all gone are reset too.
+        keys = set(bookings.values_list('room_id', 'date', 'slot').distinct().order_by().iterator())
+        keys.update(inventory.values_list('room_id', 'date', 'slot').iterator())
+        keys = sorted(keys)
+
+        batch_size = options['batch_size']
+        for start in range(0, len(keys), batch_size):
+            with transaction.atomic():
+                sync_inventory(keys[start:start + batch_size], batch_size=batch_size)
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully rebuilt {len(keys)} slot inventory rows'))
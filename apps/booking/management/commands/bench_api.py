@@ -0,0 +1,76 @@
+# django imports
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# std imports
+import json
+
+# local imports
+from apps.booking.benchmark import BenchmarkRun, count_queries, git_revision, seed_dataset
+
+class Command(BaseCommand):
+    help = 'Load-test the booking API of a running server and report latency, throughput and SQL per request'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--clients', type=int, default=10, help='Concurrent clients')
+        parser.add_argument('--iterations', type=int, default=20, help='Booking rounds per client')
+        parser.add_argument('--users', type=int, default=50, help='Benchmark accounts to seed')
+        parser.add_argument('--rooms', type=int, default=100, help='Benchmark rooms to seed')
+        parser.add_argument('--days', type=int, default=14, help='Spread bookings over this many days')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--skip-query-count', action='store_true', help='Do not measure SQL per request')
+
+    def handle(self, *args, **options):
+        if options['clients'] < 1 or options['iterations'] < 1:
+            raise CommandError('--clients and --iterations must be positive.')
+
+        usernames = seed_dataset(max(options['users'], 1), options['rooms'])
+        run = BenchmarkRun(
+            options['base_url'],
+            usernames,
+            clients=options['clients'],
+            iterations=options['iterations'],
+            days=options['days'],
+            seed=options['seed'],
+        )
+        results = run.run()
+        if not results['endpoints']['login']['count'] or results['endpoints']['login']['errors'] == results['endpoints']['login']['count']:
+            raise CommandError(f"Could not log in against {options['base_url']}, is the server running?")
+
+        # Servers running RequestMetricsMiddleware report queries per request themselves.
+        if not options['skip_query_count'] and any(
+            stats['queries'] is None for stats in results['endpoints'].values()
+        ):
+            queries = count_queries(usernames[0])
+            for endpoint, stats in results['endpoints'].items():
+                if stats['queries'] is None:
+                    stats['queries'] = queries.get(endpoint)
+
+        results['meta'] = {
+            'timestamp': timezone.now().isoformat(),
+            'revision': git_revision(),
+            'options': {
+                key: options[key]
+                for key in ('base_url', 'clients', 'iterations', 'users', 'rooms', 'days', 'seed')
+            },
+        }
+
+        self.stdout.write(
+            f"{'endpoint':<14}{'count':>8}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}"
+        )
+        for endpoint, stats in results['endpoints'].items():
+            self.stdout.write(
+                f"{endpoint:<14}{stats['count']:>8}{stats['errors']:>8}{stats['rps'] or 0:>10}"
+                f"{stats['p50_ms'] or 0:>10}{stats['p95_ms'] or 0:>10}{stats['p99_ms'] or 0:>10}"
+                f"{stats['queries'] if stats['queries'] is not None else '-':>9}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"{results['requests']} requests in {results['wall_time_s']}s ({results['rps']} req/s)"
+        ))
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
@@ -0,0 +1,60 @@
+# django imports
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# std imports
+import json
+
+# local imports
+from apps.booking.benchmark import HistoryBenchmark, git_revision
+
+class Command(BaseCommand):
+    help = (
+        'Measure availability latency as booking history grows, with history kept in the booking table '
+        'and moved to the archive. Archives real bookings older than a year: use a scratch database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--history', type=int, nargs='+', default=[0, 10000, 50000, 100000], help='History sizes to measure at'
+        )
+        parser.add_argument('--requests', type=int, default=200, help='Availability requests per measurement')
+        parser.add_argument('--users', type=int, default=50, help='Benchmark accounts to seed')
+        parser.add_argument('--rooms', type=int, default=100, help='Benchmark rooms to seed')
+        parser.add_argument('--recent', type=int, default=2000, help='Upcoming bookings to seed')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or any(size < 0 for size in options['history']):
+            raise CommandError('--requests must be positive and --history sizes not negative.')
+
+        results = HistoryBenchmark(
+            options['history'],
+            requests=options['requests'],
+            users=max(options['users'], 1),
+            rooms=max(options['rooms'], 1),
+            recent=options['recent'],
+            seed=options['seed'],
+        ).run()
+
+        self.stdout.write(
+            f"{'history':>10}{'live rows':>12}{'live p50':>10}{'live p95':>10}"
+            f"{'arch rows':>12}{'arch p50':>10}{'arch p95':>10}"
+        )
+        for live, archived in zip(results['live'], results['archived']):
+            self.stdout.write(
+                f"{live['history']:>10}{live['booking_rows']:>12}{live['p50_ms']:>10}{live['p95_ms']:>10}"
+                f"{archived['booking_rows']:>12}{archived['p50_ms']:>10}{archived['p95_ms']:>10}"
+            )
+        self.stdout.write(self.style.SUCCESS('Latencies in ms of GET /api/v1/bookings/rooms/available/ (cache cleared).'))
+
+        results['meta'] = {
+            'timestamp': timezone.now().isoformat(),
+            'revision': git_revision(),
+            'options': {key: options[key] for key in ('history', 'requests', 'users', 'rooms', 'recent', 'seed')},
+        }
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
@@ -0,0 +1,69 @@
+# django imports
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# std imports
+import json
+
+# local imports
+from apps.booking.benchmark import ReadPathRun, git_revision, login, seed_dataset
+
+class Command(BaseCommand):
+    help = 'Compare concurrent throughput of the sync (WSGI) and async (ASGI) availability and booking-list views'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi-url', default='http://127.0.0.1:8000', help='Server running config.wsgi')
+        parser.add_argument('--asgi-url', default='http://127.0.0.1:8001', help='Server running config.asgi')
+        parser.add_argument('--concurrency', type=int, default=50, help='Requests in flight')
+        parser.add_argument('--requests', type=int, default=500, help='Rounds of availability + list per mode')
+        parser.add_argument('--rooms', type=int, default=100, help='Benchmark rooms to seed')
+        parser.add_argument('--days', type=int, default=14)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError('--concurrency and --requests must be positive.')
+
+        username = seed_dataset(1, options['rooms'])[0]
+        results = {}
+        for mode, base_url in (('sync', options['wsgi_url']), ('async', options['asgi_url'])):
+            token = login(base_url, username)
+            if token is None:
+                raise CommandError(f'Could not log in against {base_url}, is the server running?')
+            results[mode] = ReadPathRun(
+                base_url,
+                token,
+                mode,
+                concurrency=options['concurrency'],
+                requests=options['requests'],
+                days=options['days'],
+                seed=options['seed'],
+            ).run()
+
+        self.stdout.write(
+            f"{'mode':<7}{'endpoint':<14}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        )
+        for mode, run in results.items():
+            for endpoint, stats in run['endpoints'].items():
+                self.stdout.write(
+                    f"{mode:<7}{endpoint:<14}{stats['count']:>8}{stats['errors']:>8}"
+                    f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}"
+                )
+        for mode, run in results.items():
+            self.stdout.write(self.style.SUCCESS(
+                f"{mode}: {run['requests']} requests in {run['wall_time_s']}s ({run['rps']} req/s)"
+            ))
+
+        results['meta'] = {
+            'timestamp': timezone.now().isoformat(),
+            'revision': git_revision(),
+            'options': {
+                key: options[key]
+                for key in ('wsgi_url', 'asgi_url', 'concurrency', 'requests', 'rooms', 'days', 'seed')
+            },
+        }
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
@@ -0,0 +1,41 @@
+# django imports
+from django.core.management.base import BaseCommand, CommandError
+
+# local imports
+from apps.booking.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_lines, export_rows, parse_export_query
+
+class Command(BaseCommand):
+    help = 'Stream bookings, archived ones included, as CSV or NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--start', help='First booking date (YYYY-MM-DD)')
+        parser.add_argument('--end', help='Last booking date (YYYY-MM-DD)')
+        parser.add_argument('--room-type')
+        parser.add_argument('--team-id', help='Team UUID')
+        parser.add_argument('--file', help='Write to this file instead of stdout')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='Rows fetched per round trip')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive.')
+        try:
+            filters = parse_export_query({
+                'start': options['start'],
+                'end': options['end'],
+                'room_type': options['room_type'],
+                'team_id': options['team_id'],
+            })
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        lines = export_lines(options['format'], export_rows(chunk_size=options['chunk_size'], **filters))
+        if not options['file']:
+            for chunk in lines:
+                self.stdout.write(chunk, ending='')
+            return
+        # newline='' keeps the CSV line endings as written.
+        with open(options['file'], 'w', newline='') as output:
+            for chunk in lines:
+                output.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f"Bookings exported to {options['file']}"))
@@ -0,0 +1,57 @@
+# django imports
+from django.core.management.base import BaseCommand, CommandError
+
+# std imports
+from datetime import datetime
+
+# local imports
+from apps.booking.dataset import DatasetGenerator
+
+class Command(BaseCommand):
+    help = (
+        'Generate a deterministic synthetic dataset of users, teams, members, rooms and bookings for benchmarks. '
+        'Replaces the bookings of the Bench rooms in the date range: use a scratch database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--teams', type=int, default=100)
+        parser.add_argument('--rooms', type=int, default=100)
+        parser.add_argument('--bookings', type=int, default=100000)
+        parser.add_argument('--start', help='First booking date (YYYY-MM-DD), defaults to today')
+        parser.add_argument('--days', type=int, default=30, help='Spread bookings over this many days')
+        parser.add_argument('--skew', type=float, default=1.0, help='Zipf exponent of user, room and team demand, 0 for uniform')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--no-copy', action='store_true', help='Use bulk_create on PostgreSQL instead of COPY')
+
+    def handle(self, *args, **options):
+        try:
+            start = datetime.strptime(options['start'], '%Y-%m-%d').date() if options['start'] else None
+        except ValueError:
+            raise CommandError('Invalid --start date, expected YYYY-MM-DD.')
+        if options['skew'] < 0:
+            raise CommandError('--skew must not be negative.')
+
+        generator = DatasetGenerator(
+            users=options['users'],
+            teams=options['teams'],
+            rooms=options['rooms'],
+            bookings=options['bookings'],
+            start=start,
+            days=options['days'],
+            skew=options['skew'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            use_copy=not options['no_copy'],
+        )
+        try:
+            summary = generator.run()
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {summary['bookings']} bookings over {summary['days']} days from {summary['start']} "
+            f"for {summary['users']} users, {summary['teams']} teams ({summary['members']} members) and "
+            f"{summary['rooms']} rooms in {summary['seconds']}s{' with COPY' if summary['copy'] else ''}."
+        ))
@@ -0,0 +1,18 @@
+# django imports
+from django.core.management.base import BaseCommand
+
+# local imports
+from apps.booking.headcount import recount_teams
+
+class Command(BaseCommand):
+    help = 'Recompute the member and adult counts of teams whose stored counts drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only list the teams that drifted')
+
+    def handle(self, *args, **options):
+        drifted = recount_teams(dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(f'{len(drifted)} teams have drifted counts: {drifted}')
+            return
+        self.stdout.write(self.style.SUCCESS(f'Repaired the counts of {len(drifted)} teams.'))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.3 on 2026-10-18 13:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0003_booking_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotInventory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Booking Date')),
+                ('slot', models.TimeField(verbose_name='Booking Slot')),
+                ('remaining', models.PositiveIntegerField(verbose_name='Remaining')),
+            ],
+            options={
+                'verbose_name_plural': 'slot inventory',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='booking',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.UniqueConstraint(fields=('room', 'date', 'slot', 'user'), name='booking_room_slot_user_unique'),
+        ),
+        migrations.AddField(
+            model_name='slotinventory',
+            name='room',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slot_inventory', to='booking.room', verbose_name='Room'),
+        ),
+        migrations.AddConstraint(
+            model_name='slotinventory',
+            constraint=models.UniqueConstraint(fields=('room', 'date', 'slot'), name='slot_inventory_room_slot_unique'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-18 13:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0004_slot_inventory'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['room_type', 'capacity'], name='room_type_capacity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='slotinventory',
+            index=models.Index(fields=['date', 'slot', 'room'], name='slot_inventory_date_slot_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0007_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='booking',
+            name='booking_room_slot_user_unique',
+        ),
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='booking_date_slot_team_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='booking_user_date_slot_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='member',
+            name='member_creator_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='room',
+            name='room_type_capacity_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='team',
+            name='team_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_deleted', False)), fields=['date', 'slot', 'team'], name='booking_date_slot_team_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_deleted', False)), fields=['user', 'date', 'slot', 'id'], name='booking_user_date_slot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_deleted', False)), fields=['created_by', 'created', 'id'], name='member_creator_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_deleted', False)), fields=['room_type', 'capacity'], name='room_type_capacity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_deleted', False)), fields=['created', 'id'], name='team_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True), ('is_deleted', False)), fields=('room', 'date', 'slot', 'user'), name='booking_room_slot_user_unique'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:15
+
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0008_partial_active_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingArchive',
+            fields=[
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('is_active', models.BooleanField(default=True, verbose_name='active')),
+                ('is_deleted', models.BooleanField(default=False, verbose_name='deleted')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date', models.DateField(blank=True, null=True, verbose_name='Booking Date')),
+                ('slot', models.TimeField(blank=True, null=True, verbose_name='Booking Slot')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Archived At')),
+                ('room', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_bookings', to='booking.room', verbose_name='Room')),
+                ('team', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_bookings', to='booking.team', verbose_name='Team')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_bookings', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('is_active', True), ('is_deleted', False)), fields=['user', 'date', 'slot', 'id'], name='booking_archive_user_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_bookings(apps, schema_editor):
+    RoomUtilization = apps.get_model('booking', 'RoomUtilization')
+    SlotUtilization = apps.get_model('booking', 'SlotUtilization')
+    per_room, per_slot = {}, {}
+    for name in ('BookingArchive', 'Booking'):
+        bookings = apps.get_model('booking', name)._base_manager.filter(
+            is_active=True, is_deleted=False, room__isnull=False, date__isnull=False, slot__isnull=False
+        )
+        for room_id, booking_date, total in bookings.values_list('room_id', 'date').annotate(total=Count('id')).order_by():
+            per_room[(room_id, booking_date)] = per_room.get((room_id, booking_date), 0) + total
+        for room_type, booking_date, slot_time, total in (
+            bookings.values_list('room__room_type', 'date', 'slot').annotate(total=Count('id')).order_by()
+        ):
+            key = (room_type, booking_date, slot_time)
+            per_slot[key] = per_slot.get(key, 0) + total
+    RoomUtilization.objects.bulk_create(
+        (RoomUtilization(room_id=room_id, date=booking_date, bookings=total)
+         for (room_id, booking_date), total in per_room.items()),
+        batch_size=1000,
+    )
+    SlotUtilization.objects.bulk_create(
+        (SlotUtilization(room_type=room_type, date=booking_date, slot=slot_time, bookings=total)
+         for (room_type, booking_date, slot_time), total in per_slot.items()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0010_recurring_series'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotUtilization',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('room_type', models.CharField(choices=[('private', 'Private'), ('conference', 'Conference'), ('shared', 'Shared Desk')], max_length=20, verbose_name='Room Type')),
+                ('date', models.DateField(verbose_name='Booking Date')),
+                ('slot', models.TimeField(verbose_name='Booking Slot')),
+                ('bookings', models.PositiveIntegerField(default=0, verbose_name='Bookings')),
+            ],
+            options={
+                'verbose_name_plural': 'slot utilization',
+                'constraints': [models.UniqueConstraint(fields=('date', 'slot', 'room_type'), name='slot_utilization_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RoomUtilization',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Booking Date')),
+                ('bookings', models.PositiveIntegerField(default=0, verbose_name='Bookings')),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='utilization', to='booking.room', verbose_name='Room')),
+            ],
+            options={
+                'verbose_name_plural': 'room utilization',
+                'indexes': [models.Index(fields=['date', 'room'], name='room_utilization_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('room', 'date'), name='room_utilization_room_date_unique')],
+            },
+        ),
+        migrations.RunPython(count_bookings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0011_utilization_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersionCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=50, unique=True, verbose_name='Key')),
+                ('version', models.PositiveBigIntegerField(default=1, verbose_name='Version')),
+            ],
+        ),
+    ]
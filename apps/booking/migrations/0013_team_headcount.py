@@ -0,0 +1,43 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:34
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_members(apps, schema_editor):
+    Team = apps.get_model('booking', 'Team')
+    Member = apps.get_model('booking', 'Member')
+
+    def counted(condition=Q()):
+        members = (
+            Member._base_manager.filter(condition, team=OuterRef('pk'), is_active=True, is_deleted=False)
+            .order_by().values('team').annotate(total=Count('id')).values('total')
+        )
+        return Coalesce(Subquery(members, output_field=IntegerField()), Value(0))
+
+    Team._base_manager.update(
+        member_count=counted(),
+        adult_count=counted(Q(age__isnull=True) | Q(age__gte=10)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0012_version_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='adult_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Adult Members'),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Members'),
+        ),
+        migrations.RunPython(count_members, migrations.RunPython.noop),
+    ]
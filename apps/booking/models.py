@@ -1,11 +1,19 @@
+# std imports
+import itertools
+from datetime import time, timedelta
+
 # django imports
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
 # local imports
-from apps.core.mixins import StatusMixin, UUIDMixin, EmailMixin
+from apps.core.mixins import ACTIVE_ROWS, StatusMixin, UUIDMixin, EmailMixin
 from apps.users.models import User
 
+BOOKING_SLOTS = [time(h, 0) for h in range(9, 18)]
+# Members younger than this count towards a team but do not take a seat.
+CHILD_MAX_AGE = 10
+
 class Room(StatusMixin, UUIDMixin):
     PRIVATE = 'private'
     CONFERENCE = 'conference'
@@ -22,6 +30,11 @@ class Room(StatusMixin, UUIDMixin):
     room_type = models.CharField(_('Room Type'), max_length=20, choices=ROOM_TYPES)
     capacity = models.PositiveIntegerField(_('Capacity'))
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['room_type', 'capacity'], name='room_type_capacity_idx', condition=ACTIVE_ROWS),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.room_type})"
 
@@ -37,6 +50,25 @@ class Team(StatusMixin, UUIDMixin):
         null=True,
         blank=True
     )
+    # Live members and the adults among them, kept by ``apps.booking.headcount``.
+    # The adults are only returned by the team API: no booking rule counts seats per member.
+    member_count = models.PositiveIntegerField(_('Members'), default=0, editable=False)
+    adult_count = models.PositiveIntegerField(_('Adult Members'), default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created', 'id'], name='team_created_idx', condition=ACTIVE_ROWS),
+        ]
+
+    def save(self, *args, **kwargs):
+        # The counters only change through F() updates: saving a stale instance must not overwrite them.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in ('member_count', 'adult_count')
+            ]
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
 
@@ -72,14 +104,88 @@ class Member(StatusMixin, UUIDMixin, EmailMixin):
     
     class Meta:
         unique_together = ['name', 'email', 'team']
+        indexes = [
+            models.Index(
+                fields=['created_by', 'created', 'id'], name='member_creator_created_idx', condition=ACTIVE_ROWS
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # The headcount signals lock the stored row: hold it until the team counters are updated.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
 
     def is_child(self):
-        return self.age < 10
+        return self.age is not None and self.age < CHILD_MAX_AGE
 
     def __str__(self):
         return f"{self.name} ({self.age})"
 
 
+class RecurringSeries(StatusMixin, UUIDMixin):
+    """
+    A room booked at the same slot every ``interval`` days or weeks from
+    ``start_date``, until ``end_date`` or for ``count`` occurrences. Each
+    occurrence is a regular ``Booking`` pointing back at the series, so it
+    can be cancelled or moved on its own.
+    """
+    DAILY = 'daily'
+    WEEKLY = 'weekly'
+
+    FREQUENCIES = [
+        (DAILY, "Daily"),
+        (WEEKLY, "Weekly"),
+    ]
+
+    room = models.ForeignKey(
+        Room,
+        verbose_name=_('Room'),
+        on_delete=models.SET_NULL,
+        related_name='recurring_series',
+        null=True,
+        blank=True
+    )
+    user = models.ForeignKey(
+        User,
+        verbose_name=_('User'),
+        on_delete=models.SET_NULL,
+        related_name='recurring_series',
+        null=True,
+        blank=True
+    )
+    team = models.ForeignKey(
+        Team,
+        verbose_name=_('Team'),
+        on_delete=models.SET_NULL,
+        related_name='recurring_series',
+        null=True,
+        blank=True
+    )
+    frequency = models.CharField(_('Frequency'), max_length=10, choices=FREQUENCIES)
+    interval = models.PositiveSmallIntegerField(_('Interval'), default=1)
+    slot = models.TimeField(_('Booking Slot'))
+    start_date = models.DateField(_('Start Date'))
+    end_date = models.DateField(_('End Date'), null=True, blank=True)
+    count = models.PositiveSmallIntegerField(_('Occurrences'), null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = 'recurring series'
+
+    def occurrences(self):
+        """Yields the occurrence dates in order, computed on demand."""
+        step = timedelta(days=self.interval * (7 if self.frequency == self.WEEKLY else 1))
+        for index in itertools.count():
+            if self.count is not None and index >= self.count:
+                return
+            occurrence = self.start_date + step * index
+            if self.end_date is not None and occurrence > self.end_date:
+                return
+            yield occurrence
+
+    def __str__(self):
+        return f"{self.room_id} — {self.frequency} from {self.start_date} {self.slot}"
+
+
 class Booking(StatusMixin, UUIDMixin):
     room = models.ForeignKey(
         Room,
@@ -105,12 +211,177 @@ class Booking(StatusMixin, UUIDMixin):
         related_name='team_bookings',
         on_delete=models.SET_NULL
     )
+    series = models.ForeignKey(
+        RecurringSeries,
+        verbose_name=_('Series'),
+        null=True,
+        blank=True,
+        related_name='bookings',
+        on_delete=models.SET_NULL
+    )
     date = models.DateField(_('Booking Date'), null=True, blank=True)
     slot = models.TimeField(_('Booking Slot'), null=True, blank=True)
 
     class Meta:
-        unique_together = ['room', 'date', 'slot']
+        # Room capacity is enforced by SlotInventory; shared desks hold several bookings per slot.
+        # Only live bookings count: cancelled (soft-deleted) rows neither block a slot nor bloat the indexes.
+        constraints = [
+            models.UniqueConstraint(
+                fields=['room', 'date', 'slot', 'user'], name='booking_room_slot_user_unique', condition=ACTIVE_ROWS
+            ),
+        ]
+        indexes = [
+            # Team double-booking check of BookingViewSet.create
+            models.Index(fields=['date', 'slot', 'team'], name='booking_date_slot_team_idx', condition=ACTIVE_ROWS),
+            # Keyset pagination of BookingViewSet.list and the user double-booking check
+            models.Index(
+                fields=['user', 'date', 'slot', 'id'], name='booking_user_date_slot_idx', condition=ACTIVE_ROWS
+            ),
+        ]
 
     def __str__(self):
         return f"{self.room.name} — {self.date} {self.slot}"
 
+
+class BookingArchive(StatusMixin, UUIDMixin):
+    """
+    Past bookings moved out of ``Booking`` by ``archive_bookings`` so hot
+    queries only scan recent rows. Ids are kept, which lets history pages
+    merge live and archived rows on the same keyset.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    room = models.ForeignKey(
+        Room,
+        verbose_name=_('Room'),
+        on_delete=models.SET_NULL,
+        related_name='archived_bookings',
+        null=True,
+        blank=True
+    )
+    user = models.ForeignKey(
+        User,
+        verbose_name=_('User'),
+        null=True,
+        blank=True,
+        related_name='archived_bookings',
+        on_delete=models.SET_NULL
+    )
+    team = models.ForeignKey(
+        Team,
+        verbose_name=_('Team'),
+        null=True,
+        blank=True,
+        related_name='archived_bookings',
+        on_delete=models.SET_NULL
+    )
+    series = models.ForeignKey(
+        RecurringSeries,
+        verbose_name=_('Series'),
+        null=True,
+        blank=True,
+        related_name='archived_bookings',
+        on_delete=models.SET_NULL
+    )
+    date = models.DateField(_('Booking Date'), null=True, blank=True)
+    slot = models.TimeField(_('Booking Slot'), null=True, blank=True)
+    archived_at = models.DateTimeField(_('Archived At'), auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # History pages of BookingViewSet.list
+            models.Index(
+                fields=['user', 'date', 'slot', 'id'], name='booking_archive_user_idx', condition=ACTIVE_ROWS
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.room_id} — {self.date} {self.slot} (archived)"
+
+
+class SlotInventory(models.Model):
+    """
+    Remaining bookings for one (room, date, slot). Rows are decremented with
+    a conditional UPDATE when a booking is made and incremented on cancel,
+    see ``apps.booking.inventory``.
+    """
+    room = models.ForeignKey(
+        Room,
+        verbose_name=_('Room'),
+        on_delete=models.CASCADE,
+        related_name='slot_inventory',
+    )
+    date = models.DateField(_('Booking Date'))
+    slot = models.TimeField(_('Booking Slot'))
+    remaining = models.PositiveIntegerField(_('Remaining'))
+
+    class Meta:
+        verbose_name_plural = 'slot inventory'
+        constraints = [
+            models.UniqueConstraint(fields=['room', 'date', 'slot'], name='slot_inventory_room_slot_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['date', 'slot', 'room'], name='slot_inventory_date_slot_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.room_id} — {self.date} {self.slot}: {self.remaining}"
+
+
+
+class RoomUtilization(models.Model):
+    """
+    Live bookings held by one room on one day. Kept up to date by
+    ``apps.booking.utilization`` as bookings are made, moved and cancelled,
+    and not touched by archiving, so analytics never read ``Booking``.
+    """
+    room = models.ForeignKey(
+        Room,
+        verbose_name=_('Room'),
+        on_delete=models.CASCADE,
+        related_name='utilization',
+    )
+    date = models.DateField(_('Booking Date'))
+    bookings = models.PositiveIntegerField(_('Bookings'), default=0)
+
+    class Meta:
+        verbose_name_plural = 'room utilization'
+        constraints = [
+            models.UniqueConstraint(fields=['room', 'date'], name='room_utilization_room_date_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['date', 'room'], name='room_utilization_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.room_id} — {self.date}: {self.bookings}"
+
+
+class SlotUtilization(models.Model):
+    """Live bookings of one room type in one (date, slot), see ``RoomUtilization``."""
+    room_type = models.CharField(_('Room Type'), max_length=20, choices=Room.ROOM_TYPES)
+    date = models.DateField(_('Booking Date'))
+    slot = models.TimeField(_('Booking Slot'))
+    bookings = models.PositiveIntegerField(_('Bookings'), default=0)
+
+    class Meta:
+        verbose_name_plural = 'slot utilization'
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'slot', 'room_type'], name='slot_utilization_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.room_type} — {self.date} {self.slot}: {self.bookings}"
+
+
+class VersionCounter(models.Model):
+    """
+    A number bumped whenever the data behind ``key`` changes: the bookings
+    of one date, all bookings, the room catalog or the teams. ETags of the
+    read endpoints are built from the counters they depend on, see
+    ``apps.booking.versions``.
+    """
+    key = models.CharField(_('Key'), max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(_('Version'), default=1)
+
+    def __str__(self):
+        return f"{self.key}: {self.version}"
@@ -0,0 +1,83 @@
+# django imports
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+# std imports
+import itertools
+from collections import Counter
+
+# local imports
+from apps.booking.bulk import BulkBookingPlan
+from apps.booking.events import publish_availability
+from apps.booking.inventory import release_many, reserve_many
+from apps.booking.models import Booking
+from apps.booking.signals import invalidate_availability
+from apps.booking.utilization import record_bookings
+
+MAX_SERIES_OCCURRENCES = 366
+
+
+def series_items(series):
+    """
+    ``BulkBookingPlan`` items for the occurrences of ``series``. Raises
+    ``ValueError`` when the series has more than ``MAX_SERIES_OCCURRENCES``.
+    """
+    dates = list(itertools.islice(series.occurrences(), MAX_SERIES_OCCURRENCES + 1))
+    if len(dates) > MAX_SERIES_OCCURRENCES:
+        raise ValueError(f'A series can have at most {MAX_SERIES_OCCURRENCES} occurrences.')
+    room_id = str(series.room.uuid)
+    team_id = str(series.team.uuid) if series.team else ''
+    slot = series.slot.isoformat()
+    return [
+        {'room_id': room_id, 'team_id': team_id, 'date': occurrence.isoformat(), 'slot': slot}
+        for occurrence in dates
+    ]
+
+
+def book_series(series):
+    """
+    Saves ``series`` and books every occurrence that does not conflict,
+    checking them all against existing bookings with the set queries of
+    ``BulkBookingPlan`` and inserting them with one ``bulk_create``.
+
+    Returns the plan, whose ``results`` are indexed by occurrence. Nothing
+    is saved when no occurrence can be booked. Raises ``IntegrityError``
+    when a slot was taken concurrently; the caller's transaction must roll back.
+    """
+    items = series_items(series)
+    with transaction.atomic():
+        series.save()
+        plan = BulkBookingPlan(series.user, items, series=series).build()
+        plan.results.sort(key=lambda result: result['index'])
+        for result in plan.results:
+            result['date'] = items[result['index']]['date']
+        if not plan.bookings:
+            transaction.set_rollback(True)
+            return plan
+        seats = Counter((booking.room_id, booking.date, booking.slot) for booking in plan.bookings)
+        if not reserve_many(seats):
+            raise IntegrityError('Slot inventory exhausted.')
+        Booking.objects.bulk_create(plan.bookings)
+        record_bookings(seats, rooms=[series.room])
+        publish_availability(seats)
+        invalidate_availability(((booking.date, booking.slot) for booking in plan.bookings), [series.user_id])
+    return plan
+
+
+def cancel_series(series):
+    """
+    Soft-deletes the series and its upcoming occurrences with one UPDATE,
+    giving their seats back in one more. Past occurrences are kept.
+    Returns the number of occurrences cancelled.
+    """
+    with transaction.atomic():
+        upcoming = series.bookings.select_for_update().filter(date__gte=timezone.localdate())
+        slots = list(upcoming.values_list('room_id', 'date', 'slot'))
+        upcoming.update(is_active=False, is_deleted=True)
+        released = Counter(slot for slot in slots if all(slot))
+        release_many(released)
+        record_bookings({key: -count for key, count in released.items()})
+        publish_availability(released)
+        series.remove()
+        invalidate_availability(((booking_date, slot_time) for _, booking_date, slot_time in slots), [series.user_id])
+    return len(slots)
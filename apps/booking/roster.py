@@ -0,0 +1,126 @@
+# django imports
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+# local imports
+from apps.booking.headcount import adjust_headcount
+from apps.booking.models import Member
+from apps.booking.versions import TEAMS, bump
+
+MAX_ROSTER_MEMBERS = 5000
+ROSTER_FIELDS = ('name', 'email', 'age', 'gender')
+
+
+class RosterImport:
+    """
+    Adds members to ``team`` from parsed rows in one pass. Every row is
+    validated first, duplicates against the ``(name, email, team)``
+    uniqueness of ``Member`` are found with one query for the whole roster
+    (soft-deleted members included, as the constraint covers them) and
+    within the roster itself, and the accepted members are inserted with
+    ``bulk_create`` in one transaction.
+
+    ``results`` holds one ``{index, status, detail}`` entry per rejected row.
+    """
+
+    def __init__(self, team, rows, created_by=None, batch_size=1000):
+        self.team = team
+        self.rows = rows
+        self.created_by = created_by
+        self.batch_size = batch_size
+        self.results = []
+        self.created = 0
+
+    def reject(self, index, detail):
+        self.results.append({'index': index, 'status': 'rejected', 'detail': detail})
+
+    def clean(self, index, row):
+        if not isinstance(row, dict):
+            return self.reject(index, 'Invalid member row.')
+        fields = {key: (str(row[key]).strip() if row.get(key) is not None else '') for key in ROSTER_FIELDS}
+        if not fields['name'] or len(fields['name']) > Member._meta.get_field('name').max_length:
+            return self.reject(index, 'Invalid name.')
+        if fields['email']:
+            try:
+                validate_email(fields['email'])
+            except ValidationError:
+                return self.reject(index, 'Invalid email.')
+            if len(fields['email']) > Member._meta.get_field('email').max_length:
+                return self.reject(index, 'Invalid email.')
+        if fields['gender'] and fields['gender'] not in dict(Member.GENDER_CHOICES):
+            return self.reject(index, 'Invalid gender.')
+        if fields['age']:
+            try:
+                fields['age'] = int(fields['age'])
+            except ValueError:
+                return self.reject(index, 'Invalid age.')
+            if fields['age'] < 0:
+                return self.reject(index, 'Invalid age.')
+        fields['age'] = fields['age'] if fields['age'] != '' else None
+        fields['gender'] = fields['gender'] or None
+        return fields
+
+    def existing(self, names):
+        return set(
+            Member._base_manager.filter(team=self.team, name__in=names).values_list('name', 'email')
+        )
+
+    def validate(self):
+        cleaned = [(index, self.clean(index, row)) for index, row in enumerate(self.rows)]
+        cleaned = [(index, fields) for index, fields in cleaned if fields]
+        taken = self.existing({fields['name'] for _, fields in cleaned})
+        accepted = []
+        for index, fields in cleaned:
+            key = (fields['name'], fields['email'])
+            if key in taken:
+                self.reject(index, 'Member already exists in this team.')
+                continue
+            taken.add(key)
+            accepted.append((index, fields))
+        return accepted
+
+    def create(self, accepted):
+        members = [Member(team=self.team, created_by=self.created_by, **fields) for _, fields in accepted]
+        with transaction.atomic():
+            Member.objects.bulk_create(members, batch_size=self.batch_size)
+            # ``bulk_create`` sends no signals: count the new members in.
+            adjust_headcount(
+                {self.team.id: len(members)}, {self.team.id: sum(not member.is_child() for member in members)}
+            )
+
+    def insert(self, accepted):
+        while accepted:
+            try:
+                self.create(accepted)
+                break
+            except IntegrityError:
+                # Someone added some of these members since ``validate``: reject them and retry the rest.
+                taken = self.existing({fields['name'] for _, fields in accepted})
+                remaining = [(index, fields) for index, fields in accepted if (fields['name'], fields['email']) not in taken]
+                detail = 'Member already exists in this team.'
+                if len(remaining) == len(accepted):
+                    # Nothing to pin the conflict on: report the rows instead of failing the import.
+                    remaining, detail = [], 'Member could not be added, please retry.'
+                kept = {index for index, _ in remaining}
+                for index, _ in accepted:
+                    if index not in kept:
+                        self.reject(index, detail)
+                accepted = remaining
+        self.created = len(accepted)
+
+    def run(self):
+        accepted = self.validate()
+        if accepted:
+            self.insert(accepted)
+            # ``bulk_create`` sends no signals.
+            bump([TEAMS])
+        self.results.sort(key=lambda result: result['index'])
+        return self
+
+    def report(self):
+        return {
+            'rows': len(self.rows),
+            'created': self.created,
+            'rejected': len(self.results),
+        }
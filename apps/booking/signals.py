@@ -0,0 +1,194 @@
+# django imports
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+# std imports
+from collections import Counter
+
+# local imports
+from apps.booking.cache import availability_cache
+from apps.booking.events import publish_availability
+from apps.booking.headcount import adjust_headcount, is_counted
+from apps.booking.inventory import release, reserve_saved
+from apps.booking.models import Booking, Member, Room, SlotInventory, Team
+from apps.booking.utilization import move_room_type, record_bookings
+from apps.booking.versions import ROOMS, TEAMS, bump, bump_dates
+
+
+def invalidate_availability(slots, users=()):
+    """
+    Drops cached availability for every ``(date, slot)`` in ``slots`` and
+    bumps the version counters of their dates and of the booking lists of
+    ``users``, in the surrounding transaction.
+
+    Invalidation happens immediately and again once the surrounding
+    transaction commits, so a read racing the write cannot leave the
+    pre-commit state in the cache.
+    """
+    slots = {(booking_date, slot_time) for booking_date, slot_time in slots if booking_date and slot_time}
+    bump_dates((booking_date for booking_date, _ in slots), users)
+    if not slots:
+        return
+
+    def invalidate():
+        for booking_date, slot_time in slots:
+            availability_cache.invalidate(booking_date, slot_time)
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+def is_live(booking):
+    return booking.is_active and not booking.is_deleted
+
+
+def known_rooms(booking):
+    # Rooms already loaded on the instance save the room type lookup of ``record_bookings``.
+    return [booking.room] if Booking.room.is_cached(booking) and booking.room else []
+
+
+@receiver(pre_save, sender=Booking)
+def remember_booking_slot(sender, instance, **kwargs):
+    # A booking moved to another room/date/slot (e.g. from the admin) frees its old slot too,
+    # and a cancelled (soft-deleted) one gives its seat back.
+    instance._previous_slot = None
+    instance._previous_live = None
+    instance._previous_user = None
+    if instance.pk:
+        previous = (
+            sender._base_manager.filter(pk=instance.pk)
+            .values_list('room_id', 'date', 'slot', 'is_active', 'is_deleted', 'user_id')
+            .first()
+        )
+        if previous:
+            instance._previous_slot = previous[:3]
+            instance._previous_live = previous[3] and not previous[4]
+            instance._previous_user = previous[5]
+
+
+@receiver(post_save, sender=Booking)
+def booking_saved(sender, instance, created, **kwargs):
+    current = (instance.room_id, instance.date, instance.slot)
+    previous = getattr(instance, '_previous_slot', None)
+    slots = [current]
+    if previous and previous != current:
+        slots.append(previous)
+    invalidate_availability(
+        ((booking_date, slot_time) for _, booking_date, slot_time in slots),
+        [instance.user_id, getattr(instance, '_previous_user', None)],
+    )
+
+    live, was_live = is_live(instance), getattr(instance, '_previous_live', None)
+    changes = Counter()
+    if live:
+        changes[current] += 1
+    if not created and previous and was_live:
+        changes[previous] -= 1
+    record_bookings(changes, rooms=known_rooms(instance))
+    publish_availability(key for key, delta in changes.items() if delta)
+
+    # Bookings made or moved through ``inventory.reserve``/``release`` already adjusted their seats;
+    # the flag covers this save only. Other writes move the seats with the same conditional deltas.
+    if getattr(instance, '_slot_reserved', False):
+        instance._slot_reserved = False
+        return
+    if not created and was_live and all(previous) and (previous != current or not live):
+        release(*previous)
+    if live and all(current) and (created or previous != current or not was_live):
+        reserve_saved(instance)
+
+
+@receiver(post_delete, sender=Booking)
+def booking_deleted(sender, instance, **kwargs):
+    invalidate_availability([(instance.date, instance.slot)], [instance.user_id])
+    # Cancelled bookings already gave their seat back.
+    if is_live(instance) and instance.room_id and instance.date and instance.slot:
+        release(instance.room_id, instance.date, instance.slot)
+        record_bookings({(instance.room_id, instance.date, instance.slot): -1}, rooms=known_rooms(instance))
+        publish_availability([(instance.room_id, instance.date, instance.slot)])
+
+
+@receiver(pre_save, sender=Room)
+def remember_room_seats(sender, instance, **kwargs):
+    instance._previous_seats = None
+    if instance.pk:
+        instance._previous_seats = (
+            sender._base_manager.filter(pk=instance.pk).values_list('room_type', 'capacity').first()
+        )
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def room_changed(sender, instance, **kwargs):
+    availability_cache.clear()
+    transaction.on_commit(availability_cache.clear)
+    bump([ROOMS])
+    previous = getattr(instance, '_previous_seats', None)
+    if previous and previous != (instance.room_type, instance.capacity):
+        # Rows are recreated from the bookings with the new seat count on next use.
+        SlotInventory.objects.filter(room=instance).delete()
+    # Saves only: ``created`` is not sent on delete.
+    if previous and previous[0] != instance.room_type and 'created' in kwargs:
+        move_room_type(instance.id, previous[0], instance.room_type)
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+def team_changed(sender, instance, **kwargs):
+    # Teams and their members are embedded in team and booking lists.
+    bump([TEAMS])
+
+
+def headcount(member):
+    """The ``(team_id, is_adult)`` a member counts towards, or ``None``."""
+    return (member.team_id, not member.is_child()) if is_counted(member) else None
+
+
+def stored_headcount(sender, instance):
+    """
+    The headcount of the member's stored row, locked until the save or
+    delete commits: a concurrent change of the same member then sees this
+    one's result instead of subtracting it a second time.
+    """
+    if not instance.pk:
+        return None
+    previous = sender._base_manager.select_for_update().filter(pk=instance.pk).only(
+        'team_id', 'age', 'is_active', 'is_deleted'
+    ).first()
+    return headcount(previous) if previous else None
+
+
+@receiver(pre_save, sender=Member)
+def remember_member_team(sender, instance, **kwargs):
+    instance._previous_headcount = stored_headcount(sender, instance)
+
+
+@receiver(pre_delete, sender=Member)
+def remember_deleted_member(sender, instance, **kwargs):
+    instance._previous_headcount = stored_headcount(sender, instance)
+
+
+def move_headcount(previous, current):
+    if previous == current:
+        return
+    members, adults = Counter(), Counter()
+    for counted, step in ((previous, -1), (current, 1)):
+        if counted:
+            team_id, is_adult = counted
+            members[team_id] += step
+            adults[team_id] += step if is_adult else 0
+    adjust_headcount(members, adults)
+
+
+@receiver(post_save, sender=Member)
+def member_saved(sender, instance, **kwargs):
+    # Joining, leaving, moving teams, (de)activation, soft deletion and age changes.
+    move_headcount(getattr(instance, '_previous_headcount', None), headcount(instance))
+
+
+@receiver(post_delete, sender=Member)
+def member_deleted(sender, instance, **kwargs):
+    move_headcount(getattr(instance, '_previous_headcount', None), None)
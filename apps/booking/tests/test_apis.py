@@ -7,16 +7,18 @@ from django.urls import reverse
 
 # local imports
 from apps.booking.models import Room, Booking, Team, Member
+from apps.booking.cache import AvailabilityCache, availability_cache
 from apps.users.models import User
 
 # std imports
-from datetime import date, time
+from datetime import date, time, timedelta
 import uuid
 
 
 @pytest.mark.django_db
 class TestBookingAPI:
     def setup_method(self):
+        availability_cache.clear()
         self.client = APIClient()
         self.user = User.objects.create_user(username='testuser', password='testpass')
         self.client.force_authenticate(user=self.user)
@@ -64,6 +66,20 @@ class TestBookingAPI:
         response = self.client.post(url)
         assert response.status_code == 200
 
+    def test_inactive_rows_hidden_everywhere(self):
+        team = Team.objects.create(name='Status Team', created_by=self.user)
+        members = [Member.objects.create(name=f'Status {i}', age=30, team=team) for i in range(3)]
+        members[0].remove()
+        members[1].deactivate()
+        self.room.deactivate()
+        assert team.members.count() == 1
+        assert list(Member.objects.filter(team=team).filter(age=30)) == [members[2]]
+        assert Member.all_objects.filter(team=team).count() == 3
+        with pytest.raises(Room.DoesNotExist):
+            Room.objects.get(pk=self.room.pk)
+        response = self.client.get(reverse('room-available'))
+        assert str(self.room.uuid) not in [room['uuid'] for room in response.data]
+
     def test_list_bookings(self):
         url = reverse('booking-list')
         response = self.client.get(url)
@@ -85,7 +101,7 @@ class TestBookingAPI:
         url = reverse('team-list')
         response = self.client.get(url)
         assert response.status_code == 200
-        assert any(team['name'] == self.team.name for team in response.data)
+        assert any(team['name'] == self.team.name for team in response.data['results'])
 
     def test_create_member(self):
         url = reverse('member-list')
@@ -104,11 +120,206 @@ class TestBookingAPI:
         url = reverse('member-list')
         response = self.client.get(url)
         assert response.status_code == 200
-        assert any(member['name'] == self.member.name for member in response.data)
+        assert any(member['name'] == self.member.name for member in response.data['results'])
 
     def test_list_members_by_team(self):
         url = reverse('member-list') + f'?team={self.team.uuid}'
         response = self.client.get(url)
         assert response.status_code == 200
-        member_uuids = [str(member['uuid']) for member in response.data]
-        assert str(self.member.uuid) in member_uuids 
\ No newline at end of file
+        member_uuids = [str(member['uuid']) for member in response.data['results']]
+        assert str(self.member.uuid) in member_uuids 
+    def test_available_rooms_for_slot(self):
+        Booking.objects.create(room=self.room, date=date.today(), slot=time(9, 0), user=self.user)
+        Booking.objects.create(room=self.shared_room, date=date.today(), slot=time(9, 0), user=self.user)
+        url = reverse('room-available') + f'?date={date.today()}&slot=09:00:00'
+        response = self.client.get(url)
+        assert response.status_code == 200
+        room_uuids = {room['uuid'] for room in response.data}
+        assert str(self.room.uuid) not in room_uuids
+        assert str(self.conf_room.uuid) in room_uuids
+        assert str(self.shared_room.uuid) in room_uuids
+
+    def test_available_rooms_query_count_is_constant(self, django_assert_max_num_queries):
+        Room.objects.bulk_create(
+            Room(name=f'Private {i}', room_type='private', capacity=1) for i in range(2, 50)
+        )
+        url = reverse('room-available') + f'?date={date.today()}&slot=09:00:00'
+        # The version counters of the ETag, then the rooms.
+        with django_assert_max_num_queries(2):
+            response = self.client.get(url)
+        assert len(response.data) == 51
+
+    def test_availability_matrix(self, django_assert_max_num_queries):
+        today = date.today()
+        Booking.objects.create(room=self.room, date=today, slot=time(10, 0), user=self.user)
+        url = reverse('room-availability-matrix') + f'?start={today}&end={today + timedelta(days=6)}'
+        with django_assert_max_num_queries(2):
+            response = self.client.get(url)
+        assert response.status_code == 200
+        assert len(response.data['dates']) == 7
+        assert len(response.data['slots']) == 9
+        private = next(room for room in response.data['rooms'] if room['uuid'] == str(self.room.uuid))
+        assert private['remaining'][0][1] == 0
+        assert private['available'][0] == 0b111111101
+        assert private['available'][1] == 0b111111111
+        shared = next(room for room in response.data['rooms'] if room['uuid'] == str(self.shared_room.uuid))
+        assert shared['remaining'][0] == [4] * 9
+
+    def test_availability_matrix_rejects_long_range(self):
+        today = date.today()
+        url = reverse('room-availability-matrix') + f'?start={today}&end={today + timedelta(days=60)}'
+        response = self.client.get(url)
+        assert response.status_code == 400
+
+    def test_available_rooms_cache_invalidated_on_create_and_cancel(self, django_assert_num_queries):
+        url = reverse('room-available') + f'?date={date.today()}&slot=09:00:00'
+        assert len(self.client.get(url).data) == 3
+        # Only the version counters of the ETag.
+        with django_assert_num_queries(1):
+            assert len(self.client.get(url).data) == 3
+        assert availability_cache.hits >= 1
+
+        response = self.client.post(reverse('booking-list'), {
+            'room_id': str(self.room.uuid),
+            'date': str(date.today()),
+            'slot': '09:00:00',
+        }, format='json')
+        assert response.status_code == 201
+        assert len(self.client.get(url).data) == 2
+
+        cancel_url = reverse('booking-cancel', kwargs={'uuid': response.data['booking_id']})
+        assert self.client.post(cancel_url).status_code == 200
+        assert len(self.client.get(url).data) == 3
+
+    def test_available_rooms_cache_invalidated_when_booking_moves(self):
+        booking = Booking.objects.create(room=self.room, date=date.today(), slot=time(9, 0), user=self.user)
+        url = reverse('room-available') + f'?date={date.today()}&slot=09:00:00'
+        assert len(self.client.get(url).data) == 2
+        booking.slot = time(10, 0)
+        booking.save()
+        assert len(self.client.get(url).data) == 3
+
+    def test_available_rooms_cache_stats_requires_staff(self):
+        url = reverse('room-available-cache')
+        assert self.client.get(url).status_code == 403
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(url)
+        assert response.status_code == 200
+        assert {'hits', 'misses', 'entries'} <= set(response.data)
+
+    def test_availability_cache_evicts_least_recently_used(self):
+        cache = AvailabilityCache(max_entries=2, ttl=60)
+        cache.set(('a', 1, None), [1])
+        cache.set(('b', 1, None), [2])
+        assert cache.get(('a', 1, None)) == [1]
+        cache.set(('c', 1, None), [3])
+        assert cache.get(('b', 1, None)) is None
+        assert cache.get(('a', 1, None)) == [1]
+        assert cache.stats()['entries'] == 2
+
+    def test_bulk_booking(self, django_assert_max_num_queries):
+        today = str(date.today())
+        Booking.objects.create(room=self.room, date=date.today(), slot=time(12, 0), user=self.user)
+        data = {'bookings': [
+            {'room_id': str(self.room.uuid), 'date': today, 'slot': '09:00:00'},
+            {'room_id': str(self.room.uuid), 'date': today, 'slot': '10:00:00'},
+            {'room_id': str(self.shared_room.uuid), 'date': today, 'slot': '10:00:00'},
+            {'room_id': str(self.room.uuid), 'date': today, 'slot': '12:00:00'},
+            {'room_id': str(self.conf_room.uuid), 'team_id': str(self.team.uuid), 'date': today, 'slot': '11:00:00'},
+            {'room_id': str(uuid.uuid4()), 'date': today, 'slot': '13:00:00'},
+            {'room_id': str(self.room.uuid), 'date': today, 'slot': '08:00:00'},
+        ]}
+        with django_assert_max_num_queries(18):
+            response = self.client.post(reverse('booking-bulk'), data, format='json')
+        assert response.status_code == 201
+        results = response.data['results']
+        assert [result['status'] for result in results] == [
+            'accepted', 'accepted', 'rejected', 'rejected', 'rejected', 'rejected', 'rejected'
+        ]
+        assert results[2]['detail'] == 'User already has a booking for this slot.'
+        assert results[3]['detail'] == 'No available room for the selected slot and type.'
+        assert results[4]['detail'] == 'Conference room requires at least 3 team members.'
+        assert results[5]['detail'] == 'Room not found.'
+        assert results[6]['detail'] == 'Invalid slot.'
+        assert Booking.objects.filter(user=self.user).count() == 3
+        assert Booking.objects.filter(uuid=results[0]['booking_id']).exists()
+
+    def test_bulk_booking_all_rejected(self):
+        data = {'bookings': [{'room_id': str(self.room.uuid), 'date': 'tomorrow', 'slot': '09:00:00'}]}
+        response = self.client.post(reverse('booking-bulk'), data, format='json')
+        assert response.status_code == 400
+        assert response.data['results'][0]['detail'] == 'Invalid date format.'
+
+    def test_list_bookings_keyset_pagination(self):
+        bookings = [
+            Booking.objects.create(room=self.room, date=date.today() + timedelta(days=day), slot=slot, user=self.user)
+            for day in (1, 0) for slot in (time(10, 0), time(9, 0))
+        ]
+        url = reverse('booking-list') + '?page_size=3'
+        response = self.client.get(url)
+        assert response.status_code == 200
+        first_page = [booking['uuid'] for booking in response.data['results']]
+        assert first_page == [str(bookings[i].uuid) for i in (3, 2, 1)]
+        response = self.client.get(response.data['next'])
+        assert [booking['uuid'] for booking in response.data['results']] == [str(bookings[0].uuid)]
+        assert response.data['next'] is None
+
+    def test_list_bookings_without_date_or_slot_last(self):
+        dated = Booking.objects.create(room=self.room, date=date.today(), slot=time(9, 0), user=self.user)
+        no_slot = Booking.objects.create(room=self.room, date=date.today(), user=self.user)
+        undated = [Booking.objects.create(room=self.room, user=self.user) for _ in range(2)]
+        response = self.client.get(reverse('booking-list') + '?page_size=1')
+        listed = [booking['uuid'] for booking in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            listed += [booking['uuid'] for booking in response.data['results']]
+        assert listed == [str(booking.uuid) for booking in [dated, no_slot, *sorted(undated, key=lambda b: b.id)]]
+
+    def test_list_teams_keyset_pagination(self):
+        Team.objects.bulk_create(Team(name=f'Team {i}') for i in range(4))
+        response = self.client.get(reverse('team-list') + '?page_size=2')
+        names = [team['name'] for team in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            names += [team['name'] for team in response.data['results']]
+        assert sorted(names) == sorted(['Test Team'] + [f'Team {i}' for i in range(4)])
+
+    def test_list_invalid_cursor(self):
+        response = self.client.get(reverse('team-list') + '?cursor=not-a-cursor')
+        assert response.status_code == 404
+
+    def create_teams(self, count, members=3):
+        teams = []
+        for i in range(count):
+            team = Team.objects.create(name=f'Query Team {i}', created_by=self.user)
+            Member.objects.bulk_create(
+                Member(name=f'Member {i}-{j}', age=30, team=team, created_by=self.user) for j in range(members)
+            )
+            teams.append(team)
+        return teams
+
+    @pytest.mark.parametrize('team_count', [1, 10])
+    def test_list_teams_query_count(self, team_count, django_assert_num_queries):
+        self.create_teams(team_count)
+        with django_assert_num_queries(3):
+            response = self.client.get(reverse('team-list'))
+        assert len(response.data['results']) == team_count + 1
+        assert all(len(team['members']) == 3 for team in response.data['results'][1:])
+
+    @pytest.mark.parametrize('team_count', [1, 4])
+    def test_list_bookings_query_count(self, team_count, django_assert_num_queries):
+        rooms = [Room.objects.create(name=f'Query Conference {i}', room_type='conference', capacity=10) for i in range(team_count)]
+        for room, team in zip(rooms, self.create_teams(team_count)):
+            Booking.objects.create(room=room, team=team, date=date.today(), slot=time(9, 0), user=self.user)
+        Booking.objects.create(room=self.room, date=date.today(), slot=time(10, 0), user=self.user)
+        with django_assert_num_queries(3):
+            response = self.client.get(reverse('booking-list'))
+        assert len(response.data['results']) == team_count + 1
+        assert all(len(booking['team']['members']) == 3 for booking in response.data['results'] if booking['team'])
+
+    def test_list_members_query_count(self, django_assert_num_queries):
+        self.create_teams(5)
+        with django_assert_num_queries(1):
+            response = self.client.get(reverse('member-list'))
+        assert len(response.data['results']) == 16
@@ -0,0 +1,74 @@
+# third party imports
+import pytest
+from rest_framework.test import APIClient
+
+# django imports
+from django.core.management import call_command
+from django.urls import reverse
+
+# local imports
+from apps.booking.archive import archive_bookings
+from apps.booking.models import Room, Booking, BookingArchive, SlotInventory
+from apps.users.models import User
+
+# std imports
+from datetime import date, time, timedelta
+
+
+@pytest.mark.django_db
+class TestBookingArchive:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='archiveuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.room = Room.objects.create(name='Shared 1', room_type='shared', capacity=4)
+        self.today = date.today()
+
+    def create_bookings(self, days):
+        return [
+            Booking.objects.create(room=self.room, date=self.today + timedelta(days=day), slot=slot, user=self.user)
+            for day in days for slot in (time(9, 0), time(10, 0))
+        ]
+
+    def test_moves_past_bookings_in_batches(self):
+        past = self.create_bookings([-40, -35, -31])
+        recent = self.create_bookings([-1, 0, 3])
+        past[0].remove()
+        cutoff = self.today - timedelta(days=30)
+        assert archive_bookings(cutoff, batch_size=4) == 6
+
+        assert set(Booking.all_objects.values_list('id', flat=True)) == {booking.id for booking in recent}
+        archived = BookingArchive.all_objects.in_bulk()
+        assert set(archived) == {booking.id for booking in past}
+        assert archived[past[0].id].is_deleted
+        assert archived[past[1].id].uuid == past[1].uuid
+        assert archived[past[1].id].created == past[1].created
+        assert not SlotInventory.objects.filter(date__lt=cutoff).exists()
+        assert SlotInventory.objects.filter(date=self.today).exists()
+        # Nothing left to move.
+        assert archive_bookings(cutoff) == 0
+
+    def test_list_history(self):
+        past = self.create_bookings([-40, -35])
+        recent = self.create_bookings([0, 1])
+        archive_bookings(self.today - timedelta(days=30))
+
+        response = self.client.get(reverse('booking-list'))
+        assert [row['uuid'] for row in response.data['results']] == [str(booking.uuid) for booking in recent]
+
+        url = reverse('booking-list') + '?include_history=true&page_size=3'
+        seen = []
+        while url:
+            response = self.client.get(url)
+            assert response.status_code == 200
+            seen.extend(row['uuid'] for row in response.data['results'])
+            url = response.data['next']
+        assert seen == [str(booking.uuid) for booking in past + recent]
+
+    def test_archive_command(self):
+        self.create_bookings([-40])
+        call_command('archive_bookings', '--dry-run')
+        assert BookingArchive.objects.count() == 0
+        call_command('archive_bookings')
+        assert BookingArchive.objects.count() == 2
+        assert not Booking.objects.exists()
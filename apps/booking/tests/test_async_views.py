@@ -0,0 +1,70 @@
+# third party imports
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# django imports
+from django.test import AsyncClient
+from django.urls import reverse
+
+# local imports
+from apps.booking.cache import availability_cache
+from apps.booking.models import Room, Booking, Team, Member
+from apps.users.models import User
+
+# std imports
+from datetime import date, time
+
+
+@pytest.mark.django_db
+class TestAsyncViews:
+    def setup_method(self):
+        availability_cache.clear()
+        self.client = AsyncClient()
+        self.user = User.objects.create_user(username='asyncuser', password='testpass')
+        self.auth = {'Authorization': f'Bearer {RefreshToken.for_user(self.user).access_token}'}
+        self.room = Room.objects.create(name='Private 1', room_type='private', capacity=1)
+        self.conf_room = Room.objects.create(name='Conference 1', room_type='conference', capacity=10)
+        self.team = Team.objects.create(name='Async Team', created_by=self.user)
+        for i in range(3):
+            Member.objects.create(name=f'Member {i}', age=30, team=self.team)
+
+    def get(self, url, **headers):
+        return async_to_sync(self.client.get)(url, headers=headers)
+
+    def test_requires_token(self):
+        response = self.get(reverse('async-room-available'))
+        assert response.status_code == 401
+        assert response.json() == {'error': 'Authentication credentials were not provided.'}
+        response = self.get(reverse('async-room-available'), Authorization='Bearer nope')
+        assert response.status_code == 401
+        assert response.json() == {'error': 'Invalid or expired token.'}
+
+    def test_room_availability_matches_sync_view(self):
+        Booking.objects.create(room=self.room, date=date.today(), slot=time(9, 0), user=self.user)
+        url = f'?date={date.today()}&slot=09:00:00'
+        response = self.get(reverse('async-room-available') + url, **self.auth)
+        assert response.status_code == 200
+        assert [room['uuid'] for room in response.json()] == [str(self.conf_room.uuid)]
+        assert 'queries' in response['Server-Timing']
+
+        availability_cache.clear()
+        sync_response = self.get(reverse('room-available') + url, **self.auth)
+        assert sync_response.json() == response.json()
+
+    def test_room_availability_invalid_slot(self):
+        response = self.get(reverse('async-room-available') + '?slot=nine', **self.auth)
+        assert response.status_code == 400
+        assert response.json() == {'detail': 'Invalid slot format.'}
+
+    def test_booking_list(self):
+        Booking.objects.create(room=self.room, date=date.today(), slot=time(9, 0), user=self.user)
+        Booking.objects.create(room=self.conf_room, team=self.team, date=date.today(), slot=time(10, 0), user=self.user)
+        response = self.get(reverse('async-booking-list') + '?page_size=1', **self.auth)
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body['results']) == 1 and body['next']
+        response = self.get(body['next'], **self.auth)
+        results = response.json()['results']
+        assert len(results[0]['team']['members']) == 3
+        assert response.json()['next'] is None
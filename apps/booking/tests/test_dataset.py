@@ -0,0 +1,73 @@
+# third party imports
+import pytest
+
+# django imports
+from django.core.management import CommandError, call_command
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+# local imports
+from apps.booking.benchmark import seed_dataset
+from apps.booking.dataset import DatasetGenerator
+from apps.booking.headcount import recount_teams
+from apps.booking.models import Room, Booking, SlotInventory, RoomUtilization, Team
+from apps.users.models import User
+
+
+@pytest.mark.django_db
+class TestDatasetGenerator:
+    def setup_method(self):
+        self.options = dict(users=40, teams=6, rooms=12, bookings=400, start=timezone.localdate(), days=7, batch_size=50)
+
+    def rows(self):
+        return set(Booking.objects.values_list('uuid', 'room__name', 'user__username', 'team__name', 'date', 'slot'))
+
+    def test_bookings_follow_the_booking_rules(self):
+        summary = DatasetGenerator(**self.options).run()
+        assert (summary['users'], summary['teams'], summary['rooms'], summary['bookings']) == (40, 6, 12, 400)
+        assert Booking.objects.count() == 400
+        assert Room.objects.filter(room_type=Room.CONFERENCE).exists()
+
+        slots = Booking.objects.values('date', 'slot')
+        assert not slots.annotate(total=Count('user', distinct=True)).exclude(total=Count('id')).exists()
+        assert not Booking.objects.exclude(team=None).values('date', 'slot', 'team').annotate(
+            total=Count('id')).filter(total__gt=1).exists()
+        assert not Booking.objects.filter(room__room_type=Room.CONFERENCE, team=None).exists()
+        assert not Booking.objects.filter(team__member_count__lt=3).exists()
+        per_room = Booking.objects.values('room', 'date', 'slot').annotate(total=Count('id'))
+        assert not per_room.filter(total__gt=1).exclude(room__room_type=Room.SHARED).exists()
+        assert not per_room.filter(total__gt=F('room__capacity')).exists()
+
+        assert RoomUtilization.objects.aggregate(total=Sum('bookings'))['total'] == 400
+        today = Booking.objects.filter(date=timezone.localdate()).values('room', 'slot').annotate(total=Count('id'))
+        for row in today:
+            inventory = SlotInventory.objects.get(room=row['room'], date=timezone.localdate(), slot=row['slot'])
+            room = Room.objects.get(pk=row['room'])
+            assert inventory.remaining == (room.capacity if room.room_type == Room.SHARED else 1) - row['total']
+        assert recount_teams(dry_run=True) == []
+
+    def test_same_seed_gives_same_dataset(self):
+        DatasetGenerator(**self.options).run()
+        first = self.rows()
+        DatasetGenerator(**self.options).run()
+        assert self.rows() == first
+        assert (User.objects.count(), Team.objects.count(), Booking.objects.count()) == (40, 6, 400)
+        DatasetGenerator(**self.options, seed=1).run()
+        assert self.rows() != first
+
+    def test_rejects_datasets_that_do_not_fit(self):
+        with pytest.raises(ValueError):
+            DatasetGenerator(**{**self.options, 'bookings': 5000}).run()
+        with pytest.raises(CommandError):
+            call_command('generate_dataset', users=40, teams=0, rooms=12, bookings=10)
+        with pytest.raises(CommandError):
+            call_command('generate_dataset', start='tomorrow')
+        assert not User.objects.exists()
+
+    def test_command_and_benchmark_seed_share_the_accounts(self):
+        call_command('generate_dataset', users=10, teams=2, rooms=4, bookings=50, days=3, start='2030-01-07')
+        assert Booking.objects.count() == 50
+        assert seed_dataset(12, 6) == [f'bench-user-{i}' for i in range(12)]
+        assert User.objects.count() == 12
+        seeded = ['Bench Shared 0', 'Bench Private 1', 'Bench Shared 2', 'Bench Private 3', 'Bench Shared 4']
+        assert Room.objects.filter(name__in=seeded + ['Bench Private 5']).count() == 6
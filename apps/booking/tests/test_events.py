@@ -0,0 +1,133 @@
+# third party imports
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# django imports
+from django.test import AsyncClient
+from django.urls import reverse
+
+# local imports
+from apps.booking import events
+from apps.booking.events import LocalBroker
+from apps.booking.inventory import book
+from apps.booking.models import Room
+from apps.users.models import User
+
+# std imports
+import json
+from datetime import date, time, timedelta
+
+
+def parse(chunk):
+    chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+    fields = dict(line.split(': ', 1) for line in chunk.strip().splitlines())
+    if 'data' in fields:
+        fields['data'] = json.loads(fields['data'])
+    return fields
+
+
+def test_broker_replays_missed_events_for_subscribed_dates():
+    broker = LocalBroker(backlog=3)
+    today, tomorrow = date.today(), date.today() + timedelta(days=1)
+
+    async def scenario():
+        for event_date in (today, tomorrow, today, today):
+            broker.publish(event_date, {})
+        subscription, missed = broker.subscribe({today}, last_event_id=f'{broker.token}-1')
+        assert [event.id for event in missed] == [f'{broker.token}-3', f'{broker.token}-4']
+        broker.publish(tomorrow, {})
+        broker.publish(today, {'live': True})
+        assert (await subscription.get(timeout=1)).number == 6
+        assert await subscription.get(timeout=0.01) is None
+        subscription.close()
+
+        # Event 1 fell out of the backlog, and event 9 was never published here.
+        assert broker.subscribe(last_event_id=f'{broker.token}-0')[1] is None
+        assert broker.subscribe(last_event_id=f'{broker.token}-9')[1] is None
+        assert broker.subscribe(last_event_id=None)[1] == []
+        # Ids of another process (or an earlier run of this one) share numbers but not the token.
+        other = LocalBroker()
+        assert other.token != broker.token
+        for _ in range(6):
+            other.publish(today, {})
+        assert other.subscribe(last_event_id=f'{broker.token}-5')[1] is None
+        assert other.subscribe(last_event_id='5')[1] is None
+
+    async_to_sync(scenario)()
+
+
+@pytest.mark.django_db
+class TestAvailabilityStream:
+    def setup_method(self):
+        self.broker = LocalBroker()
+        events._broker = self.broker
+        self.client = AsyncClient()
+        self.user = User.objects.create_user(username='kiosk', password='testpass')
+        self.auth = {'Authorization': f'Bearer {RefreshToken.for_user(self.user).access_token}'}
+        self.room = Room.objects.create(name='Shared 1', room_type='shared', capacity=4)
+        self.today = date.today()
+
+    def teardown_method(self):
+        events._broker = None
+
+    def test_bookings_publish_remaining_seats_after_commit(self, django_capture_on_commit_callbacks):
+        self.broker.has_subscribers = lambda: True
+        with django_capture_on_commit_callbacks(execute=True):
+            booking = book(self.room, self.today, time(9, 0), user=self.user)
+            assert not self.broker.backlog
+        with django_capture_on_commit_callbacks(execute=True):
+            booking.remove()
+        assert [event.data for event in self.broker.backlog] == [
+            {'room_id': str(self.room.uuid), 'date': str(self.today), 'slot': '09:00:00', 'remaining': 3},
+            {'room_id': str(self.room.uuid), 'date': str(self.today), 'slot': '09:00:00', 'remaining': 4},
+        ]
+
+    def test_nothing_published_without_subscribers(self, django_capture_on_commit_callbacks, django_assert_num_queries):
+        self.broker.publish(self.today, {})
+        with django_capture_on_commit_callbacks() as callbacks:
+            book(self.room, self.today, time(9, 0), user=self.user)
+        with django_assert_num_queries(0):
+            for callback in callbacks:
+                callback()
+        assert not self.broker.backlog
+
+        # A client resuming across the skipped change reloads instead of missing it.
+        async def resume():
+            return self.broker.subscribe(last_event_id=f'{self.broker.token}-1')[1]
+
+        assert async_to_sync(resume)() is None
+
+    def test_stream_resumes_and_follows_live_events(self):
+        tomorrow = self.today + timedelta(days=1)
+        for event_date in (self.today, tomorrow, self.today):
+            self.broker.publish(event_date, {'date': str(event_date)})
+        url = reverse('async-room-available-stream') + f'?date={self.today}'
+        token = self.broker.token
+
+        async def scenario():
+            response = await self.client.get(url, headers={**self.auth, 'Last-Event-ID': f'{token}-1'})
+            assert response.status_code == 200
+            assert response['Content-Type'] == 'text/event-stream'
+            content = response.streaming_content
+            assert parse(await anext(content)) == {'retry': '3000'}
+            assert parse(await anext(content)) == {'id': f'{token}-3', 'event': 'availability', 'data': {'date': str(self.today)}}
+
+            await sync_to_async(self.broker.publish)(tomorrow, {'date': str(tomorrow)})
+            await sync_to_async(self.broker.publish)(self.today, {'live': True})
+            assert parse(await anext(content)) == {'id': f'{token}-5', 'event': 'availability', 'data': {'live': True}}
+            await content.aclose()
+
+            response = await self.client.get(url, headers={**self.auth, 'Last-Event-ID': '3'})
+            content = response.streaming_content
+            await anext(content)
+            assert parse(await anext(content)) == {'event': 'reset', 'data': {}}
+            await content.aclose()
+
+        async_to_sync(scenario)()
+        assert not self.broker.subscriptions
+
+    def test_invalid_requests(self):
+        url = reverse('async-room-available-stream')
+        assert async_to_sync(self.client.get)(url).status_code == 401
+        assert async_to_sync(self.client.get)(url + '?date=today', headers=self.auth).status_code == 400
@@ -0,0 +1,106 @@
+# third party imports
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# django imports
+from django.core.management import call_command
+from django.test import AsyncClient
+from django.urls import reverse
+
+# local imports
+from apps.booking.archive import archive_bookings
+from apps.booking.export import EXPORT_COLUMNS, export_lines, export_rows
+from apps.booking.models import Room, Booking, Team
+from apps.users.models import User
+
+# std imports
+import csv
+import io
+import json
+import tracemalloc
+from datetime import date, time, timedelta
+
+
+@pytest.mark.django_db
+class TestBookingExport:
+    def setup_method(self):
+        self.client = APIClient()
+        self.staff = User.objects.create_user(username='finance', password='testpass', is_staff=True)
+        self.client.force_authenticate(user=self.staff)
+        self.team = Team.objects.create(name='Export Team', created_by=self.staff)
+        self.room = Room.objects.create(name='Conference 1', room_type='conference', capacity=10)
+        self.desk = Room.objects.create(name='Shared 1', room_type='shared', capacity=4)
+        self.today = date.today()
+        self.team_booking = Booking.objects.create(
+            room=self.room, team=self.team, user=self.staff, date=self.today, slot=time(10, 0)
+        )
+        self.desk_booking = Booking.objects.create(room=self.desk, user=self.staff, date=self.today, slot=time(9, 0))
+        self.old_booking = Booking.objects.create(
+            room=self.desk, user=self.staff, date=self.today - timedelta(days=60), slot=time(9, 0)
+        )
+        archive_bookings(self.today - timedelta(days=30))
+
+    def export(self, **params):
+        response = self.client.get(reverse('booking-export'), params)
+        assert response.status_code == 200
+        assert response.streaming
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_includes_archive(self):
+        rows = list(csv.DictReader(io.StringIO(self.export())))
+        assert [row['booking_id'] for row in rows] == [
+            str(self.old_booking.uuid), str(self.desk_booking.uuid), str(self.team_booking.uuid)
+        ]
+        assert rows[2]['team_name'] == 'Export Team'
+        assert rows[2]['room_type'] == 'conference'
+        assert rows[1]['team_id'] == ''
+
+    def test_ndjson_filters(self):
+        lines = self.export(output='ndjson', start=str(self.today), room_type='shared').splitlines()
+        assert [json.loads(line)['booking_id'] for line in lines] == [str(self.desk_booking.uuid)]
+        lines = self.export(output='ndjson', team_id=str(self.team.uuid)).splitlines()
+        assert json.loads(lines[0])['slot'] == '10:00:00'
+        assert len(lines) == 1
+
+    def test_invalid_params_and_permissions(self):
+        assert self.client.get(reverse('booking-export'), {'output': 'xml'}).status_code == 400
+        assert self.client.get(reverse('booking-export'), {'start': 'yesterday'}).status_code == 400
+        assert self.client.get(reverse('booking-export'), {'team_id': 'nope'}).status_code == 400
+        self.client.force_authenticate(user=User.objects.create_user(username='plain', password='testpass'))
+        assert self.client.get(reverse('booking-export')).status_code == 403
+
+    def test_command(self, tmp_path):
+        path = tmp_path / 'bookings.ndjson'
+        call_command('export_bookings', '--format', 'ndjson', '--end', str(self.today - timedelta(days=1)), '--file', str(path))
+        assert [json.loads(line)['booking_id'] for line in path.read_text().splitlines()] == [str(self.old_booking.uuid)]
+
+    def test_asgi_streams_asynchronously(self):
+        client = AsyncClient()
+        auth = {'Authorization': f'Bearer {RefreshToken.for_user(self.staff).access_token}'}
+
+        async def export():
+            response = await client.get(reverse('booking-export'), {'output': 'ndjson'}, headers=auth)
+            assert response.status_code == 200
+            assert response.is_async
+            return b''.join([chunk async for chunk in response.streaming_content]).decode()
+
+        assert async_to_sync(export)() == self.export(output='ndjson')
+
+    def test_memory_does_not_grow_with_rows(self):
+        def peak_export_memory(count):
+            Booking.objects.bulk_create(
+                Booking(room=self.desk, date=self.today + timedelta(days=1 + i // 9), slot=time(9 + i % 9, 0))
+                for i in range(count)
+            )
+            tracemalloc.start()
+            for _ in export_lines('csv', export_rows(chunk_size=100)):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+
+        small = peak_export_memory(200)
+        large = peak_export_memory(4000)
+        assert large < small * 2
@@ -0,0 +1,106 @@
+# third party imports
+import pytest
+from rest_framework.test import APIClient
+
+# django imports
+from django.core.management import call_command
+from django.urls import reverse
+
+# local imports
+from apps.booking.headcount import recount_teams
+from apps.booking.models import Room, Member, Team
+from apps.users.models import User
+
+# std imports
+from datetime import date
+
+
+@pytest.mark.django_db
+class TestTeamHeadcount:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='headcount', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.team = Team.objects.create(name='Counted', created_by=self.user)
+        self.other = Team.objects.create(name='Other', created_by=self.user)
+
+    def counts(self, team):
+        team.refresh_from_db()
+        return team.member_count, team.adult_count
+
+    def test_counts_follow_member_changes(self):
+        adult = Member.objects.create(name='Adult', age=30, team=self.team)
+        child = Member.objects.create(name='Child', age=6, team=self.team)
+        unknown = Member.objects.create(name='Unknown', team=self.team)
+        assert self.counts(self.team) == (3, 2)
+
+        child.age = 12
+        child.save()
+        assert self.counts(self.team) == (3, 3)
+        adult.team = self.other
+        adult.save()
+        assert self.counts(self.team) == (2, 2)
+        assert self.counts(self.other) == (1, 1)
+        unknown.deactivate()
+        child.remove()
+        assert self.counts(self.team) == (0, 0)
+        adult.delete()
+        assert self.counts(self.other) == (0, 0)
+
+        # A stale team instance saved later keeps the counters.
+        stale = Team.objects.get(pk=self.team.pk)
+        Member.objects.create(name='Late', age=40, team=self.team)
+        stale.name = 'Renamed'
+        stale.save()
+        assert self.counts(self.team) == (1, 1)
+
+    def test_stale_members_are_not_subtracted_twice(self):
+        member = Member.objects.create(name='Twice', age=30, team=self.team)
+        stale = Member.objects.get(pk=member.pk)
+        member.remove()
+        stale.remove()
+        assert self.counts(self.team) == (0, 0)
+
+        gone = Member.objects.create(name='Gone', age=30, team=self.team)
+        Member.objects.get(pk=gone.pk).remove()
+        gone.delete()
+        assert self.counts(self.team) == (0, 0)
+
+        # Counters that drifted below the stored rows stop at zero.
+        Member.objects.create(name='Drifted', age=30, team=self.team)
+        Team.objects.filter(pk=self.team.pk).update(member_count=0, adult_count=0)
+        Member.objects.get(name='Drifted').remove()
+        assert self.counts(self.team) == (0, 0)
+
+    def test_conference_check_reads_counter(self, django_assert_max_num_queries):
+        room = Room.objects.create(name='Conference 1', room_type='conference', capacity=10)
+        for i in range(2):
+            Member.objects.create(name=f'Member {i}', age=30, team=self.team)
+        data = {'room_id': str(room.uuid), 'team_id': str(self.team.uuid), 'date': str(date.today()), 'slot': '09:00:00'}
+        response = self.client.post(reverse('booking-list'), data, format='json')
+        assert response.status_code == 400
+        assert response.data['detail'] == 'Conference room requires at least 3 team members.'
+
+        Member.objects.create(name='Third', age=5, team=self.team)
+        assert self.client.post(reverse('booking-list'), data, format='json').status_code == 201
+        team = self.client.get(reverse('team-detail', kwargs={'pk': self.team.pk})).data
+        assert (team['member_count'], team['adult_count']) == (3, 2)
+
+    def test_roster_import_and_repair(self):
+        response = self.client.post(
+            reverse('team-roster', kwargs={'pk': self.team.pk}),
+            [{'name': 'Kid', 'age': 4}, {'name': 'Parent', 'age': 35}],
+            format='json',
+        )
+        assert response.status_code == 201
+        assert self.counts(self.team) == (2, 1)
+        assert recount_teams() == []
+
+        Team.objects.filter(pk=self.team.pk).update(member_count=9, adult_count=9)
+        Member.objects.bulk_create([Member(name='Bulk', age=20, team=self.other)])
+        assert sorted(recount_teams(dry_run=True)) == [self.team.pk, self.other.pk]
+        teams = self.client.get(reverse('team-list'))
+        call_command('repair_team_counts')
+        assert self.client.get(reverse('team-list'), HTTP_IF_NONE_MATCH=teams['ETag']).status_code == 200
+        assert self.counts(self.team) == (2, 1)
+        assert self.counts(self.other) == (1, 1)
@@ -0,0 +1,208 @@
+# third party imports
+import pytest
+from rest_framework.test import APIClient
+
+# django imports
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.urls import reverse
+
+# local imports
+from apps.booking.cache import availability_cache
+from apps.booking.inventory import book
+from apps.booking.models import Room, Booking, Member, SlotInventory, Team
+from apps.users.models import User
+
+# std imports
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time
+import threading
+
+
+@pytest.mark.django_db
+class TestSlotInventory:
+    def setup_method(self):
+        availability_cache.clear()
+        self.client = APIClient()
+        self.shared_room = Room.objects.create(name='Shared 1', room_type='shared', capacity=4)
+        self.users = [User.objects.create_user(username=f'user{i}', password='testpass') for i in range(5)]
+
+    def book_shared(self, user):
+        self.client.force_authenticate(user=user)
+        return self.client.post(reverse('booking-list'), {
+            'room_id': str(self.shared_room.uuid),
+            'date': str(date.today()),
+            'slot': '09:00:00',
+        }, format='json')
+
+    def test_shared_desk_fills_up_to_capacity(self):
+        statuses = [self.book_shared(user).status_code for user in self.users]
+        assert statuses == [201, 201, 201, 201, 400]
+        inventory = SlotInventory.objects.get(room=self.shared_room, date=date.today(), slot=time(9, 0))
+        assert inventory.remaining == 0
+
+    def test_cancel_gives_seat_back(self):
+        booking_ids = [self.book_shared(user).data['booking_id'] for user in self.users[:4]]
+        self.client.force_authenticate(user=self.users[0])
+        response = self.client.post(reverse('booking-cancel', kwargs={'uuid': booking_ids[0]}))
+        assert response.status_code == 200
+        assert SlotInventory.objects.get(room=self.shared_room).remaining == 1
+        assert self.book_shared(self.users[4]).status_code == 201
+
+    def test_cancel_is_soft_delete(self):
+        booking_id = self.book_shared(self.users[0]).data['booking_id']
+        url = reverse('booking-cancel', kwargs={'uuid': booking_id})
+        assert self.client.post(url).status_code == 200
+        assert not Booking.objects.filter(uuid=booking_id).exists()
+        cancelled = Booking.all_objects.get(uuid=booking_id)
+        assert cancelled.is_deleted and not cancelled.is_active
+        # Already cancelled: not found, and the seat is not given back twice.
+        assert self.client.post(url).status_code == 404
+        assert SlotInventory.objects.get(room=self.shared_room).remaining == 4
+
+    def test_cancelled_booking_does_not_block_rebooking(self):
+        booking_id = self.book_shared(self.users[0]).data['booking_id']
+        self.client.post(reverse('booking-cancel', kwargs={'uuid': booking_id}))
+        response = self.book_shared(self.users[0])
+        assert response.status_code == 201
+        assert Booking.all_objects.filter(room=self.shared_room, user=self.users[0]).count() == 2
+        assert SlotInventory.objects.get(room=self.shared_room).remaining == 3
+
+    def test_hard_delete_of_cancelled_booking_keeps_inventory(self):
+        booking_id = self.book_shared(self.users[0]).data['booking_id']
+        self.client.post(reverse('booking-cancel', kwargs={'uuid': booking_id}))
+        Booking.all_objects.get(uuid=booking_id).delete()
+        assert SlotInventory.objects.get(room=self.shared_room).remaining == 4
+
+    def test_restoring_cancelled_booking_takes_seat_again(self):
+        booking_id = self.book_shared(self.users[0]).data['booking_id']
+        self.client.post(reverse('booking-cancel', kwargs={'uuid': booking_id}))
+        booking = Booking.all_objects.get(uuid=booking_id)
+        booking.is_deleted = False
+        booking.activate()
+        assert SlotInventory.objects.get(room=self.shared_room).remaining == 3
+
+    def test_move_takes_and_gives_seats_with_deltas(self, monkeypatch):
+        booking_id = self.book_shared(self.users[0]).data['booking_id']
+
+        def reserve_again(booking):
+            raise AssertionError('moves must not take the seat twice')
+
+        monkeypatch.setattr('apps.booking.signals.reserve_saved', reserve_again)
+        response = self.client.patch(reverse('booking-detail', kwargs={'uuid': booking_id}), {'slot': '10:00:00'}, format='json')
+        assert response.status_code == 200
+        remaining = dict(SlotInventory.objects.values_list('slot', 'remaining'))
+        assert remaining == {time(9, 0): 4, time(10, 0): 3}
+        # The flag only covers the move: cancelling still gives the seat back.
+        assert self.client.post(reverse('booking-cancel', kwargs={'uuid': booking_id})).status_code == 200
+        assert SlotInventory.objects.get(slot=time(10, 0)).remaining == 4
+
+    def test_move_between_room_types_sets_team(self):
+        team = Team.objects.create(name='Movers', created_by=self.users[0])
+        for i in range(3):
+            Member.objects.create(name=f'Mover {i}', age=30, team=team)
+        conference = Room.objects.create(name='Conference 1', room_type='conference', capacity=10)
+        private = Room.objects.create(name='Private 1', room_type='private', capacity=1)
+        booking_id = self.book_shared(self.users[0]).data['booking_id']
+        url = reverse('booking-detail', kwargs={'uuid': booking_id})
+
+        response = self.client.patch(url, {'room_id': str(conference.uuid)}, format='json')
+        assert response.status_code == 400
+        response = self.client.patch(url, {'room_id': str(conference.uuid), 'team_id': str(team.uuid)}, format='json')
+        assert response.status_code == 200
+        assert Booking.objects.get(uuid=booking_id).team == team
+
+        # Off the conference room the team no longer holds the slot.
+        response = self.client.patch(url, {'room_id': str(private.uuid)}, format='json')
+        assert response.status_code == 200
+        assert Booking.objects.get(uuid=booking_id).team is None
+        self.client.force_authenticate(user=self.users[1])
+        response = self.client.post(reverse('booking-list'), {
+            'room_id': str(conference.uuid), 'team_id': str(team.uuid), 'date': str(date.today()), 'slot': '09:00:00',
+        }, format='json')
+        assert response.status_code == 201
+
+    def test_orm_writes_move_seats_with_deltas(self):
+        # A seat taken concurrently by ``reserve`` is not in the bookings yet: a recount would give it back.
+        SlotInventory.objects.create(room=self.shared_room, date=date.today(), slot=time(9, 0), remaining=3)
+        booking = Booking.objects.create(room=self.shared_room, date=date.today(), slot=time(9, 0), user=self.users[0])
+        assert SlotInventory.objects.get(slot=time(9, 0)).remaining == 2
+        booking.slot = time(10, 0)
+        booking.save()
+        remaining = dict(SlotInventory.objects.values_list('slot', 'remaining'))
+        assert remaining == {time(9, 0): 3, time(10, 0): 3}
+
+    def test_inventory_seeded_from_existing_bookings(self):
+        Booking.objects.bulk_create(
+            Booking(room=self.shared_room, date=date.today(), slot=time(9, 0), user=user) for user in self.users[:3]
+        )
+        assert self.book_shared(self.users[3]).status_code == 201
+        assert self.book_shared(self.users[4]).status_code == 400
+
+    def test_backfill_command(self):
+        Booking.objects.bulk_create(
+            Booking(room=self.shared_room, date=date.today(), slot=time(h, 0), user=self.users[0]) for h in (9, 10)
+        )
+        SlotInventory.objects.create(room=self.shared_room, date=date.today(), slot=time(11, 0), remaining=0)
+        call_command('backfill_slot_inventory')
+        remaining = dict(SlotInventory.objects.values_list('slot', 'remaining'))
+        assert remaining == {time(9, 0): 3, time(10, 0): 3, time(11, 0): 4}
+
+
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason='needs concurrent writers (PostgreSQL)')
+@pytest.mark.django_db(transaction=True)
+def test_no_overbooking_under_contention():
+    room = Room.objects.create(name='Shared Stress', room_type='shared', capacity=4)
+    users = [User.objects.create_user(username=f'stress{i}', password='x') for i in range(64)]
+    barrier = threading.Barrier(len(users))
+
+    def attempt(user):
+        try:
+            barrier.wait()
+            with transaction.atomic():
+                return book(room, date.today(), time(9, 0), user=user) is not None
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=len(users)) as pool:
+        results = list(pool.map(attempt, users))
+
+    assert sum(results) == room.capacity
+    assert Booking.objects.filter(room=room, date=date.today(), slot=time(9, 0)).count() == room.capacity
+    assert SlotInventory.objects.get(room=room, date=date.today(), slot=time(9, 0)).remaining == 0
+
+
+@pytest.mark.django_db
+class TestRoomTypeAllocation:
+    def setup_method(self):
+        availability_cache.clear()
+        self.client = APIClient()
+        self.users = [User.objects.create_user(username=f'user{i}', password='testpass') for i in range(3)]
+        self.rooms = [Room.objects.create(name=f'Private {i}', room_type='private', capacity=1) for i in range(2)]
+        self.big_desk = Room.objects.create(name='Shared Big', room_type='shared', capacity=6)
+        Room.objects.create(name='Shared Small', room_type='shared', capacity=2)
+
+    def book_type(self, user, room_type, **extra):
+        self.client.force_authenticate(user=user)
+        return self.client.post(reverse('booking-list'), {
+            'room_type': room_type,
+            'date': str(date.today()),
+            'slot': '09:00:00',
+            **extra,
+        }, format='json')
+
+    def test_allocates_free_rooms_of_type(self):
+        responses = [self.book_type(user, 'private') for user in self.users]
+        assert [response.status_code for response in responses] == [201, 201, 400]
+        assert {responses[0].data['room_id'], responses[1].data['room_id']} == {str(room.uuid) for room in self.rooms}
+
+    def test_allocation_respects_min_capacity(self):
+        response = self.book_type(self.users[0], 'shared', min_capacity=4)
+        assert response.status_code == 201
+        assert response.data['room_id'] == str(self.big_desk.uuid)
+
+    def test_allocation_requires_valid_room_type(self):
+        assert self.book_type(self.users[0], 'ballroom').status_code == 400
+        self.client.force_authenticate(user=self.users[0])
+        response = self.client.post(reverse('booking-list'), {'date': str(date.today()), 'slot': '09:00:00'}, format='json')
+        assert response.status_code == 400
@@ -0,0 +1,109 @@
+# third party imports
+import pytest
+from rest_framework.test import APIClient
+
+# django imports
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from django.urls import reverse
+
+# local imports
+from apps.booking.cache import availability_cache
+from apps.booking.models import Room
+from apps.core.metrics import Counter, Gauge, Histogram, db_connections_opened
+from apps.users.models import User
+
+# std imports
+from datetime import date
+import re
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+    def setup_method(self):
+        availability_cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='metricsuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        Room.objects.create(name='Private 1', room_type='private', capacity=1)
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('room-available') + f'?date={date.today()}&slot=09:00:00')
+        assert response.status_code == 200
+        match = re.fullmatch(r'app;dur=[\d.]+, db;dur=[\d.]+;desc="(\d+) queries"', response['Server-Timing'])
+        assert match and int(match.group(1)) == 2
+
+    def test_metrics_endpoint(self, settings):
+        settings.METRICS_TOKEN = 'scrape-secret'
+        self.client.get(reverse('room-available'))
+        assert self.client.get(reverse('metrics')).status_code == 403
+        assert self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong').status_code == 403
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-secret')
+        assert response.status_code == 200
+        body = response.content.decode()
+        assert '# TYPE http_request_duration_seconds histogram' in body
+        assert 'http_request_duration_seconds_count{view="room-available",method="GET",status="200"}' in body
+        assert 'http_request_sql_queries_bucket{view="room-available",method="GET",le="+Inf"}' in body
+
+        settings.METRICS_TOKEN = ''
+        staff = User.objects.create_user(username='metricsstaff', password='testpass', is_staff=True)
+        self.client.force_login(staff)
+        assert self.client.get(reverse('metrics')).status_code == 200
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram('test_seconds', 'Test.', ('view',), (0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(('a',), value)
+    lines = histogram.render()
+    assert 'test_seconds_bucket{view="a",le="0.1"} 2' in lines
+    assert 'test_seconds_bucket{view="a",le="1.0"} 3' in lines
+    assert 'test_seconds_bucket{view="a",le="+Inf"} 4' in lines
+    assert 'test_seconds_count{view="a"} 4' in lines
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConnectionReuse:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='reuseuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+
+    def request_cycle(self):
+        # The test client keeps connections open; close them as the real handlers do.
+        request_started.send(sender=self.__class__)
+        response = self.client.get(reverse('room-available'))
+        request_finished.send(sender=self.__class__)
+        assert response.status_code == 200
+        return connection.connection
+
+    def opened(self):
+        return db_connections_opened.collect().get((connection.alias,), 0)
+
+    def test_connection_reused_across_requests(self, monkeypatch):
+        monkeypatch.setitem(connection.settings_dict, 'CONN_MAX_AGE', 60)
+        connection.close()
+        first = self.request_cycle()
+        opened = self.opened()
+        assert self.request_cycle() is first
+        assert self.request_cycle() is first
+        assert self.opened() == opened
+
+    def test_connection_closed_without_max_age(self, monkeypatch):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            pytest.skip('In-memory SQLite connections are never closed.')
+        monkeypatch.setitem(connection.settings_dict, 'CONN_MAX_AGE', 0)
+        connection.close()
+        first = self.request_cycle()
+        opened = self.opened()
+        assert self.request_cycle() is not first
+        assert self.opened() == opened + 1
+
+
+def test_counter_and_gauge_render():
+    counter = Counter('test_total', 'Test.', ('alias',))
+    counter.inc(('default',))
+    counter.inc(('default',), 2)
+    assert 'test_total{alias="default"} 3' in counter.render()
+    gauge = Gauge('test_size', 'Test.', ('alias',), lambda: {('default',): 4})
+    assert gauge.render() == ['# HELP test_size Test.', '# TYPE test_size gauge', 'test_size{alias="default"} 4']
@@ -0,0 +1,53 @@
+# third party imports
+import pytest
+
+# django imports
+from django.db import connection
+
+# local imports
+from apps.booking.models import Room, Booking, Team, Member
+from apps.users.models import User
+
+# std imports
+from datetime import date, time
+import uuid
+
+INDEX_MARKERS = ('USING INDEX', 'USING COVERING INDEX', 'USING PRIMARY KEY', 'Index Scan', 'Index Only Scan')
+
+
+def assert_uses_index(queryset):
+    plan = queryset.explain()
+    assert any(marker in plan for marker in INDEX_MARKERS), plan
+    return plan
+
+
+@pytest.mark.django_db
+class TestHotPathQueryPlans:
+    """The lookups of apps/booking/api/views.py must be answered from an index."""
+
+    def setup_method(self):
+        if connection.vendor == 'postgresql':
+            # Tiny test tables would otherwise always be scanned sequentially.
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        self.user = User.objects.create_user(username='planuser', password='testpass')
+        self.team = Team.objects.create(name='Plan Team', created_by=self.user)
+        self.room = Room.objects.create(name='Plan Room', room_type='private', capacity=1)
+
+    @pytest.mark.parametrize('model', [Room, Team, Member, Booking, User])
+    def test_uuid_lookup_uses_index(self, model):
+        assert_uses_index(model.objects.filter(uuid=uuid.uuid4()))
+
+    def test_user_double_booking_check_uses_index(self):
+        plan = assert_uses_index(Booking.objects.filter(date=date.today(), slot=time(9, 0), user=self.user))
+        assert 'booking_user_date_slot_idx' in plan
+
+    def test_team_double_booking_check_uses_index(self):
+        plan = assert_uses_index(Booking.objects.filter(date=date.today(), slot=time(9, 0), team=self.team))
+        assert 'booking_date_slot_team_idx' in plan
+
+    def test_member_team_filter_uses_index(self):
+        assert_uses_index(Member.objects.filter(team__uuid=self.team.uuid, created_by=self.user))
+
+    def test_user_booking_list_uses_index(self):
+        assert_uses_index(Booking.objects.filter(user=self.user))
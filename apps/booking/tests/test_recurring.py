@@ -0,0 +1,128 @@
+# third party imports
+import pytest
+from rest_framework.test import APIClient
+
+# django imports
+from django.urls import reverse
+
+# local imports
+from apps.booking.cache import availability_cache
+from apps.booking.models import Room, Booking, RecurringSeries, SlotInventory, Team, Member
+from apps.users.models import User
+
+# std imports
+from datetime import date, time, timedelta
+
+
+@pytest.mark.django_db
+class TestRecurringSeries:
+    def setup_method(self):
+        availability_cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='seriesuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.team = Team.objects.create(name='Weekly Team', created_by=self.user)
+        for i in range(3):
+            Member.objects.create(name=f'Member {i}', age=30, team=self.team)
+        self.conf_room = Room.objects.create(name='Conference 1', room_type='conference', capacity=10)
+        self.room = Room.objects.create(name='Private 1', room_type='private', capacity=1)
+        self.start = date.today() + timedelta(days=1)
+
+    def create_series(self, **data):
+        payload = {
+            'room_id': str(self.conf_room.uuid),
+            'team_id': str(self.team.uuid),
+            'frequency': 'weekly',
+            'slot': '10:00:00',
+            'start_date': str(self.start),
+            'count': 52,
+            **data,
+        }
+        return self.client.post(reverse('booking-series-list'), payload, format='json')
+
+    def test_weekly_series_booked_with_constant_queries(self, django_assert_max_num_queries):
+        # Lookups, occupancy and team checks, inventory, one insert, the rollups and the version counters,
+        # whatever the number of occurrences.
+        with django_assert_max_num_queries(23):
+            response = self.create_series()
+        assert response.status_code == 201
+        assert [result['status'] for result in response.data['results']] == ['accepted'] * 52
+        series = RecurringSeries.objects.get(uuid=response.data['series_id'])
+        dates = list(series.bookings.order_by('date').values_list('date', flat=True))
+        assert dates == [self.start + timedelta(weeks=week) for week in range(52)]
+        assert SlotInventory.objects.filter(room=self.conf_room, remaining=0).count() == 52
+
+    def test_conflicting_occurrences_skipped(self):
+        Booking.objects.create(
+            room=self.conf_room, date=self.start + timedelta(weeks=1), slot=time(10, 0), user=self.user
+        )
+        response = self.create_series(count=3)
+        assert response.status_code == 201
+        results = response.data['results']
+        assert [result['status'] for result in results] == ['accepted', 'rejected', 'accepted']
+        assert results[1]['date'] == str(self.start + timedelta(weeks=1))
+
+    def test_daily_series_until_end_date(self):
+        response = self.create_series(
+            room_id=str(self.room.uuid), team_id=None, frequency='daily', interval=2,
+            count=None, end_date=str(self.start + timedelta(days=6)),
+        )
+        assert response.status_code == 201
+        assert len(response.data['results']) == 4
+
+    def test_invalid_series(self):
+        assert self.create_series(count=None).status_code == 400
+        assert self.create_series(slot='08:00:00').status_code == 400
+        assert self.create_series(count=None, end_date=str(self.start - timedelta(days=1))).status_code == 400
+        response = self.create_series(frequency='daily', count=None, end_date=str(self.start + timedelta(days=400)))
+        assert response.status_code == 400
+        assert not RecurringSeries.all_objects.exists()
+
+    def test_all_occurrences_rejected(self):
+        self.team.members.first().remove()
+        response = self.create_series(count=2)
+        assert response.status_code == 400
+        assert not RecurringSeries.all_objects.exists()
+
+    def test_cancel_single_occurrence(self):
+        series = RecurringSeries.objects.get(uuid=self.create_series(count=3).data['series_id'])
+        occurrence = series.bookings.order_by('date')[1]
+        response = self.client.post(reverse('booking-cancel', kwargs={'uuid': str(occurrence.uuid)}))
+        assert response.status_code == 200
+        response = self.client.get(reverse('booking-series-detail', kwargs={'uuid': str(series.uuid)}))
+        assert len(response.data['occurrences']) == 2
+        assert SlotInventory.objects.get(room=self.conf_room, date=occurrence.date).remaining == 1
+
+    def test_edit_single_occurrence(self):
+        series = RecurringSeries.objects.get(uuid=self.create_series(count=3).data['series_id'])
+        occurrence = series.bookings.order_by('date')[0]
+        url = reverse('booking-detail', kwargs={'uuid': str(occurrence.uuid)})
+        response = self.client.patch(url, {'slot': '11:00:00'}, format='json')
+        assert response.status_code == 200
+        occurrence.refresh_from_db()
+        assert occurrence.slot == time(11, 0) and occurrence.series == series
+        assert SlotInventory.objects.get(room=self.conf_room, date=occurrence.date, slot=time(10, 0)).remaining == 1
+        assert SlotInventory.objects.get(room=self.conf_room, date=occurrence.date, slot=time(11, 0)).remaining == 0
+
+        # Moving onto the next occurrence's slot conflicts with the team's own booking.
+        response = self.client.patch(url, {'date': str(self.start + timedelta(weeks=1)), 'slot': '10:00:00'}, format='json')
+        assert response.status_code == 400
+        other = User.objects.create_user(username='other', password='testpass')
+        self.client.force_authenticate(user=other)
+        assert self.client.patch(url, {'slot': '12:00:00'}, format='json').status_code == 404
+
+    def test_cancel_series(self):
+        series_id = self.create_series(count=4).data['series_id']
+        response = self.client.post(reverse('booking-series-cancel', kwargs={'uuid': series_id}))
+        assert response.status_code == 200
+        assert response.data['cancelled'] == 4
+        assert not Booking.objects.filter(series__uuid=series_id).exists()
+        assert set(SlotInventory.objects.filter(room=self.conf_room).values_list('remaining', flat=True)) == {1}
+        assert self.create_series(count=4).status_code == 201
+
+    def test_list_series(self):
+        self.create_series(count=2)
+        response = self.client.get(reverse('booking-series-list'))
+        assert response.status_code == 200
+        assert len(response.data['results']) == 1
+        assert response.data['results'][0]['team'] == self.team.uuid
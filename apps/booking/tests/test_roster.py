@@ -0,0 +1,125 @@
+# third party imports
+import pytest
+from rest_framework.test import APIClient
+
+# django imports
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError
+from django.urls import reverse
+
+# local imports
+from apps.booking.models import Member, Team
+from apps.booking.roster import RosterImport
+from apps.users.models import User
+
+
+@pytest.mark.django_db
+class TestRosterImport:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='hrsync', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.team = Team.objects.create(name='Roster Team', created_by=self.user)
+        Member.objects.create(name='Ann', email='ann@example.com', age=30, team=self.team)
+        Member.objects.create(name='Gone', email='', team=self.team).remove()
+        self.url = reverse('team-roster', kwargs={'pk': self.team.pk})
+
+    def test_import_json_reports_each_row(self):
+        members = [
+            {'name': 'Bob', 'email': 'bob@example.com', 'age': 40, 'gender': 'male'},
+            {'name': 'Ann', 'email': 'ann@example.com'},
+            {'name': 'Bob', 'email': 'bob@example.com'},
+            {'name': 'Gone'},
+            {'name': 'Ann', 'email': 'ann@work.example.com', 'age': '8'},
+            {'name': '', 'email': 'x@example.com'},
+            {'name': 'Cy', 'email': 'not-an-email'},
+            {'name': 'Di', 'age': 'ten'},
+            {'name': 'Ed', 'gender': 'unknown'},
+            'Fay',
+        ]
+        response = self.client.post(self.url, members, format='json')
+        assert response.status_code == 201
+        assert response.data['created'] == 2
+        assert [(result['index'], result['detail']) for result in response.data['results']] == [
+            (1, 'Member already exists in this team.'),
+            (2, 'Member already exists in this team.'),
+            (3, 'Member already exists in this team.'),
+            (5, 'Invalid name.'),
+            (6, 'Invalid email.'),
+            (7, 'Invalid age.'),
+            (8, 'Invalid gender.'),
+            (9, 'Invalid member row.'),
+        ]
+        bob = Member.objects.get(name='Bob')
+        assert (bob.age, bob.gender, bob.created_by) == (40, 'male', self.user)
+        assert Member.objects.get(email='ann@work.example.com').age == 8
+
+    def test_import_csv_upload(self):
+        roster = SimpleUploadedFile('roster.csv', b'name,email,age\nCsv One,one@example.com,25\nCsv Two,,\n')
+        response = self.client.post(self.url, {'file': roster}, format='multipart')
+        assert response.status_code == 201
+        assert response.data == {'rows': 2, 'created': 2, 'rejected': 0, 'results': []}
+        assert Member.objects.get(name='Csv Two').age is None
+
+    def test_rejects_bad_payloads(self):
+        assert self.client.post(self.url, [], format='json').status_code == 400
+        assert self.client.post(self.url, {'members': 'Bob'}, format='json').status_code == 400
+        bad_file = SimpleUploadedFile('roster.xml', b'<members/>')
+        assert self.client.post(self.url, {'file': bad_file}, format='multipart').status_code == 400
+        missing = reverse('team-roster', kwargs={'pk': self.team.pk + 100})
+        assert self.client.post(missing, [{'name': 'Bob'}], format='json').status_code == 404
+        response = self.client.post(self.url, {'members': [{'name': 'Ann', 'email': 'ann@example.com'}]}, format='json')
+        assert response.status_code == 400
+        assert response.data['created'] == 0
+
+    def test_single_existing_members_query(self, django_assert_max_num_queries):
+        members = [{'name': f'Member {i}', 'email': f'member{i}@example.com'} for i in range(50)]
+        # The team, existing members, then one insert, the team counters and their version inside a savepoint.
+        with django_assert_max_num_queries(7):
+            response = self.client.post(self.url, {'members': members}, format='json')
+        assert response.data['created'] == 50
+        assert Member.objects.filter(team=self.team).count() == 51
+
+    def test_concurrent_duplicate_is_rejected(self, monkeypatch):
+        roster = RosterImport(self.team, [{'name': 'Race'}, {'name': 'Safe'}])
+        validate = roster.validate
+
+        def validate_then_race():
+            accepted = validate()
+            Member.objects.create(name='Race', team=self.team)
+            return accepted
+
+        monkeypatch.setattr(roster, 'validate', validate_then_race)
+        roster.run()
+        assert roster.created == 1
+        assert roster.results == [{'index': 0, 'status': 'rejected', 'detail': 'Member already exists in this team.'}]
+        assert Member.objects.filter(team=self.team, name='Safe').exists()
+
+    def test_repeated_races_are_rejected(self, monkeypatch):
+        roster = RosterImport(self.team, [{'name': 'First'}, {'name': 'Second'}, {'name': 'Third'}])
+        create = roster.create
+        racers = iter(['First', 'Second'])
+
+        def create_after_race(accepted):
+            racer = next(racers, None)
+            if racer:
+                Member.objects.create(name=racer, team=self.team)
+            create(accepted)
+
+        monkeypatch.setattr(roster, 'create', create_after_race)
+        roster.run()
+        assert roster.created == 1
+        assert [(result['index'], result['detail']) for result in roster.results] == [
+            (0, 'Member already exists in this team.'), (1, 'Member already exists in this team.'),
+        ]
+
+    def test_unexplained_conflict_rejects_rows(self, monkeypatch):
+        roster = RosterImport(self.team, [{'name': 'First'}, {'name': 'Second'}])
+
+        def conflict(accepted):
+            raise IntegrityError
+
+        monkeypatch.setattr(roster, 'create', conflict)
+        roster.run()
+        assert roster.created == 0
+        assert [result['detail'] for result in roster.results] == ['Member could not be added, please retry.'] * 2
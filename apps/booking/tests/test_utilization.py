@@ -0,0 +1,152 @@
+# third party imports
+import pytest
+from rest_framework.test import APIClient
+
+# django imports
+from django.apps import apps as django_apps
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# local imports
+from apps.booking.archive import archive_bookings
+from apps.booking.cache import availability_cache
+from apps.booking.models import Room, Booking, Member, RoomUtilization, SlotUtilization, Team
+from apps.booking.utilization import rebuild_utilization
+from apps.users.models import User
+
+# std imports
+from datetime import date, time, timedelta
+from importlib import import_module
+
+
+def rollups():
+    return (
+        {(row.room_id, row.date): row.bookings for row in RoomUtilization.objects.all() if row.bookings},
+        {(row.room_type, row.date, row.slot): row.bookings for row in SlotUtilization.objects.all() if row.bookings},
+    )
+
+
+@pytest.mark.django_db
+class TestUtilizationRollups:
+    def setup_method(self):
+        availability_cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='planner', password='testpass', is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        self.team = Team.objects.create(name='Rollup Team', created_by=self.user)
+        for i in range(3):
+            Member.objects.create(name=f'Member {i}', age=30, team=self.team)
+        self.room = Room.objects.create(name='Private 1', room_type='private', capacity=1)
+        self.conf_room = Room.objects.create(name='Conference 1', room_type='conference', capacity=10)
+        self.shared_room = Room.objects.create(name='Shared 1', room_type='shared', capacity=4)
+        self.today = date.today()
+
+    def book(self, room, slot='09:00:00', booking_date=None, **data):
+        payload = {'room_id': str(room.uuid), 'date': str(booking_date or self.today), 'slot': slot, **data}
+        response = self.client.post(reverse('booking-list'), payload, format='json')
+        assert response.status_code == 201
+        return response.data['booking_id']
+
+    def test_rollups_follow_every_write_path(self):
+        cancelled = self.book(self.room)
+        moved = self.book(self.shared_room, slot='10:00:00')
+        self.book(self.conf_room, team_id=str(self.team.uuid))
+        assert rollups() == (
+            {(self.room.id, self.today): 1, (self.shared_room.id, self.today): 1, (self.conf_room.id, self.today): 1},
+            {('private', self.today, time(9)): 1, ('shared', self.today, time(10)): 1, ('conference', self.today, time(9)): 1},
+        )
+
+        self.client.post(reverse('booking-cancel', kwargs={'uuid': cancelled}))
+        tomorrow = self.today + timedelta(days=1)
+        response = self.client.patch(
+            reverse('booking-detail', kwargs={'uuid': moved}), {'date': str(tomorrow)}, format='json'
+        )
+        assert response.status_code == 200
+        bulk = {'bookings': [
+            {'room_id': str(self.shared_room.uuid), 'date': str(tomorrow), 'slot': slot}
+            for slot in ('11:00:00', '12:00:00')
+        ]}
+        assert self.client.post(reverse('booking-bulk'), bulk, format='json').status_code == 201
+        series = self.client.post(reverse('booking-series-list'), {
+            'room_id': str(self.room.uuid), 'frequency': 'daily', 'slot': '15:00:00',
+            'start_date': str(tomorrow), 'count': 3,
+        }, format='json').data['series_id']
+        self.client.post(reverse('booking-series-cancel', kwargs={'uuid': series}))
+        Booking.objects.get(room=self.conf_room).delete()
+
+        assert rollups() == (
+            {(self.shared_room.id, tomorrow): 3},
+            {('shared', tomorrow, time(10)): 1, ('shared', tomorrow, time(11)): 1, ('shared', tomorrow, time(12)): 1},
+        )
+        incremental = rollups()
+        rebuild_utilization()
+        assert rollups() == incremental
+
+    def test_archiving_keeps_rollups(self):
+        past = self.today - timedelta(days=60)
+        Booking.objects.create(room=self.room, user=self.user, date=past, slot=time(9, 0))
+        before = rollups()
+        archive_bookings(self.today - timedelta(days=30))
+        assert rollups() == before == ({(self.room.id, past): 1}, {('private', past, time(9)): 1})
+        RoomUtilization.objects.all().delete()
+        call_command('rebuild_utilization', '--end', str(self.today))
+        assert rollups() == before
+
+    def test_drifted_rollups_and_room_type_changes(self):
+        booking = Booking.objects.create(room=self.room, user=self.user, date=self.today, slot=time(9, 0))
+        moved = Booking.objects.create(room=self.room, user=self.user, date=self.today, slot=time(10, 0))
+        RoomUtilization.objects.update(bookings=0)
+        SlotUtilization.objects.update(bookings=0)
+        booking.remove()
+        assert rollups() == ({}, {})
+
+        rebuild_utilization()
+        self.room.room_type = 'shared'
+        self.room.save()
+        assert rollups()[1] == {('shared', self.today, time(10)): 1}
+        moved.remove()
+        assert rollups() == ({}, {})
+
+    def test_migration_counts_existing_bookings(self):
+        Booking.objects.create(room=self.room, user=self.user, date=self.today, slot=time(9, 0))
+        Booking.objects.create(room=self.shared_room, user=self.user, date=self.today, slot=time(9, 0)).remove()
+        RoomUtilization.objects.all().delete()
+        SlotUtilization.objects.all().delete()
+        import_module('apps.booking.migrations.0011_utilization_rollups').count_bookings(django_apps, None)
+        assert rollups() == ({(self.room.id, self.today): 1}, {('private', self.today, time(9)): 1})
+
+    def test_report_reads_rollups_only(self):
+        self.book(self.room)
+        self.book(self.shared_room, slot='10:00:00')
+        self.book(self.shared_room, booking_date=self.today + timedelta(days=1))
+        url = reverse('booking-utilization')
+        params = {'start': str(self.today), 'end': str(self.today + timedelta(days=1))}
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        assert response.status_code == 200
+        assert not [query for query in context.captured_queries if '"booking_booking"' in query['sql']]
+        by_type = {row['room_type']: row for row in response.data['results']}
+        assert by_type['shared'] == {'room_type': 'shared', 'bookings': 2, 'capacity': 72, 'utilization': 0.0278}
+        assert by_type['conference']['bookings'] == 0
+
+        rows = self.client.get(url, {**params, 'group_by': 'room,date', 'room_type': 'private'}).data['results']
+        assert [(row['room_name'], row['date'], row['bookings'], row['capacity']) for row in rows] == [
+            ('Private 1', str(self.today), 1, 9), ('Private 1', str(self.today + timedelta(days=1)), 0, 9),
+        ]
+        rows = self.client.get(url, {**params, 'group_by': 'slot'}).data['results']
+        assert len(rows) == 9
+        assert rows[0] == {'slot': '09:00:00', 'bookings': 2, 'capacity': 12, 'utilization': 0.1667}
+
+    def test_invalid_query_and_permissions(self):
+        url = reverse('booking-utilization')
+        assert self.client.get(url).status_code == 400
+        assert self.client.get(url, {'start': str(self.today), 'group_by': 'room,slot'}).status_code == 400
+        assert self.client.get(url, {'start': str(self.today), 'group_by': 'week'}).status_code == 400
+        assert self.client.get(
+            url, {'start': str(self.today), 'end': str(self.today + timedelta(days=400))}
+        ).status_code == 400
+        self.client.force_authenticate(user=User.objects.create_user(username='plain', password='testpass'))
+        assert self.client.get(url, {'start': str(self.today)}).status_code == 403
@@ -0,0 +1,107 @@
+# third party imports
+import pytest
+from rest_framework.test import APIClient
+
+# django imports
+from django.db import transaction
+from django.urls import reverse
+
+# local imports
+from apps.booking.archive import archive_bookings
+from apps.booking.cache import availability_cache
+from apps.booking.models import Room, Booking, Member, Team, VersionCounter
+from apps.booking.versions import date_key, user_key
+from apps.users.models import User
+
+# std imports
+from datetime import date, time, timedelta
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def setup_method(self):
+        availability_cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='etaguser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.room = Room.objects.create(name='Private 1', room_type='private', capacity=1)
+        self.team = Team.objects.create(name='ETag Team', created_by=self.user)
+        self.today = date.today()
+        self.url = reverse('room-available') + f'?date={self.today}&slot=09:00:00'
+
+    def revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_availability_not_modified_until_its_date_changes(self, django_assert_num_queries, django_capture_on_commit_callbacks):
+        response = self.client.get(self.url)
+        assert response.status_code == 200
+        assert response['ETag'].startswith('"')
+        with django_assert_num_queries(1):
+            not_modified = self.revalidate(self.url, response)
+        assert not_modified.status_code == 304
+        assert not_modified['ETag'] == response['ETag']
+        assert not not_modified.content
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Booking.objects.create(room=self.room, user=self.user, date=self.today + timedelta(days=1), slot=time(9, 0))
+        assert self.revalidate(self.url, response).status_code == 304
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Booking.objects.create(room=self.room, user=self.user, date=self.today, slot=time(9, 0))
+        changed = self.revalidate(self.url, response)
+        assert changed.status_code == 200
+        assert changed.data == []
+        assert changed['ETag'] != response['ETag']
+        assert VersionCounter.objects.get(key=date_key(self.today)).version == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Room.objects.create(name='Private 2', room_type='private', capacity=1)
+        assert self.revalidate(self.url, changed).status_code == 200
+
+    def test_booking_list_follows_bookings_and_teams(self, django_capture_on_commit_callbacks):
+        url = reverse('booking-list')
+        response = self.client.get(url)
+        assert self.revalidate(url, response).status_code == 304
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=f'W/{response["ETag"]}').status_code == 304
+        assert self.revalidate(url + '?page_size=1', response).status_code == 200
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Booking.objects.create(room=self.room, user=self.user, date=self.today - timedelta(days=60), slot=time(9, 0))
+        response = self.revalidate(url + '?include_history=true', self.client.get(url + '?include_history=true'))
+        assert response.status_code == 304
+        with django_capture_on_commit_callbacks(execute=True):
+            archive_bookings(self.today - timedelta(days=30))
+        assert self.revalidate(url + '?include_history=true', response).status_code == 200
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.team.name = 'Renamed'
+            self.team.save()
+        assert self.revalidate(url + '?include_history=true', response).status_code == 200
+
+    def test_counters_commit_with_the_data(self):
+        url = reverse('booking-list')
+        response = self.client.get(url)
+        other = User.objects.create_user(username='otheruser', password='testpass')
+        with pytest.raises(RuntimeError), transaction.atomic():
+            Booking.objects.create(room=self.room, user=self.user, date=self.today, slot=time(9, 0))
+            raise RuntimeError
+        assert not VersionCounter.objects.filter(key__in=[date_key(self.today), user_key(self.user.pk)]).exists()
+
+        # Bumped by the write itself, without waiting for on_commit callbacks.
+        Booking.objects.create(room=self.room, user=other, date=self.today, slot=time(9, 0))
+        assert VersionCounter.objects.get(key=date_key(self.today)).version == 1
+        assert self.revalidate(url, response).status_code == 304
+        Booking.objects.create(room=self.room, user=self.user, date=self.today, slot=time(10, 0))
+        assert self.revalidate(url, response).status_code == 200
+
+    def test_teams_not_modified_until_a_member_changes(self, django_capture_on_commit_callbacks):
+        url = reverse('team-list')
+        response = self.client.get(url)
+        assert self.revalidate(url, response).status_code == 304
+        detail = reverse('team-detail', kwargs={'pk': self.team.pk})
+        assert self.revalidate(detail, self.client.get(detail)).status_code == 304
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Member.objects.create(name='New', age=30, team=self.team)
+        assert self.revalidate(url, response).status_code == 200
+        assert self.client.get(url, HTTP_IF_NONE_MATCH='"stale"').status_code == 200
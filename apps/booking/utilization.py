@@ -0,0 +1,226 @@
+# django imports
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Sum, Value, When
+from django.db.models.functions import Greatest
+
+# std imports
+import itertools
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import reduce
+from operator import or_
+
+# local imports
+from apps.booking.inventory import room_seats
+from apps.booking.models import Booking, BookingArchive, Room, RoomUtilization, SlotUtilization, BOOKING_SLOTS
+
+MAX_UTILIZATION_DAYS = 366
+UTILIZATION_GROUPS = ('room', 'room_type', 'date', 'slot')
+
+
+def _add(model, key_fields, deltas):
+    """
+    Adds ``deltas[key]`` to the ``bookings`` of the row matching ``key``
+    (values of ``key_fields``) with one UPDATE. Rows gaining bookings are
+    inserted first if missing, so concurrent writers never lose an increment.
+    Counters stop at zero: a row that drifted below the bookings it should
+    hold is left for ``rebuild_utilization`` rather than failing the write.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    model.objects.bulk_create(
+        [model(**dict(zip(key_fields, key))) for key, delta in deltas.items() if delta > 0],
+        ignore_conflicts=True,
+    )
+    key_filters = {key: Q(**dict(zip(key_fields, key))) for key in deltas}
+    model.objects.filter(reduce(or_, key_filters.values())).update(
+        bookings=Greatest(
+            F('bookings') + Case(
+                *(When(key_filters[key], then=Value(delta)) for key, delta in deltas.items()),
+                default=Value(0),
+            ),
+            Value(0),
+        )
+    )
+
+
+def record_bookings(changes, rooms=()):
+    """
+    Applies ``changes[(room_id, date, slot)]``, positive for bookings made
+    and negative for bookings cancelled, to both rollups. Room types are
+    taken from ``rooms`` when given and loaded with one query otherwise.
+    """
+    changes = Counter({key: delta for key, delta in changes.items() if delta and all(key)})
+    if not changes:
+        return
+    room_types = {room.id: room.room_type for room in rooms}
+    missing = {room_id for room_id, _, _ in changes} - set(room_types)
+    if missing:
+        room_types.update(Room._base_manager.filter(id__in=missing).values_list('id', 'room_type'))
+
+    per_room, per_slot = Counter(), Counter()
+    for (room_id, booking_date, slot_time), delta in changes.items():
+        per_room[(room_id, booking_date)] += delta
+        if room_id in room_types:
+            per_slot[(room_types[room_id], booking_date, slot_time)] += delta
+    _add(RoomUtilization, ('room_id', 'date'), per_room)
+    _add(SlotUtilization, ('room_type', 'date', 'slot'), per_slot)
+
+
+def move_room_type(room_id, old_type, new_type):
+    """
+    Moves the slot rollups of a room's live and archived bookings from
+    ``old_type`` to ``new_type`` after the room changed type, matching what
+    ``rebuild_utilization`` would compute.
+    """
+    per_slot = Counter()
+    for model in (BookingArchive, Booking):
+        for booking_date, slot_time, total in (
+            model.objects.filter(room_id=room_id).exclude(date=None).exclude(slot=None)
+            .values_list('date', 'slot').annotate(total=Count('id')).order_by()
+        ):
+            per_slot[(old_type, booking_date, slot_time)] -= total
+            per_slot[(new_type, booking_date, slot_time)] += total
+    _add(SlotUtilization, ('room_type', 'date', 'slot'), per_slot)
+
+
+def rebuild_utilization(start=None, end=None, batch_size=1000):
+    """
+    Recomputes both rollups between ``start`` and ``end`` (inclusive, open
+    when ``None``) from the live and archived bookings, in one transaction.
+    Returns the number of (room rows, slot rows) written.
+    """
+    per_room, per_slot = Counter(), Counter()
+    with transaction.atomic():
+        room_rows, slot_rows = RoomUtilization.objects.all(), SlotUtilization.objects.all()
+        if start:
+            room_rows, slot_rows = room_rows.filter(date__gte=start), slot_rows.filter(date__gte=start)
+        if end:
+            room_rows, slot_rows = room_rows.filter(date__lte=end), slot_rows.filter(date__lte=end)
+        room_rows.delete()
+        slot_rows.delete()
+
+        for model in (BookingArchive, Booking):
+            bookings = model.objects.exclude(room=None).exclude(date=None).exclude(slot=None)
+            if start:
+                bookings = bookings.filter(date__gte=start)
+            if end:
+                bookings = bookings.filter(date__lte=end)
+            per_room.update(dict(
+                ((room_id, booking_date), total) for room_id, booking_date, total in
+                bookings.values_list('room_id', 'date').annotate(total=Count('id')).order_by()
+            ))
+            per_slot.update(dict(
+                ((room_type, booking_date, slot_time), total) for room_type, booking_date, slot_time, total in
+                bookings.values_list('room__room_type', 'date', 'slot').annotate(total=Count('id')).order_by()
+            ))
+
+        RoomUtilization.objects.bulk_create(
+            (RoomUtilization(room_id=room_id, date=booking_date, bookings=total)
+             for (room_id, booking_date), total in per_room.items()),
+            batch_size=batch_size,
+        )
+        SlotUtilization.objects.bulk_create(
+            (SlotUtilization(room_type=room_type, date=booking_date, slot=slot_time, bookings=total)
+             for (room_type, booking_date, slot_time), total in per_slot.items()),
+            batch_size=batch_size,
+        )
+    return len(per_room), len(per_slot)
+
+
+def parse_utilization_query(params):
+    """
+    Reads the required ``start``/``end`` dates (inclusive), the comma
+    separated ``group_by`` fields (``room_type`` by default) and the
+    optional ``room_type`` filter, raising ``ValueError`` with the
+    client-facing message.
+    """
+    try:
+        start = datetime.strptime(params.get('start') or '', '%Y-%m-%d').date()
+        end = datetime.strptime(params.get('end') or params.get('start') or '', '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError('Valid start and end dates are required.')
+    if end < start:
+        raise ValueError('End date is before the start date.')
+    if (end - start).days >= MAX_UTILIZATION_DAYS:
+        raise ValueError(f'At most {MAX_UTILIZATION_DAYS} days can be requested at once.')
+
+    group_by = [field.strip() for field in (params.get('group_by') or 'room_type').split(',') if field.strip()]
+    if not group_by or any(field not in UTILIZATION_GROUPS for field in group_by):
+        raise ValueError(f'Invalid group_by, use a combination of {", ".join(UTILIZATION_GROUPS)}.')
+    if 'room' in group_by and 'slot' in group_by:
+        raise ValueError('Utilization per room is kept by day, not by slot.')
+    if 'room' in group_by:
+        # Room rows carry their room type already.
+        group_by = [field for field in group_by if field != 'room_type']
+    group_by = [field for field in UTILIZATION_GROUPS if field in group_by]
+
+    room_type = params.get('room_type') or None
+    if room_type and room_type not in dict(Room.ROOM_TYPES):
+        raise ValueError('Invalid room type.')
+    return start, end, group_by, room_type
+
+
+def utilization_report(start, end, group_by, room_type=None):
+    """
+    Bookings, capacity and utilization of every combination of the
+    ``group_by`` fields between ``start`` and ``end``, read from the rollups
+    only. Capacity is the bookings the current rooms of the group accept
+    over its slots and days, so unused rooms, days and slots report zero.
+    """
+    rooms = Room.objects.order_by('id')
+    if room_type:
+        rooms = rooms.filter(room_type=room_type)
+    rooms = list(rooms)
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+    if 'room' in group_by:
+        fields = ['room_id'] + (['date'] if 'date' in group_by else [])
+        rollups = RoomUtilization.objects.filter(date__gte=start, date__lte=end, room__in=[room.id for room in rooms])
+    else:
+        fields = list(group_by)
+        rollups = SlotUtilization.objects.filter(date__gte=start, date__lte=end)
+        if room_type:
+            rollups = rollups.filter(room_type=room_type)
+    booked = {
+        tuple(row[:-1]): row[-1]
+        for row in rollups.values_list(*fields).annotate(total=Sum('bookings')).order_by()
+    }
+
+    seats = Counter()
+    for room in rooms:
+        seats[room.room_type] += room_seats(room)
+    per_day = 1 if 'slot' in group_by else len(BOOKING_SLOTS)
+    periods = 1 if 'date' in group_by else len(days)
+    domains = {
+        'room': rooms,
+        'room_type': [value for value, _ in Room.ROOM_TYPES if not room_type or value == room_type],
+        'date': days,
+        'slot': BOOKING_SLOTS,
+    }
+
+    results = []
+    for combination in itertools.product(*(domains[field] for field in group_by)):
+        values = dict(zip(group_by, combination))
+        key = tuple(value.id if field == 'room' else value for field, value in values.items())
+        if 'room' in values:
+            capacity = room_seats(values['room']) * per_day * periods
+        elif 'room_type' in values:
+            capacity = seats[values['room_type']] * per_day * periods
+        else:
+            capacity = sum(seats.values()) * per_day * periods
+        bookings = booked.get(key, 0)
+        row = {}
+        for field, value in values.items():
+            if field == 'room':
+                row.update(room_id=str(value.uuid), room_name=value.name, room_type=value.room_type)
+            else:
+                row[field] = value.isoformat() if field in ('date', 'slot') else value
+        row.update(
+            bookings=bookings,
+            capacity=capacity,
+            utilization=round(bookings / capacity, 4) if capacity else None,
+        )
+        results.append(row)
+    return results
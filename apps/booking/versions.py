@@ -0,0 +1,84 @@
+# third party imports
+from rest_framework import status
+from rest_framework.response import Response
+
+# django imports
+from django.db.models import F
+from django.utils.http import parse_etags, quote_etag
+
+# std imports
+import hashlib
+
+# local imports
+from apps.booking.models import VersionCounter
+
+BOOKINGS = 'bookings'
+ROOMS = 'rooms'
+TEAMS = 'teams'
+
+
+def date_key(booking_date):
+    return f'{BOOKINGS}:{booking_date.isoformat()}'
+
+
+def user_key(user_id):
+    """Counter of the booking list of one user."""
+    return f'{BOOKINGS}:user:{user_id}'
+
+
+def bump(keys):
+    """
+    Bumps the counters of ``keys`` in the surrounding transaction, so they
+    commit (or roll back) with the data they describe and an ETag never
+    validates stale content. Writers therefore hold the rows of their keys
+    until they commit: keys are per date and per user rather than shared by
+    all bookings. Readers load the counters before the data, so the worst a
+    reader racing a commit can do is tag fresh data with the previous version.
+    """
+    keys = set(keys)
+    if not keys:
+        return
+    counters = VersionCounter.objects.filter(key__in=keys)
+    if counters.update(version=F('version') + 1) < len(keys):
+        # Missing rows start where ``etag`` reads them, then every key is bumped again:
+        # a row created by a concurrent writer still moves past its version.
+        VersionCounter.objects.bulk_create([VersionCounter(key=key, version=0) for key in keys], ignore_conflicts=True)
+        counters.update(version=F('version') + 1)
+
+
+def bump_dates(dates, users=()):
+    """Bumps the counters of ``dates`` and of the booking lists of ``users``."""
+    keys = {date_key(booking_date) for booking_date in dates if booking_date}
+    keys.update(user_key(user_id) for user_id in users if user_id)
+    bump(keys)
+
+
+def etag(request, keys):
+    """
+    Strong ETag of the response to ``request`` (path, query string and user)
+    while the counters of ``keys`` keep their current values; loaded with
+    one query.
+    """
+    versions = dict(VersionCounter.objects.filter(key__in=keys).values_list('key', 'version'))
+    parts = [request.path, request.META.get('QUERY_STRING', ''), str(request.user.pk)]
+    parts += [f'{key}={versions.get(key, 0)}' for key in sorted(keys)]
+    return quote_etag(hashlib.sha1('\n'.join(parts).encode()).hexdigest())
+
+
+def conditional_response(request, keys, respond):
+    """
+    Answers 304 when ``If-None-Match`` holds the current ETag of ``keys``,
+    without calling ``respond``; otherwise returns ``respond()`` with the
+    ETag set on successful responses.
+    """
+    tag = etag(request, keys)
+    headers = {'ETag': tag, 'Cache-Control': 'private, no-cache'}
+    # If-None-Match uses the weak comparison: W/"x" matches "x".
+    tags = {value.removeprefix('W/') for value in parse_etags(request.headers.get('If-None-Match', ''))}
+    if tag in tags or '*' in tags:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response = respond()
+    if response.status_code == status.HTTP_200_OK:
+        for header, value in headers.items():
+            response[header] = value
+    return response
@@ -1,3 +1,12 @@
 from django.contrib import admin
 
-# Register your models here.
+
+class StatusMixinAdmin(admin.ModelAdmin):
+    """Lists inactive and deleted rows too, which the default manager hides."""
+
+    def get_queryset(self, request):
+        queryset = self.model.all_objects.get_queryset()
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
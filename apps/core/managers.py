@@ -2,12 +2,18 @@
 from django.db import models
 
 
-class StatusMixinManager(models.Manager):
-    def all(self, *args, **kwargs):
-        return super(StatusMixinManager, self).filter(is_deleted=False)
-    
-    def filter(self, *args, **kwargs):
-        return super(StatusMixinManager, self).filter(is_active=True, is_deleted=False).filter(*args, **kwargs)
-    
-    def active(self, *args, **kwargs):
-        return super(StatusMixinManager, self).filter(is_active=True, is_deleted=False)
+class StatusMixinQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(is_active=True, is_deleted=False)
+
+
+class StatusMixinManager(models.Manager.from_queryset(StatusMixinQuerySet)):
+    """
+    Default manager of status models: every queryset it hands out, including
+    related managers, prefetches, ``get()`` and ``count()``, only sees active,
+    non-deleted rows. The filter is applied once, in ``get_queryset``; use
+    ``all_objects`` to reach inactive and deleted rows.
+    """
+
+    def get_queryset(self):
+        return super(StatusMixinManager, self).get_queryset().filter(is_active=True, is_deleted=False)
@@ -11,7 +11,10 @@ from django.core.validators import RegexValidator
 from model_utils.models import TimeStampedModel
 
 # local imports
-from core.managers import StatusMixinManager
+from core.managers import StatusMixinManager, StatusMixinQuerySet
+
+# Rows the default ``StatusMixinManager`` returns, for partial indexes and constraints.
+ACTIVE_ROWS = models.Q(is_active=True, is_deleted=False)
 
 
 class StatusMixin(models.Model):
@@ -20,6 +23,7 @@ class StatusMixin(models.Model):
         _("deleted"), default=False, blank=False, null=False
     )
     objects = StatusMixinManager()
+    all_objects = StatusMixinQuerySet.as_manager()
     
     def activate(self):
         if not self.is_active:
@@ -55,7 +59,7 @@ class StatusMixin(models.Model):
 
 
 class UUIDMixin(TimeStampedModel):
-    uuid = models.UUIDField(default=uuid.uuid4, editable=False)
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     
     class Meta:
         abstract = True
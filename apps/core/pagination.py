@@ -0,0 +1,154 @@
+# third party imports
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+# django imports
+from django.db.models import F, Q
+
+# std imports
+import base64
+import json
+from datetime import date, datetime, time
+from functools import reduce
+from operator import or_
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset pagination over ``ordering``, whose last field must
+    be unique. The cursor holds the ordering values of the last row sent, so
+    every page is an index range scan starting right after it and page N
+    costs the same as page 1.
+
+    Fields listed in ``nullable`` may be null; their nulls sort last, as
+    in an ascending PostgreSQL index.
+
+    The default page size is ``REST_FRAMEWORK['PAGE_SIZE']``; clients may
+    ask for up to ``max_page_size`` rows with ``?page_size=``.
+    """
+    ordering = ('created', 'id')
+    nullable = ()
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_page_queryset(queryset, request)))
+
+    def paginate_querysets(self, querysets, request):
+        """
+        One page over several querysets whose rows share the keyset, such as
+        a table and its archive. Each contributes at most a page, merged here.
+        """
+        rows = []
+        for queryset in querysets:
+            rows.extend(self.get_page_queryset(queryset, request))
+        rows.sort(key=self.sort_key)
+        return self.set_page(rows)
+
+    def sort_key(self, row):
+        key = []
+        for field in self.ordering:
+            value = getattr(row, field)
+            key.append((value is None, value) if field in self.nullable else value)
+        return tuple(key)
+
+    def get_page_queryset(self, queryset, request):
+        """
+        The ordered, cursor-filtered slice holding the page plus one look-ahead
+        row. Async views evaluate it themselves and hand the rows to ``set_page``.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(
+            *(F(field).asc(nulls_last=True) if field in self.nullable else field for field in self.ordering)
+        )
+
+        cursor = request.GET.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.keyset_filter(self.decode_cursor(cursor)))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, rows):
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.GET[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return api_settings.PAGE_SIZE or 50
+        return min(max(page_size, 1), self.max_page_size)
+
+    def keyset_filter(self, values):
+        """
+        ``(f1, f2, ...) > (v1, v2, ...)`` expanded into OR-ed conjunctions,
+        with a leading ``f1 >= v1`` so the index range can be used directly.
+        """
+        fields = self.ordering
+        branches = []
+        for position, field in enumerate(fields):
+            equal = Q(*(self.equal(fields[i], values[i]) for i in range(position)))
+            branches.append(equal & self.after(field, values[position]))
+        leading = self.equal(fields[0], values[0]) | self.after(fields[0], values[0])
+        return leading & reduce(or_, branches)
+
+    def equal(self, field, value):
+        return Q(**{f'{field}__isnull': True}) if value is None else Q(**{field: value})
+
+    def after(self, field, value):
+        """Rows whose ``field`` sorts after ``value``: past a null there are none."""
+        if value is None:
+            return Q(pk__in=[])
+        after = Q(**{f'{field}__gt': value})
+        return after | Q(**{f'{field}__isnull': True}) if field in self.nullable else after
+
+    def encode_cursor(self, instance):
+        values = []
+        for field in self.ordering:
+            value = getattr(instance, field)
+            if isinstance(value, (date, datetime, time)):
+                value = value.isoformat()
+            values.append(value)
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering) or any(
+            value is None and field not in self.nullable for field, value in zip(self.ordering, values)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'results': data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
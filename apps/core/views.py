@@ -1,3 +1,24 @@
-from django.shortcuts import render
+# django imports
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
 
-# Create your views here.
+# local imports
+from apps.core.metrics import registry
+
+
+def may_scrape(request):
+    """Scrapers send ``Authorization: Bearer <METRICS_TOKEN>``; staff may also read it logged in."""
+    token = settings.METRICS_TOKEN
+    if token and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    return request.user.is_active and request.user.is_staff
+
+
+@require_GET
+def metrics(request):
+    """Prometheus text exposition of this worker's request histograms."""
+    if not may_scrape(request):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -5,7 +5,7 @@ from rest_framework.routers import DefaultRouter
 from django.urls import path, include
 
 # local imports
-from apps.users.api.views import UserAuthViewSet, UserDetailViewset
+from apps.users.api.views import UserAuthViewSet, UserDetailViewset, UserImportView
 
 
 router = DefaultRouter()
@@ -13,5 +13,6 @@ router.register('auth', UserAuthViewSet, basename='user-auth')
 
 urlpatterns = [
     path('', UserDetailViewset.as_view(), name='user-detail-update'),
+    path('import/', UserImportView.as_view(), name='user-import'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -5,11 +5,13 @@ from rest_framework.viewsets import ViewSet, ModelViewSet
 from rest_framework.generics import RetrieveUpdateAPIView
 from rest_framework.decorators import action
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.views import APIView
 
 # local imports
 from apps.users.api.serializers import UserLoginSerializer, UserSerializer, UserSignupSerializer
 from apps.users.models import User
+from apps.users.provisioning import MAX_API_IMPORT_USERS, UserImport, file_format, read_rows
 
 
 class UserAuthViewSet(ViewSet):
@@ -51,3 +53,35 @@ class UserDetailViewset(RetrieveUpdateAPIView):
 
     def get_object(self):
         return self.request.user
+
+
+class UserImportView(APIView):
+    """
+    Staff-only bulk user creation. Accepts a CSV/JSONL ``file`` upload or a
+    JSON body ``{"users": [...]}`` and returns the rejected rows with a report.
+    """
+    permission_classes = [IsAdminUser,]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is not None:
+            try:
+                rows = read_rows(upload, request.data.get('format') or file_format(upload.name))
+            except (UnicodeDecodeError, ValueError) as error:
+                return Response({'detail': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            rows = request.data.get('users')
+            if not isinstance(rows, list):
+                return Response({'detail': 'Upload a file or send a list of users.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not rows or len(rows) > MAX_API_IMPORT_USERS:
+            return Response(
+                {'detail': f'Send between 1 and {MAX_API_IMPORT_USERS} users.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Hashed in this process: forking a pool from a threaded server can deadlock. ``import_users`` uses the pool.
+        users = UserImport(rows, workers=1).run()
+        return Response(
+            {**users.report(), 'results': users.results},
+            status=status.HTTP_201_CREATED if users.created else status.HTTP_400_BAD_REQUEST,
+        )
@@ -0,0 +1,79 @@
+# thirdparty imports
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# std imports
+from copy import copy
+
+# local imports
+from apps.users.cache import user_cache
+from apps.users.models import User
+
+
+def token_user_id(validated_token):
+    try:
+        return validated_token[api_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise InvalidToken('Token contained no recognizable user identification')
+
+
+def accept_user(user_id, user, validated_token, cached=False):
+    """
+    Runs the checks of ``JWTAuthentication.get_user`` on the token's user,
+    whether it came from ``user_cache`` (``cached``) or was just loaded, and
+    caches a loaded user once it passes. Returns a copy for the request: the
+    cached instance is shared between threads.
+    """
+    if user is None:
+        raise AuthenticationFailed('User not found', code='user_not_found')
+    if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+        raise AuthenticationFailed('User is inactive', code='user_inactive')
+    if api_settings.CHECK_REVOKE_TOKEN and (
+        validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+    ):
+        raise AuthenticationFailed("The user's password has been changed.", code='password_changed')
+    if not cached:
+        user_cache.set(user_id, user)
+    return copy(user)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` that resolves the token's user from ``user_cache``
+    and only queries the ``User`` table on a miss.
+    """
+
+    def get_user(self, validated_token):
+        user_id = token_user_id(validated_token)
+        user = user_cache.get(user_id)
+        if user is not None:
+            return accept_user(user_id, user, validated_token, cached=True)
+        user = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        return accept_user(user_id, user, validated_token)
+
+
+async def aauthenticate(request):
+    """
+    Async counterpart of ``CachedJWTAuthentication.authenticate`` for plain
+    Django async views, with the same user checks. Returns ``None`` when no
+    token was sent and raises ``InvalidToken``/``AuthenticationFailed`` for a
+    bad token or user.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+
+    validated_token = authentication.get_validated_token(raw_token)
+    user_id = token_user_id(validated_token)
+    user = user_cache.get(user_id)
+    if user is not None:
+        return accept_user(user_id, user, validated_token, cached=True)
+    user = await User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).afirst()
+    return accept_user(user_id, user, validated_token)
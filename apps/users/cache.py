@@ -0,0 +1,59 @@
+# std imports
+import threading
+import time
+from collections import OrderedDict
+
+# django imports
+from django.conf import settings
+
+
+class UserCache:
+    """
+    Per-process LRU cache of authenticated ``User`` instances keyed by the
+    token's user id, so JWT requests do not load the user row every time.
+
+    Entries are dropped when the user is saved or deleted (see
+    ``apps.users.signals``); the TTL bounds how long another worker may keep
+    serving a deactivated user or a changed password. A TTL of 0 disables it.
+    """
+
+    def __init__(self, max_entries=10000, ttl=30):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, user_id, user):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[str(user_id)] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(str(user_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(
+    max_entries=getattr(settings, 'AUTH_USER_CACHE_MAX_ENTRIES', 10000),
+    ttl=getattr(settings, 'AUTH_USER_CACHE_TTL', 30),
+)
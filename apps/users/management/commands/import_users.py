@@ -0,0 +1,43 @@
+# django imports
+from django.core.management.base import BaseCommand, CommandError
+
+# std imports
+import json
+
+# local imports
+from apps.users.provisioning import UserImport, file_format, read_rows
+
+class Command(BaseCommand):
+    help = 'Create users in bulk from a CSV or JSONL file and report throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (with header) or JSONL file of users')
+        parser.add_argument('--format', choices=('csv', 'jsonl'), help='Defaults to the file extension')
+        parser.add_argument('--workers', type=int, help='Password hashing processes, defaults to the CPU count')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help='Only validate the file')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or (options['workers'] is not None and options['workers'] < 1):
+            raise CommandError('--batch-size and --workers must be positive.')
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+                rows = read_rows(stream, options['format'] or file_format(options['path']))
+        except (OSError, ValueError) as error:
+            raise CommandError(str(error))
+
+        users = UserImport(rows, workers=options['workers'], batch_size=options['batch_size'])
+        users.run(dry_run=options['dry_run'])
+        for result in users.results:
+            # Row numbers as seen in the file, after the CSV header.
+            self.stderr.write(f"row {result['index'] + 1}: {result['detail']}")
+
+        report = users.report()
+        self.stdout.write(json.dumps(report['seconds']))
+        message = (
+            f"{report['accepted']} of {report['rows']} rows valid"
+            if options['dry_run'] else
+            f"{report['created']} users created, {report['rejected']} rejected in "
+            f"{report['seconds']['total']}s ({report['users_per_second']} users/s)"
+        )
+        self.stdout.write(self.style.SUCCESS(message))
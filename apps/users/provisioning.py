@@ -0,0 +1,181 @@
+# django imports
+import django
+from django.apps import apps as django_apps
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+
+# std imports
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# local imports
+from apps.users.models import User
+
+MAX_API_IMPORT_USERS = 5000
+IMPORT_FIELDS = ('username', 'password', 'email', 'first_name', 'last_name', 'gender', 'date_of_birth')
+# Below this many passwords a process pool costs more to start than it saves.
+MIN_POOL_PASSWORDS = 64
+
+
+def read_rows(stream, file_format):
+    """
+    Rows of a CSV (with a header line) or JSONL user file as dicts. ``stream``
+    may yield text or bytes, e.g. an open file or an uploaded file.
+    """
+    lines = (line.decode('utf-8-sig') if isinstance(line, bytes) else line for line in stream)
+    if file_format == 'csv':
+        return list(csv.DictReader(lines))
+    if file_format == 'jsonl':
+        rows = []
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                raise ValueError(f'Invalid JSON on line {number}.')
+        return rows
+    raise ValueError('Unsupported format, use csv or jsonl.')
+
+
+def file_format(name):
+    extension = os.path.splitext(name or '')[1].lower().lstrip('.')
+    return 'jsonl' if extension in ('jsonl', 'ndjson') else extension
+
+
+def setup_worker():
+    # Spawned workers start without settings; forked ones already have them.
+    if not django_apps.ready:
+        django.setup()
+
+
+def hash_passwords(passwords, workers=None):
+    """``make_password`` for every password, spread over ``workers`` processes."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(passwords) < MIN_POOL_PASSWORDS:
+        return [make_password(password) for password in passwords]
+    with ProcessPoolExecutor(max_workers=workers, initializer=setup_worker) as pool:
+        return list(pool.map(make_password, passwords, chunksize=max(len(passwords) // (workers * 4), 1)))
+
+
+class UserImport:
+    """
+    Creates users from parsed rows in one pass. Every row is validated
+    first and existing usernames are loaded with one query for the whole
+    file; passwords of the accepted rows are then hashed in a process pool
+    and the users inserted with ``bulk_create`` in ``batch_size`` chunks.
+
+    ``results`` holds one ``{index, status, detail}`` entry per rejected row
+    and ``report()`` the counts and throughput of each phase.
+    """
+
+    def __init__(self, rows, workers=None, batch_size=1000):
+        self.rows = rows
+        self.workers = workers
+        self.batch_size = batch_size
+        self.results = []
+        self.accepted = 0
+        self.created = 0
+        self.timings = {}
+
+    def reject(self, index, detail):
+        self.results.append({'index': index, 'status': 'rejected', 'detail': detail})
+
+    def clean(self, index, row):
+        if not isinstance(row, dict):
+            return self.reject(index, 'Invalid user row.')
+        fields = {key: (str(row[key]).strip() if row.get(key) is not None else '') for key in IMPORT_FIELDS}
+        if not fields['username'] or len(fields['username']) > User._meta.get_field('username').max_length:
+            return self.reject(index, 'Invalid username.')
+        if not fields['password']:
+            return self.reject(index, 'Password is required.')
+        if fields['gender'] and fields['gender'] not in User.GENDER_CHOICES:
+            return self.reject(index, 'Invalid gender.')
+        if fields['date_of_birth']:
+            try:
+                fields['date_of_birth'] = datetime.strptime(fields['date_of_birth'], '%Y-%m-%d').date()
+            except ValueError:
+                return self.reject(index, 'Invalid date format.')
+        fields['username'] = User.normalize_username(fields['username'])
+        fields['email'] = User.objects.normalize_email(fields['email'])
+        fields['gender'] = fields['gender'] or None
+        fields['date_of_birth'] = fields['date_of_birth'] or None
+        return fields
+
+    def validate(self):
+        cleaned = [(index, self.clean(index, row)) for index, row in enumerate(self.rows)]
+        cleaned = [(index, fields) for index, fields in cleaned if fields]
+        taken = set(
+            User._base_manager.filter(username__in={fields['username'] for _, fields in cleaned})
+            .values_list('username', flat=True)
+        )
+        accepted = []
+        for index, fields in cleaned:
+            if fields['username'] in taken:
+                self.reject(index, 'Username is already taken')
+                continue
+            taken.add(fields['username'])
+            accepted.append((index, fields))
+        return accepted
+
+    def insert(self, accepted):
+        for start in range(0, len(accepted), self.batch_size):
+            batch = accepted[start:start + self.batch_size]
+            while batch:
+                try:
+                    with transaction.atomic():
+                        User.objects.bulk_create(User(**fields) for _, fields in batch)
+                    break
+                except IntegrityError:
+                    # Someone signed up with some of these usernames since ``validate``: reject them and retry.
+                    taken = set(
+                        User._base_manager.filter(username__in=[fields['username'] for _, fields in batch])
+                        .values_list('username', flat=True)
+                    )
+                    remaining = [(index, fields) for index, fields in batch if fields['username'] not in taken]
+                    detail = 'Username is already taken'
+                    if len(remaining) == len(batch):
+                        # Nothing to pin the conflict on: report the rows instead of failing the import.
+                        remaining, detail = [], 'User could not be created, please retry'
+                    kept = {index for index, _ in remaining}
+                    for index, _ in batch:
+                        if index not in kept:
+                            self.reject(index, detail)
+                    batch = remaining
+            self.created += len(batch)
+
+    def run(self, dry_run=False):
+        started = time.perf_counter()
+        accepted = self.validate()
+        self.accepted = len(accepted)
+        self.timings['validate'] = time.perf_counter() - started
+
+        if not dry_run:
+            phase = time.perf_counter()
+            passwords = hash_passwords([fields['password'] for _, fields in accepted], self.workers)
+            for (_, fields), password in zip(accepted, passwords):
+                fields['password'] = password
+            self.timings['hash'] = time.perf_counter() - phase
+
+            phase = time.perf_counter()
+            self.insert(accepted)
+            self.timings['insert'] = time.perf_counter() - phase
+        self.timings['total'] = time.perf_counter() - started
+        self.results.sort(key=lambda result: result['index'])
+        return self
+
+    def report(self):
+        total = self.timings.get('total') or 0
+        return {
+            'rows': len(self.rows),
+            'accepted': self.accepted,
+            'created': self.created,
+            'rejected': len(self.results),
+            'seconds': {phase: round(seconds, 3) for phase, seconds in self.timings.items()},
+            'users_per_second': round(self.created / total, 2) if total else None,
+        }
+
@@ -0,0 +1,21 @@
+# third party imports
+from rest_framework_simplejwt.settings import api_settings
+
+# django imports
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# local imports
+from apps.users.cache import user_cache
+from apps.users.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Any save may flip is_active/is_deleted or the password; drop the entry
+    # now and again on commit so a concurrent request cannot re-cache the old row.
+    user_id = getattr(instance, api_settings.USER_ID_FIELD)
+    user_cache.invalidate(user_id)
+    transaction.on_commit(lambda: user_cache.invalidate(user_id))
@@ -0,0 +1,83 @@
+# third party imports
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# django imports
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# local imports
+from apps.users.authentication import aauthenticate
+from apps.users.cache import user_cache
+from apps.users.models import User
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    def setup_method(self):
+        user_cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='cacheduser', password='testpass')
+        user_cache.clear()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def list_queries(self, url_name='booking-list'):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse(url_name))
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_user_query_skipped_when_cached(self):
+        response, first = self.list_queries()
+        assert response.status_code == 200
+        response, second = self.list_queries()
+        assert response.status_code == 200
+        assert len(second) == len(first) - 1
+        assert not any('"users_user"' in sql and 'FROM' in sql for sql in second)
+
+    def test_request_user_is_a_copy(self):
+        self.client.get(reverse('booking-list'))
+        cached = user_cache.get(self.user.pk)
+        response = self.client.get(reverse('booking-list'))
+        assert response.wsgi_request.user == cached
+        assert response.wsgi_request.user is not cached
+
+    def test_deactivated_user_rejected(self):
+        assert self.client.get(reverse('booking-list')).status_code == 200
+        self.user.deactivate()
+        response = self.client.get(reverse('booking-list'))
+        assert response.status_code == 401
+
+    def test_deleted_user_rejected(self):
+        assert self.client.get(reverse('booking-list')).status_code == 200
+        self.user.remove()
+        assert self.client.get(reverse('booking-list')).status_code == 401
+
+    def test_password_change_drops_cached_user(self):
+        self.client.get(reverse('booking-list'))
+        assert user_cache.get(self.user.pk) is not None
+        self.user.set_password('newpass')
+        self.user.save()
+        assert user_cache.get(self.user.pk) is None
+        _, queries = self.list_queries()
+        assert any('"users_user"' in sql for sql in queries)
+
+    def test_cached_user_revoke_check_matches_async_path(self, monkeypatch):
+        # simplejwt rebinds ``api_settings`` on setting_changed, so override_settings would not reach importers.
+        monkeypatch.setattr(api_settings, 'CHECK_REVOKE_TOKEN', True)
+        token = f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        self.client.credentials(HTTP_AUTHORIZATION=token)
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=token)
+        assert self.client.get(reverse('booking-list')).status_code == 200
+        assert async_to_sync(aauthenticate)(request) == self.user
+
+        # A password changed behind the cache's back: the cached user's hash no longer matches the token.
+        user_cache.get(self.user.pk).set_password('changed')
+        assert self.client.get(reverse('booking-list')).status_code == 401
+        with pytest.raises(AuthenticationFailed):
+            async_to_sync(aauthenticate)(request)
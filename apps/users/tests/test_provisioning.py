@@ -0,0 +1,136 @@
+# third party imports
+import pytest
+from rest_framework.test import APIClient
+
+# django imports
+from django.contrib.auth.hashers import check_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
+from django.urls import reverse
+
+# local imports
+from apps.users import provisioning
+from apps.users.models import User
+from apps.users.provisioning import UserImport, hash_passwords
+
+# std imports
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+
+@pytest.fixture(autouse=True)
+def fast_hasher(settings):
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+@pytest.mark.django_db
+class TestUserImportAPI:
+    def setup_method(self):
+        self.client = APIClient()
+        self.staff = User.objects.create_user(username='staff', password='testpass', is_staff=True)
+        self.client.force_authenticate(user=self.staff)
+        self.url = reverse('user-import')
+
+    def test_staff_only(self):
+        user = User.objects.create_user(username='plain', password='testpass')
+        self.client.force_authenticate(user=user)
+        response = self.client.post(self.url, {'users': [{'username': 'a', 'password': 'b'}]}, format='json')
+        assert response.status_code == 403
+
+    def test_import_json(self):
+        users = [
+            {'username': 'new1', 'password': 'pass1', 'email': 'new1@example.com', 'gender': 'female'},
+            {'username': 'staff', 'password': 'pass2'},
+            {'username': 'new1', 'password': 'pass3'},
+            {'username': 'new2', 'password': ''},
+            {'username': 'new3', 'password': 'pass4', 'date_of_birth': '01/02/2000'},
+            {'username': 'new4', 'password': 'pass5', 'date_of_birth': '2000-02-01'},
+        ]
+        response = self.client.post(self.url, {'users': users}, format='json')
+        assert response.status_code == 201
+        assert response.data['created'] == 2
+        assert [(result['index'], result['detail']) for result in response.data['results']] == [
+            (1, 'Username is already taken'),
+            (2, 'Username is already taken'),
+            (3, 'Password is required.'),
+            (4, 'Invalid date format.'),
+        ]
+        user = User.objects.get(username='new1')
+        assert user.email == 'new1@example.com' and user.gender == 'female'
+        assert check_password('pass1', user.password)
+        assert str(User.objects.get(username='new4').date_of_birth) == '2000-02-01'
+
+    def test_import_csv_and_jsonl_files(self):
+        csv_file = SimpleUploadedFile('users.csv', b'username,password,first_name\ncsv1,pw,Ann\ncsv2,pw,Bob\n')
+        response = self.client.post(self.url, {'file': csv_file}, format='multipart')
+        assert response.status_code == 201
+        assert response.data['created'] == 2
+        assert User.objects.get(username='csv2').first_name == 'Bob'
+
+        jsonl_file = SimpleUploadedFile('users.jsonl', b'{"username": "json1", "password": "pw"}\n\n')
+        response = self.client.post(self.url, {'file': jsonl_file}, format='multipart')
+        assert response.status_code == 201
+        assert User.objects.filter(username='json1').exists()
+
+    def test_rejects_bad_payloads(self):
+        assert self.client.post(self.url, {'users': []}, format='json').status_code == 400
+        bad_file = SimpleUploadedFile('users.xml', b'<users/>')
+        response = self.client.post(self.url, {'file': bad_file}, format='multipart')
+        assert response.status_code == 400
+        response = self.client.post(self.url, {'users': [{'username': 'staff', 'password': 'pw'}]}, format='json')
+        assert response.status_code == 400
+        assert response.data['created'] == 0
+
+    def test_single_username_query(self, django_assert_max_num_queries):
+        users = [{'username': f'bulk{i}', 'password': 'pw'} for i in range(50)]
+        # Existing usernames, then one insert inside its savepoint.
+        with django_assert_max_num_queries(4):
+            response = self.client.post(self.url, {'users': users}, format='json')
+        assert response.data['created'] == 50
+
+    def test_hashes_without_process_pool(self, monkeypatch):
+        def no_pool(*args, **kwargs):
+            raise AssertionError('requests must not fork a process pool')
+
+        monkeypatch.setattr(provisioning, 'ProcessPoolExecutor', no_pool)
+        users = [{'username': f'nopool{i}', 'password': 'pw'} for i in range(provisioning.MIN_POOL_PASSWORDS + 1)]
+        response = self.client.post(self.url, {'users': users}, format='json')
+        assert response.data['created'] == len(users)
+
+
+@pytest.mark.django_db
+def test_import_users_command(tmp_path):
+    path = tmp_path / 'users.jsonl'
+    path.write_text(''.join(f'{{"username": "cmd{i}", "password": "pw{i}"}}\n' for i in range(5)))
+    call_command('import_users', str(path), '--batch-size', '2', '--workers', '1')
+    assert User.objects.filter(username__startswith='cmd').count() == 5
+    assert check_password('pw3', User.objects.get(username='cmd3').password)
+
+
+@pytest.mark.django_db
+def test_repeated_signup_races_are_rejected(monkeypatch):
+    racers = iter(['race0', 'race1'])
+
+    @contextmanager
+    def atomic_after_race():
+        # Another signup commits right before each insert attempt.
+        racer = next(racers, None)
+        if racer:
+            User.objects.create_user(username=racer, password='pw')
+        with transaction.atomic():
+            yield
+
+    monkeypatch.setattr(provisioning, 'transaction', SimpleNamespace(atomic=atomic_after_race))
+    importer = UserImport([{'username': f'race{i}', 'password': 'pw'} for i in range(3)], workers=1).run()
+    assert importer.created == 1
+    assert [(result['index'], result['detail']) for result in importer.results] == [
+        (0, 'Username is already taken'), (1, 'Username is already taken'),
+    ]
+    assert User.objects.filter(username__startswith='race').count() == 3
+
+
+def test_hash_passwords_in_process_pool():
+    passwords = [f'password-{i}' for i in range(70)]
+    hashes = hash_passwords(passwords, workers=2)
+    assert all(check_password(password, hashed) for password, hashed in zip(passwords, hashes))
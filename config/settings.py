@@ -60,6 +60,7 @@ LOCAL_APPS = [
 INSTALLED_APPS = DEFAULT_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'apps.core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -99,6 +100,24 @@ DATABASES = {
     ),
 }
 
+# Keep connections open between requests (seconds, "none" for unlimited) and
+# check they are still usable before reusing them.
+DB_CONN_MAX_AGE = env.str("DB_CONN_MAX_AGE", default="60")
+DATABASES["default"]["CONN_MAX_AGE"] = None if DB_CONN_MAX_AGE.lower() == "none" else int(DB_CONN_MAX_AGE)
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = env.bool("DB_CONN_HEALTH_CHECKS", default=True)
+
+# A process-wide connection pool (PostgreSQL with psycopg 3 only), which also
+# serves ASGI workers where persistent connections are per-thread. Pooled
+# connections are health-checked on checkout when CONN_HEALTH_CHECKS is on.
+DB_POOL_MAX_SIZE = env.int("DB_POOL_MAX_SIZE", default=0)
+if DB_POOL_MAX_SIZE:
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": min(env.int("DB_POOL_MIN_SIZE", default=2), DB_POOL_MAX_SIZE),
+        "max_size": DB_POOL_MAX_SIZE,
+        "max_lifetime": env.float("DB_POOL_MAX_LIFETIME", default=3600.0),
+        "timeout": env.float("DB_POOL_TIMEOUT", default=10.0),
+    }
 
 
 # Password validation
@@ -145,12 +164,14 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST_FRAMEWORK config
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'EXCEPTION_HANDLER': 'config.api_exception_handler.custom_exception_handler',
+    'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.KeysetPagination',
+    'PAGE_SIZE': env.int("API_PAGE_SIZE", default=50),
 }
 
 # JWT token settings
@@ -160,5 +181,25 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Per-process cache of authenticated users (apps.users.cache)
+AUTH_USER_CACHE_MAX_ENTRIES = env.int("AUTH_USER_CACHE_MAX_ENTRIES", default=10000)
+AUTH_USER_CACHE_TTL = env.int("AUTH_USER_CACHE_TTL", default=30)
+
+# Per-process availability cache (apps.booking.cache)
+AVAILABILITY_CACHE_MAX_ENTRIES = env.int("AVAILABILITY_CACHE_MAX_ENTRIES", default=1024)
+AVAILABILITY_CACHE_TTL = env.int("AVAILABILITY_CACHE_TTL", default=60)
+
+# Availability change feed (apps.booking.events): broker class, events kept for resuming
+# clients and seconds between keep-alive comments on idle streams
+AVAILABILITY_BROKER = env.str("AVAILABILITY_BROKER", default="apps.booking.events.LocalBroker")
+AVAILABILITY_EVENT_BACKLOG = env.int("AVAILABILITY_EVENT_BACKLOG", default=1000)
+AVAILABILITY_STREAM_HEARTBEAT = env.int("AVAILABILITY_STREAM_HEARTBEAT", default=15)
+
+# Bearer token Prometheus sends to read /metrics (apps.core.views); empty allows staff sessions only
+METRICS_TOKEN = env.str("METRICS_TOKEN", default="")
+
+# Bookings older than this many days are moved to the archive (apps.booking.archive)
+BOOKING_ARCHIVE_AFTER_DAYS = env.int("BOOKING_ARCHIVE_AFTER_DAYS", default=30)
+
 # Default USER model
 AUTH_USER_MODEL = 'users.User'
\ No newline at end of file
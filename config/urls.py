@@ -19,10 +19,14 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from apps.core.views import metrics
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/v1/users/', include('apps.users.api.urls')),
     path('api/v1/bookings/', include('apps.booking.api.urls')),
+    path('api/v1/async/bookings/', include('apps.booking.api.async_urls')),
+    path('metrics', metrics, name='metrics'),
 ]
 
 if settings.DEBUG:
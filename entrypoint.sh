@@ -15,6 +15,13 @@ then
        --email $DJANGO_SUPERUSER_EMAIL
 fi
 
+# Serve the ASGI app (sync and async views) with uvicorn when requested
+if [ "$SERVER" = "asgi" ]
+then
+   echo "Starting uvicorn on 0.0.0.0:8000..."
+   exec uvicorn config.asgi:application --host 0.0.0.0 --port 8000 --workers ${WEB_CONCURRENCY:-1}
+fi
+
 # Run the Django development server
 echo "Starting server on 0.0.0.0:8000..."
 python manage.py runserver 0.0.0.0:8000